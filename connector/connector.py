@@ -1,3 +1,5 @@
+from typing import Dict, Iterable
+from sqlalchemy.orm import Session
 from models.crude_operations_model import CrudeOperationsModel
 from models.event_registration_model import EventRegistrationModel
 from models.transaction_model import TransactionModel
@@ -5,10 +7,25 @@ from models.user_registration_model import UserRegistrationModel
 from models.sports_model import SportsModel
 from models.jindal_registration_model import JindalRegistrationModel
 from models.orangetheory_registration_model import OrangetheoryRegistrationModel
+from models.registration_sport_model import RegistrationSportModel
+from connector.registration_sports_connector import registration_sports_connector
+from connector.registration_rollups_connector import registration_rollups_connector
+from utils.change_bus import change_bus, REGISTRATION_COUNTS_CHANGED, JINDAL_SUMMARY_CHANGED
 
 
 class EventRegistrationConnector(CrudeOperationsModel[EventRegistrationModel, None, None]):
-    pass
+    def after_create(self, db: Session, db_obj: EventRegistrationModel) -> None:
+        registration_sports_connector.add_sports(db, RegistrationSportModel.EVENT, db_obj.id, db_obj.selected_sports)
+        registration_rollups_connector.record(db, RegistrationSportModel.EVENT, db_obj)
+        # Every worker's cached counts go stale once this commits
+        change_bus.notify(db, REGISTRATION_COUNTS_CHANGED, {})
+
+    def get_sport_counts(self, db: Session, sports: Iterable[str]) -> Dict[str, int]:
+        """
+        Count registrations per sport from the registration_sports table
+        Returns: {sport: count} for the requested sports
+        """
+        return registration_sports_connector.count_by_sport(db, RegistrationSportModel.EVENT, sports)
 
 class TransactionConnector(CrudeOperationsModel[TransactionModel, None, None]):
     pass
@@ -20,14 +37,19 @@ class SportsConnector(CrudeOperationsModel[SportsModel, None, None]):
     pass
 
 class JindalRegistrationConnector(CrudeOperationsModel[JindalRegistrationModel, None, None]):
-    pass
+    def after_create(self, db: Session, db_obj: JindalRegistrationModel) -> None:
+        registration_sports_connector.add_sports(db, RegistrationSportModel.JINDAL, db_obj.id, db_obj.selected_sports)
+        registration_rollups_connector.record(db, RegistrationSportModel.JINDAL, db_obj)
+        change_bus.notify(db, JINDAL_SUMMARY_CHANGED, {})
 
 class OrangetheoryRegistrationConnector(CrudeOperationsModel[OrangetheoryRegistrationModel, None, None]):
-    pass
+    def after_create(self, db: Session, db_obj: OrangetheoryRegistrationModel) -> None:
+        registration_sports_connector.add_sports(db, RegistrationSportModel.ORANGETHEORY, db_obj.id, db_obj.selected_sports)
+        registration_rollups_connector.record(db, RegistrationSportModel.ORANGETHEORY, db_obj)
 
-event_registration_connector = EventRegistrationConnector(EventRegistrationModel)
+event_registration_connector = EventRegistrationConnector(EventRegistrationModel, insert_returning=True)
 transaction_connector = TransactionConnector(TransactionModel)
 user_registration_connector = UserRegistrationConnector(UserRegistrationModel)
 sports_connector = SportsConnector(SportsModel)
 jindal_registration_connector = JindalRegistrationConnector(JindalRegistrationModel)
-orangetheory_registration_connector = OrangetheoryRegistrationConnector(OrangetheoryRegistrationModel)
\ No newline at end of file
+orangetheory_registration_connector = OrangetheoryRegistrationConnector(OrangetheoryRegistrationModel, insert_returning=True)
\ No newline at end of file
@@ -0,0 +1,261 @@
+from models.crude_operations_model import CrudeOperationsModel
+from models.email_broadcast_model import EmailBroadcastModel
+from models.email_broadcast_failure_model import EmailBroadcastFailureModel
+from models.event_registration_model import EventRegistrationModel
+from models.orangetheory_registration_model import OrangetheoryRegistrationModel
+from models.jindal_registration_model import JindalRegistrationModel
+from models.registration_sport_model import RegistrationSportModel
+from utils.email_utils import ses_email_service, SESThrottlingError, BULK_QUOTA_STATUSES
+from utils.change_bus import change_bus, EMAIL_BROADCAST_CHANGED
+from sqlalchemy import update, select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from datetime import timedelta
+from typing import Iterator, List, Optional, Tuple
+import os
+import json
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Registration table each broadcast registration_type reads its recipients from
+BROADCAST_SOURCES = {
+    RegistrationSportModel.EVENT: EventRegistrationModel,
+    RegistrationSportModel.ORANGETHEORY: OrangetheoryRegistrationModel,
+    RegistrationSportModel.JINDAL: JindalRegistrationModel,
+}
+
+# Plain text version of each broadcast template
+BROADCAST_TEXT_PARTS = {
+    "event_broadcast": "Hi {{FIRST_NAME}} {{LAST_NAME}},\n\n{{MESSAGE}}\n\nBest regards,\nTeam Alldays\n",
+}
+
+# Registrations read per keyset query
+EMAIL_BROADCAST_PAGE_SIZE = int(os.environ.get("EMAIL_BROADCAST_PAGE_SIZE", "500"))
+# Share of the account's MaxSendRate a broadcast may use; dispatchers give it up while one runs
+EMAIL_BROADCAST_RATE_FRACTION = float(os.environ.get("EMAIL_BROADCAST_RATE_FRACTION", "0.5"))
+# How long a run holds its broadcast without checkpointing; if that worker dies it can be resumed afterwards
+EMAIL_BROADCAST_LEASE_SECONDS = float(os.environ.get("EMAIL_BROADCAST_LEASE_SECONDS", "300"))
+# Rate used when the SES quota can't be read (the SES sandbox rate)
+EMAIL_BROADCAST_DEFAULT_SEND_RATE = 1.0
+
+class BroadcastLeaseLost(Exception):
+    """Another run has claimed the broadcast since this one did"""
+
+class EmailBroadcastConnector(CrudeOperationsModel[EmailBroadcastModel, None, None]):
+    """
+    One templated email to every registrant of a registration type, sent in bulk.
+
+    Recipients are read by keyset pagination on the registration id and sent
+    with SES bulk templated sends. After every call the highest registration
+    id sent is checkpointed together with that call's failures, so a run that
+    stops, whether on error, on the daily quota or with its worker, resumes
+    from the checkpoint and never emails a recipient twice (bar the one
+    unconfirmed call a crash can leave behind). A lease keeps two runs of the
+    same broadcast from overlapping: every claim takes a new run token, and a
+    run whose token no longer matches stops at its next checkpoint.
+    """
+
+    def __init__(self):
+        super().__init__(EmailBroadcastModel)
+
+    def get_by_name(self, db: Session, name: str) -> Optional[EmailBroadcastModel]:
+        return db.query(EmailBroadcastModel).filter(EmailBroadcastModel.name == name).first()
+
+    def create_or_get(
+        self,
+        db: Session,
+        name: str,
+        registration_type: str,
+        template_name: str,
+        template_data: dict,
+        orangetheory_batch: Optional[str] = None
+    ) -> Tuple[EmailBroadcastModel, bool]:
+        """
+        Create a broadcast, or find the one with this name to resume it with its original settings
+        Returns: (broadcast, created)
+        """
+        broadcast = self.get_by_name(db, name)
+        if broadcast is not None:
+            return broadcast, False
+        if orangetheory_batch and not hasattr(BROADCAST_SOURCES[registration_type], "orangetheory_batch"):
+            raise ValueError(f"{registration_type} registrations have no orangetheory_batch to filter on")
+        broadcast = EmailBroadcastModel(
+            name=name,
+            registration_type=registration_type,
+            orangetheory_batch=orangetheory_batch,
+            template_name=template_name,
+            template_data=json.dumps(template_data)
+        )
+        db.add(broadcast)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Created by a concurrent request
+            db.rollback()
+            return self.get_by_name(db, name), False
+        db.refresh(broadcast)
+        return broadcast, True
+
+    def claim(self, db: Session, broadcast_id: int, lease_seconds: float = EMAIL_BROADCAST_LEASE_SECONDS) -> Optional[str]:
+        """
+        Take the lease on an unfinished broadcast that no other run holds
+        Returns: the run token to pass to run(), or None if another run holds it
+        """
+        run_token = uuid.uuid4().hex
+        claimed = db.execute(
+            update(EmailBroadcastModel)
+            .where(
+                EmailBroadcastModel.id == broadcast_id,
+                EmailBroadcastModel.status != EmailBroadcastModel.COMPLETED,
+                (EmailBroadcastModel.status != EmailBroadcastModel.RUNNING) | (EmailBroadcastModel.lease_until < func.now())
+            )
+            .values(
+                status=EmailBroadcastModel.RUNNING,
+                lease_until=func.now() + timedelta(seconds=lease_seconds),
+                run_token=run_token,
+                last_error=None
+            )
+            .returning(EmailBroadcastModel.id)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if claimed is None:
+            db.commit()
+            return None
+        change_bus.notify(db, EMAIL_BROADCAST_CHANGED, {})
+        db.commit()
+        return run_token
+
+    def is_running(self, db: Session) -> bool:
+        """Whether any broadcast is being sent, i.e. running under an unexpired lease"""
+        return db.execute(
+            select(EmailBroadcastModel.id)
+            .where(EmailBroadcastModel.status == EmailBroadcastModel.RUNNING, EmailBroadcastModel.lease_until > func.now())
+            .limit(1)
+        ).first() is not None
+
+    def iter_recipients(self, db: Session, broadcast: EmailBroadcastModel) -> Iterator[Tuple[int, str, dict]]:
+        """
+        Recipients after the broadcast's checkpoint, in registration id order, one page per query
+        Yields: (registration_id, email, template_data)
+        """
+        model = BROADCAST_SOURCES[broadcast.registration_type]
+        query = select(model.id, model.email, model.first_name, model.last_name)
+        if hasattr(model, "is_active"):
+            query = query.where(model.is_active.is_(True))
+        if broadcast.orangetheory_batch:
+            if not hasattr(model, "orangetheory_batch"):
+                raise ValueError(f"{broadcast.registration_type} registrations have no orangetheory_batch to filter on")
+            query = query.where(model.orangetheory_batch == broadcast.orangetheory_batch)
+
+        last_id = broadcast.last_registration_id
+        while True:
+            page = db.execute(query.where(model.id > last_id).order_by(model.id).limit(EMAIL_BROADCAST_PAGE_SIZE)).all()
+            for row in page:
+                yield row.id, row.email, {"FIRST_NAME": row.first_name.title(), "LAST_NAME": row.last_name.title()}
+            if len(page) < EMAIL_BROADCAST_PAGE_SIZE:
+                return
+            last_id = page[-1].id
+
+    def checkpoint(self, db: Session, broadcast_id: int, run_token: str, chunk: list, statuses: List[Tuple[str, Optional[str]]]) -> None:
+        """
+        Record one bulk call's outcome and move the checkpoint past it, renewing the lease
+        Raises BroadcastLeaseLost, recording nothing, if another run has claimed the broadcast.
+        """
+        failures = [
+            {
+                "broadcast_id": broadcast_id,
+                "registration_id": registration_id,
+                "recipient_email": email,
+                "error": f"{status}: {error}" if error else status
+            }
+            for (registration_id, email, _), (status, error) in zip(chunk, statuses)
+            if status != "Success"
+        ]
+        if failures:
+            db.execute(insert(EmailBroadcastFailureModel).values(failures).on_conflict_do_nothing(constraint="uq_email_broadcast_failures"))
+
+        values = {"lease_until": func.now() + timedelta(seconds=EMAIL_BROADCAST_LEASE_SECONDS)}
+        if chunk:
+            values.update(
+                last_registration_id=func.greatest(EmailBroadcastModel.last_registration_id, chunk[-1][0]),
+                sent=EmailBroadcastModel.sent + len(chunk) - len(failures),
+                failed=EmailBroadcastModel.failed + len(failures)
+            )
+        renewed = db.execute(
+            update(EmailBroadcastModel)
+            .where(EmailBroadcastModel.id == broadcast_id, EmailBroadcastModel.run_token == run_token)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if renewed.rowcount == 0:
+            db.rollback()
+            raise BroadcastLeaseLost(f"Broadcast {broadcast_id} was claimed by another run")
+        db.commit()
+
+    def run(self, db: Session, broadcast_id: int, run_token: str) -> None:
+        """
+        Send a claimed broadcast from its checkpoint to the end
+        On error it is released with last_error set, ready to be resumed. A run that
+        has lost its lease stops without touching the broadcast.
+        """
+        broadcast = self.read(db, {"id": broadcast_id})
+        name = broadcast.name
+        quota = ses_email_service.get_sending_limits()
+        send_rate = quota['max_send_rate'] * EMAIL_BROADCAST_RATE_FRACTION if quota else EMAIL_BROADCAST_DEFAULT_SEND_RATE
+        logger.info(f"Sending broadcast '{name}' from registration {broadcast.last_registration_id} at {send_rate:.2f}/s")
+
+        try:
+            sends = ses_email_service.send_bulk_templated_emails(
+                broadcast.template_name,
+                self.iter_recipients(db, broadcast),
+                json.loads(broadcast.template_data),
+                text_part=BROADCAST_TEXT_PARTS.get(broadcast.template_name),
+                send_rate=send_rate
+            )
+            for chunk, statuses in sends:
+                # Recipients from the first one over the daily quota on are left for the resumed run
+                over_quota = next((i for i, (status, _) in enumerate(statuses) if status in BULK_QUOTA_STATUSES), None)
+                if over_quota is not None:
+                    self.checkpoint(db, broadcast_id, run_token, chunk[:over_quota], statuses[:over_quota])
+                    raise SESThrottlingError("Daily sending quota used up; resume the broadcast once it resets")
+                self.checkpoint(db, broadcast_id, run_token, chunk, statuses)
+        except BroadcastLeaseLost:
+            logger.warning(f"Broadcast '{name}' lost its lease to another run; stopping")
+            return
+        except Exception as e:
+            logger.error(f"Broadcast '{name}' stopped: {e}", exc_info=True)
+            db.rollback()
+            self._release(db, broadcast_id, run_token, EmailBroadcastModel.PENDING, error=str(e) or type(e).__name__)
+            return
+
+        self._release(db, broadcast_id, run_token, EmailBroadcastModel.COMPLETED)
+        logger.info(f"Broadcast '{name}' completed")
+
+    def failures(self, db: Session, broadcast_id: int, limit: int = 100) -> List[EmailBroadcastFailureModel]:
+        return (
+            db.query(EmailBroadcastFailureModel)
+            .filter(EmailBroadcastFailureModel.broadcast_id == broadcast_id)
+            .order_by(EmailBroadcastFailureModel.registration_id)
+            .limit(limit)
+            .all()
+        )
+
+    def _release(self, db: Session, broadcast_id: int, run_token: str, status: str, error: Optional[str] = None) -> None:
+        values = {"status": status, "lease_until": None, "run_token": None, "last_error": error[:2000] if error else None}
+        if status == EmailBroadcastModel.COMPLETED:
+            values["completed_at"] = func.now()
+        released = db.execute(
+            update(EmailBroadcastModel)
+            .where(EmailBroadcastModel.id == broadcast_id, EmailBroadcastModel.run_token == run_token)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if released.rowcount:
+            change_bus.notify(db, EMAIL_BROADCAST_CHANGED, {})
+        db.commit()
+
+# Create global instance
+email_broadcast_connector = EmailBroadcastConnector()
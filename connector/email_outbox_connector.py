@@ -0,0 +1,144 @@
+from models.crude_operations_model import CrudeOperationsModel
+from models.email_outbox_model import EmailOutboxModel
+from sqlalchemy import update, select, func
+from sqlalchemy.orm import Session
+from datetime import timedelta
+from typing import List
+from utils.change_bus import change_bus, EMAIL_QUEUED
+import os
+import json
+import random
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Attempts before an email is marked failed
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.environ.get("EMAIL_OUTBOX_MAX_ATTEMPTS", "8"))
+# Retry delay after the first failure; doubles per attempt up to the maximum
+EMAIL_OUTBOX_RETRY_SECONDS = float(os.environ.get("EMAIL_OUTBOX_RETRY_SECONDS", "30"))
+EMAIL_OUTBOX_MAX_RETRY_SECONDS = float(os.environ.get("EMAIL_OUTBOX_MAX_RETRY_SECONDS", "3600"))
+# How long a claimed email is reserved for its dispatcher; if that worker dies it is retried afterwards
+EMAIL_OUTBOX_LEASE_SECONDS = float(os.environ.get("EMAIL_OUTBOX_LEASE_SECONDS", "300"))
+
+class EmailOutboxConnector(CrudeOperationsModel[EmailOutboxModel, None, None]):
+    """
+    Transactional outbox for outgoing email.
+
+    Handlers enqueue an email in the same transaction as the registration it
+    confirms, so it is recorded exactly when the registration commits and the
+    request never waits on SES. Dispatchers in any worker claim due emails
+    with FOR UPDATE SKIP LOCKED under a lease, send them outside any
+    transaction and record the outcome; failures are retried with exponential
+    backoff and kept, with their last error, once attempts run out.
+    """
+
+    def __init__(self):
+        super().__init__(EmailOutboxModel)
+
+    def enqueue(self, db: Session, email_type: str, recipient_email: str, payload: dict) -> EmailOutboxModel:
+        """
+        Add an email to the caller's transaction; it is committed with it, never on its own
+        Returns: the pending outbox row
+        """
+        outbox = EmailOutboxModel(
+            email_type=email_type,
+            recipient_email=recipient_email,
+            payload=json.dumps(payload)
+        )
+        db.add(outbox)
+        # Wakes the dispatchers once the transaction commits
+        change_bus.notify(db, EMAIL_QUEUED, {})
+        return outbox
+
+    def claim_due(self, db: Session, limit: int, lease_seconds: float = EMAIL_OUTBOX_LEASE_SECONDS) -> List:
+        """
+        Lease up to limit due emails to the calling dispatcher and count the attempt
+        Concurrent dispatchers skip each other's rows instead of waiting on them.
+        Returns: rows of (id, email_type, recipient_email, payload, attempts)
+        """
+        due = (
+            select(EmailOutboxModel.id)
+            .where(EmailOutboxModel.status == EmailOutboxModel.PENDING, EmailOutboxModel.next_attempt_at <= func.now())
+            .order_by(EmailOutboxModel.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        rows = db.execute(
+            update(EmailOutboxModel)
+            .where(EmailOutboxModel.id.in_(due))
+            .values(
+                attempts=EmailOutboxModel.attempts + 1,
+                next_attempt_at=func.now() + timedelta(seconds=lease_seconds)
+            )
+            .returning(
+                EmailOutboxModel.id, EmailOutboxModel.email_type, EmailOutboxModel.recipient_email,
+                EmailOutboxModel.payload, EmailOutboxModel.attempts
+            )
+            .execution_options(synchronize_session=False)
+        ).all()
+        db.commit()
+        return rows
+
+    def mark_sent(self, db: Session, outbox_id: int) -> None:
+        db.execute(
+            update(EmailOutboxModel)
+            .where(EmailOutboxModel.id == outbox_id)
+            .values(status=EmailOutboxModel.SENT, sent_at=func.now(), last_error=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+    def mark_attempt_failed(self, db: Session, outbox_id: int, attempts: int, error: str, max_attempts: int = EMAIL_OUTBOX_MAX_ATTEMPTS) -> bool:
+        """
+        Schedule a retry with exponential backoff, or give up after max_attempts
+        Returns: True if the email will be retried
+        """
+        retry = attempts < max_attempts
+        if retry:
+            delay = min(EMAIL_OUTBOX_RETRY_SECONDS * 2 ** (attempts - 1), EMAIL_OUTBOX_MAX_RETRY_SECONDS)
+            # Jitter spreads out retries of emails that failed together
+            values = {"next_attempt_at": func.now() + timedelta(seconds=delay * random.uniform(0.8, 1.2))}
+        else:
+            values = {"status": EmailOutboxModel.FAILED}
+        db.execute(
+            update(EmailOutboxModel)
+            .where(EmailOutboxModel.id == outbox_id)
+            .values(last_error=error[:2000], **values)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return retry
+
+    def requeue(self, db: Session, outbox_id: int, delay_seconds: float, reason: str) -> None:
+        """Put a claimed email back without counting the attempt (throttled by SES, or never sent)"""
+        db.execute(
+            update(EmailOutboxModel)
+            .where(EmailOutboxModel.id == outbox_id)
+            .values(
+                attempts=EmailOutboxModel.attempts - 1,
+                next_attempt_at=func.now() + timedelta(seconds=delay_seconds),
+                last_error=reason
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+    def queue_depth(self, db: Session) -> dict:
+        """
+        Outbox backlog in one aggregate
+        Returns: {"due", "scheduled", "failed"}; scheduled covers retries and leased emails
+        """
+        pending = EmailOutboxModel.status == EmailOutboxModel.PENDING
+        due = EmailOutboxModel.next_attempt_at <= func.now()
+        depth = db.execute(
+            select(
+                func.count().filter(pending, due).label("due"),
+                func.count().filter(pending, ~due).label("scheduled"),
+                func.count().filter(EmailOutboxModel.status == EmailOutboxModel.FAILED).label("failed")
+            )
+        ).one()
+        return dict(depth._mapping)
+
+# Create global instance
+email_outbox_connector = EmailOutboxConnector()
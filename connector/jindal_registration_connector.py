@@ -1,7 +1,12 @@
 from models.crude_operations_model import CrudeOperationsModel
 from models.jindal_registration_model import JindalRegistrationModel
+from models.registration_sport_model import RegistrationSportModel
+from connector.registration_sports_connector import registration_sports_connector
+from connector.registration_rollups_connector import registration_rollups_connector
+from utils.change_bus import change_bus, JINDAL_SUMMARY_CHANGED
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from typing import Optional, List
+from typing import Optional, List, Tuple
 import json
 import logging
 
@@ -9,7 +14,13 @@ logger = logging.getLogger(__name__)
 
 class JindalRegistrationConnector(CrudeOperationsModel[JindalRegistrationModel, None, None]):
     def __init__(self):
-        super().__init__(JindalRegistrationModel)
+        super().__init__(JindalRegistrationModel, insert_returning=True)
+
+    def after_create(self, db: Session, db_obj: JindalRegistrationModel) -> None:
+        # Keep registration_sports and the rollups in step with the registration, same transaction
+        registration_sports_connector.add_sports(db, RegistrationSportModel.JINDAL, db_obj.id, db_obj.selected_sports)
+        registration_rollups_connector.record(db, RegistrationSportModel.JINDAL, db_obj)
+        change_bus.notify(db, JINDAL_SUMMARY_CHANGED, {})
 
     def create_registration(self, db: Session, registration_data: dict) -> JindalRegistrationModel:
         """
@@ -19,10 +30,7 @@ class JindalRegistrationConnector(CrudeOperationsModel[JindalRegistrationModel,
         if 'selected_sports' in registration_data and isinstance(registration_data['selected_sports'], list):
             registration_data['selected_sports'] = json.dumps(registration_data['selected_sports'])
         
-        registration = JindalRegistrationModel(**registration_data)
-        db.add(registration)
-        db.commit()
-        db.refresh(registration)
+        registration = self.create(db, registration_data)
         
         logger.info(f"Created Jindal registration for {registration.first_name} {registration.last_name}")
         return registration
@@ -42,6 +50,50 @@ class JindalRegistrationConnector(CrudeOperationsModel[JindalRegistrationModel,
             (JindalRegistrationModel.jgu_student_id == jgu_student_id.upper())
         ).first()
 
+    def list_registrations_page(
+        self,
+        db: Session,
+        limit: int,
+        cursor: Optional[str] = None,
+        payment_status: Optional[str] = None,
+        state: Optional[str] = None,
+        city: Optional[str] = None,
+        sport: Optional[str] = None
+    ) -> Tuple[List[JindalRegistrationModel], Optional[str]]:
+        """
+        Newest-first page of registrations using keyset pagination on (created_at, id)
+        Each page is an index range scan, however deep the admin pages.
+        Returns: (registrations, next_cursor); next_cursor is None on the last page
+        Raises ValueError for an invalid cursor
+        """
+        return self.keyset_page(
+            db, limit, cursor,
+            query=self.filtered_query(db, payment_status, state, city, sport),
+            keys=("created_at", "id")
+        )
+
+    def filtered_query(
+        self,
+        db: Session,
+        payment_status: Optional[str] = None,
+        state: Optional[str] = None,
+        city: Optional[str] = None,
+        sport: Optional[str] = None
+    ):
+        """Registrations query with the admin list filters applied"""
+        query = db.query(JindalRegistrationModel)
+        if payment_status:
+            query = query.filter(JindalRegistrationModel.payment_status == payment_status)
+        if state:
+            query = query.filter(JindalRegistrationModel.state == state)
+        if city:
+            query = query.filter(JindalRegistrationModel.city == city)
+        if sport:
+            query = query.filter(JindalRegistrationModel.id.in_(
+                registration_sports_connector.registration_ids_for_sport(db, RegistrationSportModel.JINDAL, sport)
+            ))
+        return query
+
     def get_by_payment_status(self, db: Session, payment_status: str) -> List[JindalRegistrationModel]:
         """Get registrations by payment status"""
         return db.query(JindalRegistrationModel).filter_by(payment_status=payment_status).all()
@@ -50,33 +102,36 @@ class JindalRegistrationConnector(CrudeOperationsModel[JindalRegistrationModel,
         """Update payment status and proof"""
         registration = db.query(JindalRegistrationModel).filter_by(id=registration_id).first()
         if registration:
+            before = registration_rollups_connector.contributions(RegistrationSportModel.JINDAL, registration)
             registration.payment_status = payment_status
             if payment_proof:
                 registration.payment_proof = payment_proof
+            registration_rollups_connector.apply_change(
+                db, before, registration_rollups_connector.contributions(RegistrationSportModel.JINDAL, registration)
+            )
+            change_bus.notify(db, JINDAL_SUMMARY_CHANGED, {})
             db.commit()
             db.refresh(registration)
             logger.info(f"Updated payment status for registration {registration_id} to {payment_status}")
         return registration
 
     def get_registrations_summary(self, db: Session) -> dict:
-        """Get summary of all registrations"""
-        total_registrations = db.query(JindalRegistrationModel).count()
-        pending_payments = db.query(JindalRegistrationModel).filter_by(payment_status="pending").count()
-        completed_payments = db.query(JindalRegistrationModel).filter_by(payment_status="completed").count()
-        failed_payments = db.query(JindalRegistrationModel).filter_by(payment_status="failed").count()
-        
-        # Calculate total revenue
-        total_revenue = db.query(JindalRegistrationModel).filter_by(payment_status="completed").with_entities(
-            db.func.sum(JindalRegistrationModel.total_amount)
-        ).scalar() or 0
+        """
+        Get summary of all registrations
+        Every figure comes from one aggregate over the table (COUNT/SUM ... FILTER).
+        """
+        payment_status = JindalRegistrationModel.payment_status
+        summary = db.query(
+            func.count().label("total_registrations"),
+            func.count().filter(payment_status == "pending").label("pending_payments"),
+            func.count().filter(payment_status == "completed").label("completed_payments"),
+            func.count().filter(payment_status == "failed").label("failed_payments"),
+            func.coalesce(
+                func.sum(JindalRegistrationModel.total_amount).filter(payment_status == "completed"), 0
+            ).label("total_revenue")
+        ).one()
         
-        return {
-            "total_registrations": total_registrations,
-            "pending_payments": pending_payments,
-            "completed_payments": completed_payments,
-            "failed_payments": failed_payments,
-            "total_revenue": total_revenue
-        }
+        return dict(summary._mapping)
 
     def get_registration_with_sports(self, db: Session, registration_id: int) -> Optional[dict]:
         """Get registration with parsed sports data"""
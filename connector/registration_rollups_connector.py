@@ -0,0 +1,166 @@
+from models.crude_operations_model import CrudeOperationsModel
+from models.registration_rollup_model import RegistrationRollupModel
+from models.registration_sport_model import RegistrationSportModel
+from connector.registration_sports_connector import sport_keys
+from utils.timezone_utils import convert_to_ist, get_current_ist_time
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# (bucket_start, registration_type, sport_key, payment_status) -> (registrations, amount)
+Contributions = Dict[Tuple[datetime, str, str, str], Tuple[int, int]]
+
+# Registration table and amount column of each registration_type, for rebuild()
+ROLLUP_SOURCES = {
+    RegistrationSportModel.EVENT: ("event_registrations", "0"),
+    RegistrationSportModel.ORANGETHEORY: ("orangetheory_registrations", "0"),
+    RegistrationSportModel.JINDAL: ("jindal_registrations", "r.total_amount"),
+}
+
+# Same bucketing as bucket_start(), in SQL
+_SQL_BUCKET = "timezone('Asia/Kolkata', date_trunc('hour', timezone('Asia/Kolkata', r.created_at)))"
+
+def bucket_start(created_at: Optional[datetime]) -> datetime:
+    """Start of the IST hour a registration falls in"""
+    return convert_to_ist(created_at or get_current_ist_time()).replace(minute=0, second=0, microsecond=0)
+
+class RegistrationRollupsConnector(CrudeOperationsModel[RegistrationRollupModel, None, None]):
+    """
+    Hourly registration and revenue counts per registration type, sport and payment status.
+
+    Each create or payment status change adds its delta to the affected buckets
+    in the same transaction, so the rollups always agree with the registration
+    tables and dashboards read a few hundred rows instead of scanning them.
+    Every registration counts once in its type's ALL_SPORTS row and once in
+    each of its sports' rows. Methods here never commit; the caller's
+    transaction decides.
+    """
+
+    def __init__(self):
+        super().__init__(RegistrationRollupModel)
+
+    def contributions(self, registration_type: str, registration) -> Contributions:
+        """What one registration, in its current state, adds to the rollups"""
+        start = bucket_start(registration.created_at)
+        payment_status = registration.payment_status or "pending"
+        amount = getattr(registration, "total_amount", 0) or 0
+        return {
+            (start, registration_type, sport_key, payment_status): (1, amount)
+            for sport_key in [RegistrationRollupModel.ALL_SPORTS] + sport_keys(registration.selected_sports)
+        }
+
+    def record(self, db: Session, registration_type: str, registration) -> None:
+        """Count a new registration in"""
+        self.apply_change(db, {}, self.contributions(registration_type, registration))
+
+    def apply_change(self, db: Session, before: Contributions, after: Contributions) -> None:
+        """
+        Move a registration's counts from its old buckets to its new ones
+        Upserts all deltas in one statement, in key order, so concurrent writers
+        lock bucket rows in the same order and cannot deadlock.
+        """
+        deltas = {}
+        for key in before.keys() | after.keys():
+            registrations = after.get(key, (0, 0))[0] - before.get(key, (0, 0))[0]
+            amount = after.get(key, (0, 0))[1] - before.get(key, (0, 0))[1]
+            if registrations or amount:
+                deltas[key] = (registrations, amount)
+        if not deltas:
+            return
+
+        statement = insert(RegistrationRollupModel).values([
+            {
+                "bucket_start": start,
+                "registration_type": registration_type,
+                "sport_key": sport_key,
+                "payment_status": payment_status,
+                "registrations": registrations,
+                "amount": amount
+            }
+            for (start, registration_type, sport_key, payment_status), (registrations, amount) in sorted(deltas.items())
+        ])
+        db.execute(statement.on_conflict_do_update(
+            constraint="uq_registration_rollups",
+            set_={
+                "registrations": RegistrationRollupModel.registrations + statement.excluded.registrations,
+                "amount": RegistrationRollupModel.amount + statement.excluded.amount,
+                "updated_at": func.now()
+            }
+        ))
+
+    def time_series(
+        self,
+        db: Session,
+        registration_type: Optional[str] = None,
+        sport_key: str = RegistrationRollupModel.ALL_SPORTS,
+        payment_status: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        bucket: str = "hour"
+    ) -> List[dict]:
+        """
+        Registrations and amount per hour or IST day, summed over the dimensions not filtered on
+        Returns: [{"bucket_start", "registrations", "amount"}] oldest first
+        """
+        bucket_column = RegistrationRollupModel.bucket_start
+        if bucket == "day":
+            bucket_column = func.timezone("Asia/Kolkata", func.date_trunc("day", func.timezone("Asia/Kolkata", bucket_column)))
+        bucket_column = bucket_column.label("bucket_start")
+
+        query = db.query(
+            bucket_column,
+            func.sum(RegistrationRollupModel.registrations).label("registrations"),
+            func.sum(RegistrationRollupModel.amount).label("amount")
+        ).filter(RegistrationRollupModel.sport_key == sport_key.lower())
+        if registration_type:
+            query = query.filter(RegistrationRollupModel.registration_type == registration_type)
+        if payment_status:
+            query = query.filter(RegistrationRollupModel.payment_status == payment_status)
+        if since:
+            query = query.filter(RegistrationRollupModel.bucket_start >= since)
+        if until:
+            query = query.filter(RegistrationRollupModel.bucket_start < until)
+
+        rows = query.group_by(bucket_column).order_by(bucket_column).all()
+        return [
+            {"bucket_start": row.bucket_start, "registrations": int(row.registrations), "amount": int(row.amount)}
+            for row in rows
+        ]
+
+    def rebuild(self, db: Session) -> int:
+        """
+        Recompute every bucket from the registration tables
+        Locks the rollups against concurrent writers until the caller commits,
+        so registrations created meanwhile are counted exactly once.
+        Returns: number of bucket rows written
+        """
+        db.execute(text("LOCK TABLE registration_rollups IN EXCLUSIVE MODE"))
+        db.execute(text("DELETE FROM registration_rollups"))
+
+        written = 0
+        for registration_type, (table, amount) in ROLLUP_SOURCES.items():
+            totals_sql = f"""
+                INSERT INTO registration_rollups (bucket_start, registration_type, sport_key, payment_status, registrations, amount)
+                SELECT {_SQL_BUCKET}, :registration_type, :all_sports, COALESCE(r.payment_status, 'pending'), COUNT(*), COALESCE(SUM({amount}), 0)
+                FROM {table} r
+                GROUP BY 1, 4
+            """
+            per_sport_sql = f"""
+                INSERT INTO registration_rollups (bucket_start, registration_type, sport_key, payment_status, registrations, amount)
+                SELECT {_SQL_BUCKET}, :registration_type, rs.sport_key, COALESCE(r.payment_status, 'pending'), COUNT(*), COALESCE(SUM({amount}), 0)
+                FROM {table} r
+                JOIN registration_sports rs ON rs.registration_type = :registration_type AND rs.registration_id = r.id
+                GROUP BY 1, 3, 4
+            """
+            params = {"registration_type": registration_type, "all_sports": RegistrationRollupModel.ALL_SPORTS}
+            written += db.execute(text(totals_sql), params).rowcount
+            written += db.execute(text(per_sport_sql), params).rowcount
+        return written
+
+# Create global instance
+registration_rollups_connector = RegistrationRollupsConnector()
@@ -0,0 +1,98 @@
+from models.crude_operations_model import CrudeOperationsModel
+from models.registration_sport_model import RegistrationSportModel
+from utils.selected_sports import parse_selected_sports
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Length of registration_sports.sport_key
+MAX_SPORT_KEY_LENGTH = 50
+
+def sport_keys(selected_sports: Optional[str]) -> List[str]:
+    """Distinct, lowercased sport keys of a stored selected_sports value, as written to registration_sports"""
+    return list(dict.fromkeys(
+        sport.lower() for sport in parse_selected_sports(selected_sports)
+        if len(sport) <= MAX_SPORT_KEY_LENGTH
+    ))
+
+class RegistrationSportsConnector(CrudeOperationsModel[RegistrationSportModel, None, None]):
+    """
+    Normalized copy of the selected_sports column of every registration table.
+
+    Rows are written in the same transaction as the registration itself, so
+    counting and listing registrants by sport are index scans on
+    registration_sports instead of parsing JSON text in Python. Methods here
+    never commit; the caller's transaction decides.
+    """
+
+    def __init__(self):
+        super().__init__(RegistrationSportModel)
+
+    def add_sports(self, db: Session, registration_type: str, registration_id: int, selected_sports: Optional[str]) -> int:
+        """
+        Insert a row per sport named in a stored selected_sports value
+        Returns: number of sports written
+        """
+        keys = sport_keys(selected_sports)
+        if not keys:
+            return 0
+
+        db.execute(
+            insert(RegistrationSportModel)
+            .values([
+                {"registration_type": registration_type, "registration_id": registration_id, "sport_key": sport_key}
+                for sport_key in keys
+            ])
+            .on_conflict_do_nothing(constraint="uq_registration_sports")
+        )
+        return len(keys)
+
+    def replace_sports(self, db: Session, registration_type: str, registration_id: int, selected_sports: Optional[str]) -> int:
+        """
+        Replace the sports of a registration after its selected_sports changed
+        Returns: number of sports written
+        """
+        db.execute(
+            delete(RegistrationSportModel).where(
+                RegistrationSportModel.registration_type == registration_type,
+                RegistrationSportModel.registration_id == registration_id
+            )
+        )
+        return self.add_sports(db, registration_type, registration_id, selected_sports)
+
+    def count_by_sport(self, db: Session, registration_type: str, sports: Iterable[str]) -> Dict[str, int]:
+        """
+        Count registrations of one type per sport
+        Returns: {sport: count} for the requested sports
+        """
+        sport_counts = {sport: 0 for sport in sports}
+        rows = (
+            db.query(RegistrationSportModel.sport_key, func.count(RegistrationSportModel.id))
+            .filter(
+                RegistrationSportModel.registration_type == registration_type,
+                RegistrationSportModel.sport_key.in_(list(sport_counts))
+            )
+            .group_by(RegistrationSportModel.sport_key)
+            .all()
+        )
+        for sport_key, count in rows:
+            sport_counts[sport_key] = count
+        return sport_counts
+
+    def registration_ids_for_sport(self, db: Session, registration_type: str, sport_key: str):
+        """Subquery of registration ids of one type that chose a sport"""
+        return (
+            db.query(RegistrationSportModel.registration_id)
+            .filter(
+                RegistrationSportModel.sport_key == sport_key.lower(),
+                RegistrationSportModel.registration_type == registration_type
+            )
+            .scalar_subquery()
+        )
+
+# Create global instance
+registration_sports_connector = RegistrationSportsConnector()
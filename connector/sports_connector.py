@@ -1,11 +1,19 @@
 from models.crude_operations_model import CrudeOperationsModel
 from models.sports_model import SportsModel
+from sqlalchemy import and_, func, select, update
 from sqlalchemy.orm import Session
 from typing import Optional, List
 import logging
+from utils.change_bus import change_bus, SPORT_CHANGED
 
 logger = logging.getLogger(__name__)
 
+# SQL counterparts of SportsModel.remaining_tickets and SportsModel.is_available
+REMAINING_TICKETS = func.greatest(
+    0, SportsModel.max_capacity - SportsModel.current_count - func.coalesce(SportsModel.held_count, 0)
+)
+IS_AVAILABLE = and_(SportsModel.is_active.is_(True), SportsModel.is_sold_out.is_(False), REMAINING_TICKETS > 0)
+
 class SportsConnector(CrudeOperationsModel[SportsModel, None, None]):
     def __init__(self):
         super().__init__(SportsModel)
@@ -25,8 +33,38 @@ class SportsConnector(CrudeOperationsModel[SportsModel, None, None]):
     def purchase_tickets(self, db: Session, sport_key: str, quantity: int = 1) -> tuple[bool, str, Optional[SportsModel]]:
         """
         Purchase tickets for a sport
+        Capacity is checked and consumed by a single conditional UPDATE ... RETURNING,
+        so concurrent buyers can never oversell and the row is locked only for that statement.
         Returns: (success, message, sport_object)
         """
+        new_count = SportsModel.current_count + quantity
+        stmt = (
+            update(SportsModel)
+            .where(
+                SportsModel.sport_key == sport_key,
+                SportsModel.is_active.is_(True),
+                SportsModel.is_sold_out.is_(False),
+                # Tickets reserved by other sessions' holds are not for sale
+                new_count + SportsModel.held_count <= SportsModel.max_capacity
+            )
+            .values(
+                current_count=new_count,
+                is_sold_out=new_count >= SportsModel.max_capacity,
+                is_active=new_count < SportsModel.max_capacity
+            )
+            .returning(SportsModel)
+        )
+        sport = db.scalars(stmt).one_or_none()
+        
+        if sport:
+            # Keep the returned values readable after commit without a reload
+            change_bus.notify(db, SPORT_CHANGED, sport.availability_snapshot())
+            db.expunge(sport)
+            db.commit()
+            logger.info(f"Purchased {quantity} tickets for {sport.sport_name}. New count: {sport.current_count}")
+            return True, f"Successfully purchased {quantity} ticket(s) for {sport.sport_name}", sport
+        
+        # Nothing was updated: work out why for the caller
         sport = self.get_by_sport_key(db, sport_key)
         
         if not sport:
@@ -38,16 +76,7 @@ class SportsConnector(CrudeOperationsModel[SportsModel, None, None]):
         if sport.is_sold_out:
             return False, f"{sport.sport_name} is sold out", sport
         
-        if sport.current_count + quantity > sport.max_capacity:
-            return False, f"Only {sport.remaining_tickets} tickets remaining for {sport.sport_name}", sport
-        
-        # Increment count
-        if sport.increment_count(quantity):
-            db.commit()
-            logger.info(f"Purchased {quantity} tickets for {sport.sport_name}. New count: {sport.current_count}")
-            return True, f"Successfully purchased {quantity} ticket(s) for {sport.sport_name}", sport
-        else:
-            return False, f"Failed to purchase tickets for {sport.sport_name}", sport
+        return False, f"Only {sport.remaining_tickets} tickets remaining for {sport.sport_name}", sport
 
     def refund_tickets(self, db: Session, sport_key: str, quantity: int = 1) -> tuple[bool, str, Optional[SportsModel]]:
         """
@@ -64,6 +93,7 @@ class SportsConnector(CrudeOperationsModel[SportsModel, None, None]):
         
         # Decrement count
         if sport.decrement_count(quantity):
+            change_bus.notify(db, SPORT_CHANGED, sport.availability_snapshot())
             db.commit()
             logger.info(f"Refunded {quantity} tickets for {sport.sport_name}. New count: {sport.current_count}")
             return True, f"Successfully refunded {quantity} ticket(s) for {sport.sport_name}", sport
@@ -81,6 +111,7 @@ class SportsConnector(CrudeOperationsModel[SportsModel, None, None]):
             return False, f"Sport '{sport_key}' not found", None
         
         sport.reset_count()
+        change_bus.notify(db, SPORT_CHANGED, sport.availability_snapshot())
         db.commit()
         logger.info(f"Reset ticket count for {sport.sport_name}")
         return True, f"Successfully reset ticket count for {sport.sport_name}", sport
@@ -99,22 +130,48 @@ class SportsConnector(CrudeOperationsModel[SportsModel, None, None]):
             return False, "Capacity must be greater than 0", sport
         
         sport.set_capacity(new_capacity)
+        change_bus.notify(db, SPORT_CHANGED, sport.availability_snapshot())
         db.commit()
         logger.info(f"Updated capacity for {sport.sport_name} to {new_capacity}")
         return True, f"Successfully updated capacity for {sport.sport_name} to {new_capacity}", sport
 
+    def list_sports_availability(self, db: Session) -> List[dict]:
+        """
+        Listing fields and availability of every sport as plain dicts
+        Selects only the listed columns and computes availability in SQL, so no
+        ORM objects are loaded into the session.
+        """
+        return [
+            dict(row) for row in db.execute(
+                select(
+                    SportsModel.sport_key,
+                    SportsModel.sport_name,
+                    SportsModel.price,
+                    SportsModel.current_count,
+                    SportsModel.max_capacity,
+                    REMAINING_TICKETS.label("remaining_tickets"),
+                    IS_AVAILABLE.label("is_available"),
+                    SportsModel.is_sold_out,
+                    SportsModel.timing
+                ).order_by(SportsModel.id)
+            ).mappings()
+        ]
+
     def get_sports_summary(self, db: Session) -> dict:
-        """Get summary of all sports"""
-        all_sports = db.query(SportsModel).all()
-        available_sports = [s for s in all_sports if s.is_available]
-        sold_out_sports = [s for s in all_sports if s.is_sold_out]
+        """
+        Get summary of all sports
+        Every figure comes from one aggregate over the table.
+        """
+        summary = db.execute(
+            select(
+                func.count().label("total_sports"),
+                func.count().filter(IS_AVAILABLE).label("available_sports"),
+                func.count().filter(SportsModel.is_sold_out.is_(True)).label("sold_out_sports"),
+                func.coalesce(func.sum(SportsModel.current_count), 0).label("total_tickets_sold"),
+                func.coalesce(func.sum(SportsModel.max_capacity), 0).label("total_capacity")
+            )
+        ).one()
         
-        return {
-            "total_sports": len(all_sports),
-            "available_sports": len(available_sports),
-            "sold_out_sports": len(sold_out_sports),
-            "total_tickets_sold": sum(s.current_count for s in all_sports),
-            "total_capacity": sum(s.max_capacity for s in all_sports)
-        }
+        return dict(summary._mapping)
 
 sports_connector = SportsConnector()
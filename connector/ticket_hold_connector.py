@@ -0,0 +1,204 @@
+from models.crude_operations_model import CrudeOperationsModel
+from models.ticket_hold_model import TicketHoldModel
+from models.sports_model import SportsModel
+from sqlalchemy import update, delete, select, func, case
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from typing import List, Optional
+from utils.change_bus import change_bus, SPORT_CHANGED
+import os
+import re
+import uuid
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+# How long a hold keeps tickets reserved while the user fills out the registration form
+TICKET_HOLD_TTL_SECONDS = int(os.environ.get("TICKET_HOLD_TTL_SECONDS", "600"))
+# Tickets one hold session may hold at a time, across all its holds, so nobody can keep a sport "sold out"
+TICKET_HOLD_MAX_TICKETS_PER_CLIENT = int(os.environ.get("TICKET_HOLD_MAX_TICKETS_PER_CLIENT", "4"))
+
+HOLD_SESSION_RE = re.compile(r"[0-9a-f]{32}")
+
+def hold_session(presented: Optional[str]) -> str:
+    """
+    The hold session a client presented, or a new one if it presented none or a malformed one
+    Issued with a client's first hold and sent back with the next ones. The client
+    address can't identify a client: behind the Heroku router every request comes
+    from a handful of router addresses.
+    """
+    if presented and HOLD_SESSION_RE.fullmatch(presented):
+        return presented
+    return uuid.uuid4().hex
+
+def holder_key(session: str) -> str:
+    """Key a hold is bound to; the session is hashed rather than stored"""
+    return hashlib.blake2b(session.encode(), digest_size=16).hexdigest()
+
+class TicketHoldConnector(CrudeOperationsModel[TicketHoldModel, None, None]):
+    """
+    Reservation holds for high-demand sport drops.
+
+    A hold moves tickets into sports.held_count, so reads of remaining_tickets
+    account for active holds without touching the ticket_holds table. Holds are
+    converted into sold tickets in the registration's own transaction, or
+    released by the sweeper once they expire. Every transition is a single
+    statement, safe across workers.
+    """
+
+    def __init__(self):
+        super().__init__(TicketHoldModel)
+
+    def create_hold(
+        self,
+        db: Session,
+        sport_key: str,
+        quantity: int = 1,
+        holder: str = None,
+        ttl_seconds: int = TICKET_HOLD_TTL_SECONDS,
+        max_tickets_per_holder: int = TICKET_HOLD_MAX_TICKETS_PER_CLIENT
+    ) -> tuple[bool, str, Optional[TicketHoldModel]]:
+        """
+        Reserve tickets for a hold session, up to max_tickets_per_holder in active holds at once
+        holder is a holder_key(); concurrent requests of one holder are serialised on it.
+        Returns: (success, message, hold_object)
+        """
+        if holder is not None:
+            db.execute(select(func.pg_advisory_xact_lock(func.hashtext(holder))))
+            already_held = db.scalar(
+                select(func.coalesce(func.sum(TicketHoldModel.quantity), 0))
+                .where(TicketHoldModel.holder_key == holder, TicketHoldModel.expires_at > func.now())
+            )
+            if already_held + quantity > max_tickets_per_holder:
+                db.rollback()
+                return False, f"You can hold at most {max_tickets_per_holder} tickets at a time; you already hold {already_held}", None
+
+        reserved = db.scalars(
+            update(SportsModel)
+            .where(
+                SportsModel.sport_key == sport_key,
+                SportsModel.is_active.is_(True),
+                SportsModel.is_sold_out.is_(False),
+                SportsModel.current_count + SportsModel.held_count + quantity <= SportsModel.max_capacity
+            )
+            .values(held_count=SportsModel.held_count + quantity)
+            .returning(SportsModel)
+        ).one_or_none()
+
+        if reserved is None:
+            sport = db.query(SportsModel).filter_by(sport_key=sport_key).first()
+            if not sport:
+                return False, f"Sport '{sport_key}' not found", None
+            if not sport.is_active:
+                return False, f"{sport.sport_name} is currently inactive", None
+            if sport.is_sold_out:
+                return False, f"{sport.sport_name} is sold out", None
+            return False, f"Only {sport.remaining_tickets} tickets remaining for {sport.sport_name}", None
+
+        hold = TicketHoldModel(
+            hold_token=uuid.uuid4().hex,
+            sport_key=sport_key,
+            holder_key=holder,
+            quantity=quantity,
+            expires_at=datetime.now().astimezone() + timedelta(seconds=ttl_seconds)
+        )
+        db.add(hold)
+        change_bus.notify(db, SPORT_CHANGED, reserved.availability_snapshot())
+        db.expunge(reserved)
+        db.commit()
+        logger.info(f"Held {quantity} tickets for {reserved.sport_name} until {hold.expires_at}")
+        return True, f"Reserved {quantity} ticket(s) for {reserved.sport_name}", hold
+
+    def convert_hold(self, db: Session, hold_token: str, sport_keys: List[str]) -> tuple[bool, str, Optional[SportsModel]]:
+        """
+        Sell one held ticket to a registration, in the caller's transaction
+        sport_keys are the registration's selected sports; the hold must be for one of
+        them. A registration is one ticket, so a hold of several tickets stays open
+        with the rest until each is registered or it expires. Call it before the
+        registration is created; create() commits both, so the ticket is sold exactly
+        when the registration exists.
+        Returns: (success, message, sport_object)
+        """
+        claimed = (
+            update(TicketHoldModel)
+            .where(
+                TicketHoldModel.hold_token == hold_token,
+                TicketHoldModel.sport_key.in_(sport_keys),
+                TicketHoldModel.quantity > 0,
+                TicketHoldModel.expires_at > func.now()
+            )
+            .values(quantity=TicketHoldModel.quantity - 1)
+            .returning(TicketHoldModel.sport_key)
+            .cte("claimed")
+        )
+        new_count = SportsModel.current_count + 1
+        sold_out = new_count >= SportsModel.max_capacity
+        sport = db.scalars(
+            update(SportsModel)
+            .where(SportsModel.sport_key == claimed.c.sport_key)
+            .values(
+                held_count=SportsModel.held_count - 1,
+                current_count=new_count,
+                is_sold_out=case((sold_out, True), else_=SportsModel.is_sold_out),
+                is_active=case((sold_out, False), else_=SportsModel.is_active)
+            )
+            .returning(SportsModel)
+            .execution_options(synchronize_session=False)
+        ).one_or_none()
+
+        if sport is None:
+            hold = db.scalars(
+                select(TicketHoldModel)
+                .where(TicketHoldModel.hold_token == hold_token, TicketHoldModel.quantity > 0, TicketHoldModel.expires_at > func.now())
+            ).one_or_none()
+            if hold is not None:
+                return False, f"Ticket hold is for {hold.sport_key}, which is not one of the selected sports", None
+            return False, "Ticket hold not found or expired", None
+
+        # Fully converted holds are done with
+        db.execute(delete(TicketHoldModel).where(TicketHoldModel.hold_token == hold_token, TicketHoldModel.quantity <= 0))
+        change_bus.notify(db, SPORT_CHANGED, sport.availability_snapshot())
+        db.expunge(sport)
+        logger.info(f"Converting a ticket of hold {hold_token} for {sport.sport_name}. New count: {sport.current_count}")
+        return True, f"Hold converted for {sport.sport_name}", sport
+
+    def release_hold(self, db: Session, hold_token: str) -> bool:
+        """Give the tickets of a hold back before it expires"""
+        released = self._release(db, TicketHoldModel.hold_token == hold_token)
+        if released:
+            logger.info(f"Released hold {hold_token}")
+        return released > 0
+
+    def release_expired(self, db: Session) -> int:
+        """
+        Release every expired hold (called by the sweeper)
+        Returns the number of tickets returned to sale
+        """
+        released = self._release(db, TicketHoldModel.expires_at <= func.now())
+        if released:
+            logger.info(f"Released {released} tickets from expired holds")
+        return released
+
+    def _release(self, db: Session, condition) -> int:
+        """Delete matching holds and subtract their quantities from held_count in one statement"""
+        removed = delete(TicketHoldModel).where(condition).returning(TicketHoldModel.sport_key, TicketHoldModel.quantity).cte("removed")
+        totals = (
+            select(removed.c.sport_key, func.sum(removed.c.quantity).label("quantity"))
+            .group_by(removed.c.sport_key)
+            .cte("totals")
+        )
+        rows = db.execute(
+            update(SportsModel)
+            .where(SportsModel.sport_key == totals.c.sport_key)
+            .values(held_count=SportsModel.held_count - totals.c.quantity)
+            .returning(SportsModel, totals.c.quantity)
+            .execution_options(synchronize_session=False)
+        ).all()
+        for sport, _ in rows:
+            change_bus.notify(db, SPORT_CHANGED, sport.availability_snapshot())
+            db.expunge(sport)
+        db.commit()
+        return sum(quantity for _, quantity in rows)
+
+ticket_hold_connector = TicketHoldConnector()
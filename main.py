@@ -1,28 +1,31 @@
 # Core FastAPI imports
-from fastapi import FastAPI, Depends, HTTPException, Request, UploadFile, File, Form, status, Security
+from fastapi import FastAPI, Depends, HTTPException, Header, UploadFile, File, Form, Query, status, Security, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from sqlalchemy.orm import Session
 import json
 import os
 import logging
-import time
-import random
-import string
 from datetime import datetime
 from dotenv import load_dotenv
 from fastapi.security.api_key import APIKeyHeader
 from fastapi.openapi.utils import get_openapi
 import re
+import time
+import asyncio
+from contextlib import asynccontextmanager
 
 # Database and model imports
-from db.database import engine, Base, get_db, DBSession
+from db.database import engine, Base, get_db, DBSession, SessionLocal
 from models import *  # Your database models
 from models.event_registration_model import EventRegistrationModel
 from models.user_registration_model import UserRegistrationModel
-from models.sports_model import SportsModel
 from models.jindal_registration_model import JindalRegistrationModel
 from models.orangetheory_registration_model import OrangetheoryRegistrationModel
+from models.registration_sport_model import RegistrationSportModel
+from models.registration_rollup_model import RegistrationRollupModel
+from models.email_outbox_model import EmailOutboxModel
+from models.email_broadcast_model import EmailBroadcastModel
 
 # Schema imports
 from schemas.event_registration_schema import EventRegistrationSchema
@@ -31,29 +34,81 @@ from schemas.user_registration_schema import UserRegistrationCreate, UserRegistr
 from schemas.sports_schema import (
     SportsCreate, SportsResponse, SportsUpdate, 
     SportsAvailabilityResponse, SportsListResponse,
-    TicketPurchaseRequest, TicketPurchaseResponse
+    TicketPurchaseRequest, TicketPurchaseResponse,
+    TicketHoldRequest, TicketHoldResponse
 )
 from schemas.jindal_registration_schema import JindalRegistrationCreate, JindalRegistrationResponse, JindalRegistrationUpdate, JindalRegistrationListResponse
 from schemas.orangetheory_registration_schema import OrangetheoryRegistrationSchema, OrangetheoryRegistrationResponse, OrangetheoryRegistrationListResponse
+from schemas.email_broadcast_schema import EmailBroadcastCreate, EmailBroadcastResponse, EmailBroadcastFailureResponse
 
 # Connector imports
 from connector.connector import event_registration_connector, transaction_connector, user_registration_connector, sports_connector, orangetheory_registration_connector
 from connector.sports_connector import sports_connector as sports_connector_instance
 from connector.jindal_registration_connector import jindal_registration_connector
+from connector.ticket_hold_connector import ticket_hold_connector, hold_session, holder_key
+from connector.registration_sports_connector import registration_sports_connector, sport_keys
+from connector.registration_rollups_connector import registration_rollups_connector
+from connector.email_outbox_connector import email_outbox_connector
+from connector.email_broadcast_connector import email_broadcast_connector
 
 # AWS imports
-import boto3
 from botocore.exceptions import NoCredentialsError
 
 # Utility imports
 from utils.timezone_utils import format_ist_datetime
 from utils.email_utils import ses_email_service
+from utils.aws_clients import aws_clients
+from templates.email_templates import template_loader
+from utils.booking_id_generator import booking_id_generator
+from utils.pagination import MAX_PAGE_SIZE
+from utils.hold_sweeper import hold_sweeper
+from utils.response_cache import response_cache, SPORTS_CACHE_KEY, REGISTRATION_COUNTS_CACHE_KEY, JINDAL_SUMMARY_CACHE_KEY
+from utils.availability_broadcaster import availability_broadcaster, MAX_STREAM_SECONDS, RETRY_MESSAGE
+from utils.change_bus import change_bus, SPORT_CHANGED, REGISTRATION_COUNTS_CHANGED, JINDAL_SUMMARY_CHANGED, EMAIL_QUEUED, EMAIL_BROADCAST_CHANGED
+from utils.email_dispatcher import email_dispatcher
+from utils.rate_limiter import SlidingWindowRateLimiter, create_rate_limit_backend
+from utils.rate_limit_middleware import RateLimitMiddleware, RateLimitPolicy
+from utils.registration_export import iter_ndjson, iter_csv, iter_xlsx, count_export_rows, XLSX_EXPORT_MAX_ROWS
 
 # Load environment variables
 load_dotenv()
 
+# Committed changes from this worker and, via LISTEN/NOTIFY, from every other worker
+def apply_sport_change(data: dict):
+    response_cache.invalidate(SPORTS_CACHE_KEY)
+    availability_broadcaster.publish("sport", data)
+
+def apply_registration_counts_change(data: dict):
+    response_cache.invalidate(REGISTRATION_COUNTS_CACHE_KEY)
+    # Tell open streams to refetch /registration-counts (coalesced by the cache)
+    availability_broadcaster.publish("registration-counts", {})
+
+def apply_jindal_summary_change(data: dict):
+    response_cache.invalidate(JINDAL_SUMMARY_CACHE_KEY)
+
+change_bus.subscribe(SPORT_CHANGED, apply_sport_change)
+change_bus.subscribe(REGISTRATION_COUNTS_CHANGED, apply_registration_counts_change)
+change_bus.subscribe(JINDAL_SUMMARY_CHANGED, apply_jindal_summary_change)
+change_bus.subscribe(EMAIL_QUEUED, email_dispatcher.wake)
+change_bus.subscribe(EMAIL_BROADCAST_CHANGED, email_dispatcher.refresh_soon)
+# Notifications sent while the listener was reconnecting are lost
+change_bus.on_reconnect(response_cache.invalidate)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Background workers, one set per uvicorn worker process
+    hold_sweeper.start()
+    availability_broadcaster.start()
+    change_bus.start()
+    email_dispatcher.start()
+    yield
+    email_dispatcher.stop()
+    change_bus.stop()
+    await availability_broadcaster.stop()
+    hold_sweeper.stop()
+
 # FastAPI app initialization
-app = FastAPI(title="Alldays API", version="1.0.0")
+app = FastAPI(title="Alldays API", version="1.0.0", lifespan=lifespan)
 
 # CORS origins - allow specific origins for production
 origins = [
@@ -67,6 +122,47 @@ origins = [
 # Create database tables
 Base.metadata.create_all(engine)
 
+# Rate limiting
+RATE_LIMIT = 5  # max requests
+RATE_PERIOD = 60  # seconds
+# RATE_LIMIT_BACKEND=shared enforces limits across all uvicorn workers on the host
+rate_limiter = SlidingWindowRateLimiter(limit=RATE_LIMIT, period=RATE_PERIOD, backend=create_rate_limit_backend())
+
+# Per-route policies, keyed by client IP and request path. Routes not listed here are not limited.
+default_rate_limit = RateLimitPolicy(RATE_LIMIT, RATE_PERIOD)
+RATE_LIMIT_POLICIES = {
+    '/event-registration': default_rate_limit,
+    '/event-registration-with-email': default_rate_limit,
+    '/jindal-registration': default_rate_limit,
+    '/jindal-registration-with-email': default_rate_limit,
+    '/orangetheory-registration': default_rate_limit,
+    '/orangetheory-registration-with-email': default_rate_limit,
+    # Admins page through this one cursor by cursor
+    '/jindal-registrations': RateLimitPolicy(120, RATE_PERIOD),
+    '/jindal-registration/{registration_id}': default_rate_limit,
+    '/jindal-registration/{registration_id}/payment': default_rate_limit,
+    '/jindal-registrations-summary': default_rate_limit,
+    '/registrations/{registration_type}/export': default_rate_limit,
+    # Polled by the launch dashboard
+    '/registration-rollups': RateLimitPolicy(120, RATE_PERIOD),
+    '/email-broadcasts': default_rate_limit,
+    '/email-broadcasts/{name}': default_rate_limit,
+    '/ses/quota': default_rate_limit,
+    '/ses/account': default_rate_limit,
+    '/ses/verify-email': default_rate_limit,
+    # Anonymous; holds are also capped per hold session by the connector
+    '/sports/{sport_key}/hold': RateLimitPolicy(3, RATE_PERIOD),
+    # Polled by every open tab
+    '/registration-counts': RateLimitPolicy(600, RATE_PERIOD),
+    '/sports': RateLimitPolicy(600, RATE_PERIOD),
+    # Long-lived; only reconnects count
+    '/sports/stream': RateLimitPolicy(30, RATE_PERIOD),
+}
+
+# Reject over-limit requests before body parsing and dependency resolution.
+# Added before CORS so that 429 responses still carry CORS headers.
+app.add_middleware(RateLimitMiddleware, limiter=rate_limiter, policies=RATE_LIMIT_POLICIES)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -112,25 +208,6 @@ async def general_exception_handler(request, exc):
         content={"detail": "Internal server error"}
     )
 
-# Rate limiting
-RATE_LIMIT = 5  # max requests
-RATE_PERIOD = 60  # seconds
-rate_limit_store = {}
-
-def check_rate_limit(request: Request):
-    ip = request.client.host
-    endpoint = request.url.path
-    key = f"{ip}:{endpoint}"
-    now = time.time()
-    window = rate_limit_store.get(key, [])
-    # Remove timestamps outside the window
-    window = [ts for ts in window if now - ts < RATE_PERIOD]
-    if len(window) >= RATE_LIMIT:
-        logger.warning(f"Rate limit exceeded for {ip} on {endpoint}")
-        raise HTTPException(status_code=429, detail="Too many requests. Please try again later.")
-    window.append(now)
-    rate_limit_store[key] = window
-
 # Routes
 @app.get('/')
 def home():
@@ -147,7 +224,6 @@ async def options_handler(full_path: str):
 
 @app.post('/event-registration')
 def create_event_registration(
-    request: Request,
     first_name: str = Form(...),
     last_name: str = Form(...),
     email: str = Form(...),
@@ -156,22 +232,18 @@ def create_event_registration(
     orangetheory_batch: str = Form(None),
     event_date: str = Form("24th August 2025"),
     event_location: str = Form("Orangetheory Fitness, Worli"),
+    hold_token: str = Form(None),  # Ticket hold taken on the sports page, if any
     file: UploadFile = File(None),
     db: Session = Depends(get_db),
 ):
     """
     Create event registration (preserved for existing application)
     """
-    check_rate_limit(request)
     try:
         file_url = None
         if file:
             try:
-                s3 = boto3.client(
-                    's3',
-                    aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
-                    aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY')
-                )
+                s3 = aws_clients.s3()
                 bucket_name = os.environ.get('S3_BUCKET_NAME', 'alldayspayments')
                 file_ext = file.filename.split('.')[-1]
                 s3_key = f"event_files/{email}_{first_name}_{last_name}.{file_ext}"
@@ -185,18 +257,25 @@ def create_event_registration(
                 logger.error(f"S3 upload failed: {s3e}", exc_info=True)
                 return JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"detail": "File upload failed. Please try again later or contact support."})
         
-        # Generate unique 8-character alphanumeric booking_id
-        def generate_booking_id():
-            return ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
-        booking_id = generate_booking_id()
-        # Ensure uniqueness
-        attempts = 0
-        while db.query(EventRegistrationModel).filter_by(booking_id=booking_id).first():
-            booking_id = generate_booking_id()
-            attempts += 1
-            if attempts > 5:
-                logger.error("Failed to generate unique booking ID after 5 attempts.")
-                return JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"detail": "Could not generate a unique booking ID. Please try again."})
+        # Sell the reserved tickets in the same transaction as the registration
+        if hold_token:
+            hold_converted, hold_message, _ = ticket_hold_connector.convert_hold(db, hold_token, sport_keys(selected_sports))
+            if not hold_converted:
+                return JSONResponse(status_code=status.HTTP_409_CONFLICT, content={"detail": f"{hold_message}. Please reserve your tickets again."})
+        
+        # Sequence-backed 8-character booking_id, unique without a lookup
+        booking_id = booking_id_generator.next_id()
+        
+        # Confirmation email, committed by create() together with the registration
+        email_outbox_connector.enqueue(db, EmailOutboxModel.EVENT_CONFIRMATION, email, {
+            'first_name': first_name,
+            'last_name': last_name,
+            'booking_id': booking_id,
+            'selected_sports': selected_sports,
+            'event_date': event_date,
+            'event_location': event_location,
+            'orangetheory_batch': orangetheory_batch
+        })
         
         try:
             reg_obj = event_registration_connector.create(db, {
@@ -219,32 +298,12 @@ def create_event_registration(
         
         logger.info(f"Event registration created: id={reg_obj.id}, booking_id={booking_id}, email={email}")
         
-        # Send confirmation email
-        email_sent = False
-        try:
-            email_sent = ses_email_service.send_confirmation_email(
-                recipient_email=email,
-                first_name=first_name,
-                last_name=last_name,
-                booking_id=booking_id,
-                selected_sports=selected_sports,
-                event_date=event_date,
-                event_location=event_location,
-                orangetheory_batch=orangetheory_batch
-            )
-            if email_sent:
-                logger.info(f"Confirmation email sent successfully to {email}")
-            else:
-                logger.warning(f"Failed to send confirmation email to {email}")
-        except Exception as email_error:
-            logger.error(f"Error sending confirmation email to {email}: {email_error}", exc_info=True)
-        
         return {
             "id": reg_obj.id, 
             "booking_id": booking_id, 
             "message": "Registration successful", 
             "file_url": file_url,
-            "email_sent": email_sent
+            "email_sent": True  # queued in the outbox with the registration
         }
     except Exception as e:
         logger.error(f"Error in event registration: {e}", exc_info=True)
@@ -252,7 +311,6 @@ def create_event_registration(
 
 @app.post('/event-registration-with-email')
 def create_event_registration_with_email(
-    request: Request,
     first_name: str = Form(...),
     last_name: str = Form(...),
     email: str = Form(...),
@@ -261,22 +319,18 @@ def create_event_registration_with_email(
     orangetheory_batch: str = Form(None),
     event_date: str = Form("24th August 2025"),
     event_location: str = Form("Orangetheory Fitness, Worli"),
+    hold_token: str = Form(None),  # Ticket hold taken on the sports page, if any
     file: UploadFile = File(None),
     db: Session = Depends(get_db),
 ):
     """
     Enhanced event registration endpoint with SES email confirmation
     """
-    check_rate_limit(request)
     try:
         file_url = None
         if file:
             try:
-                s3 = boto3.client(
-                    's3',
-                    aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
-                    aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY')
-                )
+                s3 = aws_clients.s3()
                 bucket_name = os.environ.get('S3_BUCKET_NAME', 'alldayspayments')
                 file_ext = file.filename.split('.')[-1]
                 s3_key = f"event_files/{email}_{first_name}_{last_name}.{file_ext}"
@@ -290,18 +344,25 @@ def create_event_registration_with_email(
                 logger.error(f"S3 upload failed: {s3e}", exc_info=True)
                 return JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"detail": "File upload failed. Please try again later or contact support."})
         
-        # Generate unique 8-character alphanumeric booking_id
-        def generate_booking_id():
-            return ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
-        booking_id = generate_booking_id()
-        # Ensure uniqueness
-        attempts = 0
-        while db.query(EventRegistrationModel).filter_by(booking_id=booking_id).first():
-            booking_id = generate_booking_id()
-            attempts += 1
-            if attempts > 5:
-                logger.error("Failed to generate unique booking ID after 5 attempts.")
-                return JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"detail": "Could not generate a unique booking ID. Please try again."})
+        # Sell the reserved tickets in the same transaction as the registration
+        if hold_token:
+            hold_converted, hold_message, _ = ticket_hold_connector.convert_hold(db, hold_token, sport_keys(selected_sports))
+            if not hold_converted:
+                return JSONResponse(status_code=status.HTTP_409_CONFLICT, content={"detail": f"{hold_message}. Please reserve your tickets again."})
+        
+        # Sequence-backed 8-character booking_id, unique without a lookup
+        booking_id = booking_id_generator.next_id()
+        
+        # Confirmation email, committed by create() together with the registration
+        email_outbox_connector.enqueue(db, EmailOutboxModel.EVENT_CONFIRMATION, email, {
+            'first_name': first_name,
+            'last_name': last_name,
+            'booking_id': booking_id,
+            'selected_sports': selected_sports,
+            'event_date': event_date,
+            'event_location': event_location,
+            'orangetheory_batch': orangetheory_batch
+        })
         
         try:
             reg_obj = event_registration_connector.create(db, {
@@ -324,42 +385,15 @@ def create_event_registration_with_email(
         
         logger.info(f"Event registration created: id={reg_obj.id}, booking_id={booking_id}, email={email}")
         
-        # Send confirmation email with enhanced error handling
-        email_sent = False
-        email_error_message = None
-        try:
-            email_sent = ses_email_service.send_confirmation_email(
-                recipient_email=email,
-                first_name=first_name,
-                last_name=last_name,
-                booking_id=booking_id,
-                selected_sports=selected_sports,
-                event_date=event_date,
-                event_location=event_location,
-                orangetheory_batch=orangetheory_batch
-            )
-            if email_sent:
-                logger.info(f"Confirmation email sent successfully to {email}")
-            else:
-                logger.warning(f"Failed to send confirmation email to {email}")
-                email_error_message = "Registration successful but email delivery failed"
-        except Exception as email_error:
-            logger.error(f"Error sending confirmation email to {email}: {email_error}", exc_info=True)
-            email_error_message = f"Registration successful but email delivery failed: {str(email_error)}"
-        
-        response_data = {
+        # The confirmation email is sent by the email dispatcher, with retries
+        return {
             "id": reg_obj.id, 
             "booking_id": booking_id, 
             "message": "Registration successful", 
             "file_url": file_url,
-            "email_sent": email_sent
+            "email_sent": True
         }
         
-        if email_error_message:
-            response_data["email_error"] = email_error_message
-        
-        return response_data
-        
     except Exception as e:
         logger.error(f"Error in event registration with email: {e}", exc_info=True)
         return JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"detail": "An unexpected error occurred. Please try again later or contact support."})
@@ -370,76 +404,52 @@ def create_event_registration_with_email(
 
 
 
+def build_registration_counts() -> dict:
+    """Registration counts and availability per sport, on its own session"""
+    db = SessionLocal()
+    try:
+        # Count registrations for each sport
+        sport_counts = event_registration_connector.get_sport_counts(
+            db, ["orangetheory", "strength", "breathwork"]
+        )
+    finally:
+        db.close()
+    
+    # Set fixed limits for each sport
+    sport_limits = {
+        "orangetheory": 50,    # Limited capacity for Orangetheory
+        "strength": 50,    # High limit for other sports
+        "breathwork": 50    # High limit for other sports
+    }
+    
+    # Calculate availability
+    availability = {}
+    for sport, count in sport_counts.items():
+        limit = sport_limits.get(sport, 50)
+        remaining = max(0, limit - count)
+        is_available = count < limit
+        availability[sport] = {
+            "current_count": count,
+            "limit": limit,
+            "available": is_available,
+            "remaining": remaining
+        }
+        logger.info(f"Sport: {sport}, Count: {count}, Limit: {limit}, Available: {is_available}, Remaining: {remaining}")
+    
+    return {
+        "sport_counts": sport_counts,
+        "availability": availability
+    }
+
 @app.get('/registration-counts')
-def get_registration_counts(
-    request: Request,
-    db: Session = Depends(get_db),
-):
+async def get_registration_counts():
     """
     Get registration counts for each sport to determine availability
+    Served from the response cache; concurrent misses share one computation.
     """
-    check_rate_limit(request)
-    
     try:
-        registrations = db.query(EventRegistrationModel).all()
-        
-        # Count registrations for each sport
-        sport_counts = {
-            "orangetheory": 0,
-            "strength": 0,
-            "breathwork": 0
-        }
-        
-        for reg in registrations:
-            # Parse selected_sports (it's stored as a JSON string)
-            try:
-                selected_sports = json.loads(reg.selected_sports)
-                if isinstance(selected_sports, list):
-                    for sport in selected_sports:
-                        if sport in sport_counts:
-                            sport_counts[sport] += 1
-                elif isinstance(selected_sports, str):
-                    # Handle case where it might be a comma-separated string
-                    sports_list = [s.strip().lower() for s in selected_sports.split(',')]
-                    for sport in sports_list:
-                        if sport in sport_counts:
-                            sport_counts[sport] += 1
-            except (json.JSONDecodeError, AttributeError):
-                # If parsing fails, try to check if it contains the sport name
-                if reg.selected_sports:
-                    selected_sports_lower = reg.selected_sports.lower()
-                    if "orangetheory" in selected_sports_lower:
-                        sport_counts["orangetheory"] += 1
-                    if "strength" in selected_sports_lower:
-                        sport_counts["strength"] += 1
-                    if "breathwork" in selected_sports_lower:
-                        sport_counts["breathwork"] += 1
-        
-        # Set fixed limits for each sport
-        sport_limits = {
-            "orangetheory": 50,    # Limited capacity for Orangetheory
-            "strength": 50,    # High limit for other sports
-            "breathwork": 50    # High limit for other sports
-        }
-        
-        # Calculate availability
-        availability = {}
-        for sport, count in sport_counts.items():
-            limit = sport_limits.get(sport, 50)
-            remaining = max(0, limit - count)
-            is_available = count < limit
-            availability[sport] = {
-                "current_count": count,
-                "limit": limit,
-                "available": is_available,
-                "remaining": remaining
-            }
-            logger.info(f"Sport: {sport}, Count: {count}, Limit: {limit}, Available: {is_available}, Remaining: {remaining}")
-        
-        return {
-            "sport_counts": sport_counts,
-            "availability": availability
-        }
+        body = await response_cache.aget_or_compute(REGISTRATION_COUNTS_CACHE_KEY, build_registration_counts)
+        return Response(content=body, media_type="application/json")
         
     except Exception as e:
         logger.error(f"Error fetching registration counts: {e}", exc_info=True)
@@ -478,7 +488,6 @@ def create_transaction(
 
 @app.post('/jindal-registration', response_model=JindalRegistrationResponse)
 def create_jindal_registration(
-    request: Request,
     first_name: str = Form(...),
     last_name: str = Form(...),
     email: str = Form(...),
@@ -490,14 +499,13 @@ def create_jindal_registration(
     pickle_level: str = Form(None),
     total_amount: int = Form(...),
     agreed_to_terms: bool = Form(True),
+    hold_token: str = Form(None),  # Ticket hold taken on the sports page, if any
     file: UploadFile = File(None),
     db: Session = Depends(get_db),
 ):
     """
     Create Jindal registration with file upload (single API endpoint)
     """
-    check_rate_limit(request)
-    
     try:
         # Validate phone number
         phone_digits = ''.join(filter(str.isdigit, phone))
@@ -536,11 +544,7 @@ def create_jindal_registration(
                     )
                 
                 # Upload to S3 (following event registration pattern)
-                s3 = boto3.client(
-                    's3',
-                    aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
-                    aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY')
-                )
+                s3 = aws_clients.s3()
                 bucket_name = os.environ.get('AWS_S3_BUCKET', 'alldayspayments')
                 file_ext = file.filename.split('.')[-1]
                 s3_key = f"jindalpayments/{email}_{first_name}_{last_name}.{file_ext}"
@@ -587,6 +591,15 @@ def create_jindal_registration(
             'agreed_to_terms': agreed_to_terms
         }
         
+        # Sell the reserved tickets in the same transaction as the registration
+        if hold_token:
+            hold_converted, hold_message, _ = ticket_hold_connector.convert_hold(db, hold_token, sport_keys(selected_sports))
+            if not hold_converted:
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"{hold_message}. Please reserve your tickets again."
+                )
+        
         # Create registration
         registration = jindal_registration_connector.create_registration(db, registration_data)
         
@@ -624,7 +637,6 @@ def create_jindal_registration(
 
 @app.post('/jindal-registration-with-email', response_model=JindalRegistrationResponse)
 def create_jindal_registration_with_email(
-    request: Request,
     first_name: str = Form(...),
     last_name: str = Form(...),
     email: str = Form(...),
@@ -636,14 +648,13 @@ def create_jindal_registration_with_email(
     pickle_level: str = Form(None),
     total_amount: int = Form(...),
     agreed_to_terms: bool = Form(True),
+    hold_token: str = Form(None),  # Ticket hold taken on the sports page, if any
     file: UploadFile = File(None),
     db: Session = Depends(get_db),
 ):
     """
     Create Jindal registration with email confirmation (new endpoint)
     """
-    check_rate_limit(request)
-    
     try:
         # Validate phone number
         phone_digits = ''.join(filter(str.isdigit, phone))
@@ -682,11 +693,7 @@ def create_jindal_registration_with_email(
                     )
                 
                 # Upload to S3
-                s3 = boto3.client(
-                    's3',
-                    aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
-                    aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY')
-                )
+                s3 = aws_clients.s3()
                 bucket_name = os.environ.get('AWS_S3_BUCKET', 'alldayspayments')
                 file_ext = file.filename.split('.')[-1]
                 s3_key = f"jindalpayments/{email}_{first_name}_{last_name}.{file_ext}"
@@ -733,35 +740,32 @@ def create_jindal_registration_with_email(
             'agreed_to_terms': agreed_to_terms
         }
         
+        # Sell the reserved tickets in the same transaction as the registration
+        if hold_token:
+            hold_converted, hold_message, _ = ticket_hold_connector.convert_hold(db, hold_token, sport_keys(selected_sports))
+            if not hold_converted:
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"{hold_message}. Please reserve your tickets again."
+                )
+        
+        # Confirmation email, committed by create_registration() together with the registration
+        email_outbox_connector.enqueue(db, EmailOutboxModel.JINDAL_CONFIRMATION, email, {
+            'first_name': first_name,
+            'last_name': last_name,
+            'jgu_student_id': jgu_student_id,
+            'selected_sports': json.dumps(selected_sports_list),
+            'total_amount': total_amount,
+            'city': city,
+            'state': state,
+            'pickle_level': pickle_level
+        })
+        
         # Create registration
         registration = jindal_registration_connector.create_registration(db, registration_data)
         
         logger.info(f"Jindal registration with email created: id={registration.id}, email={email}, jgu_id={jgu_student_id}")
         
-        # Send confirmation email
-        email_sent = False
-        email_error_message = None
-        try:
-            email_sent = ses_email_service.send_jindal_confirmation_email(
-                recipient_email=email,
-                first_name=first_name,
-                last_name=last_name,
-                jgu_student_id=jgu_student_id,
-                selected_sports=json.dumps(selected_sports_list),
-                total_amount=total_amount,
-                city=city,
-                state=state,
-                pickle_level=pickle_level
-            )
-            if email_sent:
-                logger.info(f"Jindal confirmation email sent successfully to {email}")
-            else:
-                logger.warning(f"Failed to send Jindal confirmation email to {email}")
-                email_error_message = "Registration successful but email delivery failed"
-        except Exception as email_error:
-            logger.error(f"Error sending Jindal confirmation email to {email}: {email_error}", exc_info=True)
-            email_error_message = f"Registration successful but email delivery failed: {str(email_error)}"
-        
         response_data = {
             "id": registration.id,
             "first_name": registration.first_name,
@@ -781,12 +785,9 @@ def create_jindal_registration_with_email(
             "updated_at": registration.updated_at,
             "message": "Registration successful",
             "payment_proof_url": payment_proof_url,
-            "email_sent": email_sent
+            "email_sent": True  # queued in the outbox with the registration
         }
         
-        if email_error_message:
-            response_data["email_error"] = email_error_message
-        
         return response_data
         
     except HTTPException:
@@ -800,17 +801,38 @@ def create_jindal_registration_with_email(
 
 @app.get('/jindal-registrations', response_model=JindalRegistrationListResponse)
 def get_jindal_registrations(
-    request: Request,
+    limit: int = 50,
+    cursor: str = None,
+    payment_status: str = None,
+    state: str = None,
+    city: str = None,
+    sport: str = None,
+    fetch_all: bool = Query(False, alias="all"),
     db: Session = Depends(get_db),
     api_key: str = Depends(get_api_key)
 ):
     """
-    Get all Jindal registrations (admin only)
+    Get Jindal registrations, newest first (admin only)
+    Paginated by cursor: pass next_cursor from the previous page as ?cursor=.
+    Optional filters: payment_status, state, city, sport. ?all=true returns every
+    matching registration in one response.
     """
-    check_rate_limit(request)
-    
     try:
-        registrations = db.query(JindalRegistrationModel).order_by(JindalRegistrationModel.created_at.desc()).all()
+        next_cursor = None
+        if fetch_all:
+            registrations = jindal_registration_connector.filtered_query(
+                db, payment_status, state, city, sport
+            ).order_by(JindalRegistrationModel.created_at.desc()).all()
+        else:
+            try:
+                registrations, next_cursor = jindal_registration_connector.list_registrations_page(
+                    db, min(max(limit, 1), MAX_PAGE_SIZE), cursor, payment_status, state, city, sport
+                )
+            except ValueError:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Invalid cursor"
+                )
         
         registration_list = []
         for reg in registrations:
@@ -835,9 +857,12 @@ def get_jindal_registrations(
         
         return {
             "total_registrations": len(registration_list),
-            "registrations": registration_list
+            "registrations": registration_list,
+            "next_cursor": next_cursor
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching Jindal registrations: {e}", exc_info=True)
         raise HTTPException(
@@ -847,7 +872,6 @@ def get_jindal_registrations(
 
 @app.get('/jindal-registration/{registration_id}')
 def get_jindal_registration(
-    request: Request,
     registration_id: int,
     db: Session = Depends(get_db),
     api_key: str = Depends(get_api_key)
@@ -855,8 +879,6 @@ def get_jindal_registration(
     """
     Get specific Jindal registration (admin only)
     """
-    check_rate_limit(request)
-    
     try:
         registration = jindal_registration_connector.get_registration_with_sports(db, registration_id)
         
@@ -879,7 +901,6 @@ def get_jindal_registration(
 
 @app.put('/jindal-registration/{registration_id}', response_model=JindalRegistrationResponse)
 def update_jindal_registration(
-    request: Request,
     registration_id: int,
     update_data: JindalRegistrationUpdate,
     db: Session = Depends(get_db),
@@ -888,8 +909,6 @@ def update_jindal_registration(
     """
     Update Jindal registration (admin only)
     """
-    check_rate_limit(request)
-    
     try:
         # Check if registration exists
         registration = db.query(JindalRegistrationModel).filter_by(id=registration_id).first()
@@ -901,6 +920,7 @@ def update_jindal_registration(
         
         # Update fields
         update_dict = update_data.dict(exclude_unset=True)
+        rollups_before = registration_rollups_connector.contributions(RegistrationSportModel.JINDAL, registration)
         
         # Handle selected_sports conversion
         if 'selected_sports' in update_dict and isinstance(update_dict['selected_sports'], list):
@@ -910,6 +930,16 @@ def update_jindal_registration(
         for field, value in update_dict.items():
             setattr(registration, field, value)
         
+        if 'selected_sports' in update_dict:
+            registration_sports_connector.replace_sports(
+                db, RegistrationSportModel.JINDAL, registration.id, registration.selected_sports
+            )
+        registration_rollups_connector.apply_change(
+            db, rollups_before, registration_rollups_connector.contributions(RegistrationSportModel.JINDAL, registration)
+        )
+        if {'payment_status', 'total_amount'} & update_dict.keys():
+            change_bus.notify(db, JINDAL_SUMMARY_CHANGED, {})
+        
         db.commit()
         db.refresh(registration)
         
@@ -945,7 +975,6 @@ def update_jindal_registration(
 
 @app.put('/jindal-registration/{registration_id}/payment')
 def update_jindal_payment_status(
-    request: Request,
     registration_id: int,
     payment_status: str,
     db: Session = Depends(get_db),
@@ -954,8 +983,6 @@ def update_jindal_payment_status(
     """
     Update payment status for Jindal registration (admin only)
     """
-    check_rate_limit(request)
-    
     try:
         # Validate payment status
         valid_statuses = ["pending", "completed", "failed"]
@@ -994,20 +1021,29 @@ def update_jindal_payment_status(
             detail="Failed to update payment status. Please try again later."
         )
 
+def build_jindal_summary() -> dict:
+    """Jindal registration summary, on its own session"""
+    db = SessionLocal()
+    try:
+        return jindal_registration_connector.get_registrations_summary(db)
+    finally:
+        db.close()
+
 @app.get('/jindal-registrations-summary')
-def get_jindal_registrations_summary(
-    request: Request,
-    db: Session = Depends(get_db),
+async def get_jindal_registrations_summary(
+    fresh: bool = Query(False, description="Bypass the cached summary"),
     api_key: str = Depends(get_api_key)
 ):
     """
     Get summary of Jindal registrations (admin only)
+    Served from the response cache, which every Jindal registration write invalidates;
+    fresh=true recomputes it from the table first.
     """
-    check_rate_limit(request)
-    
     try:
-        summary = jindal_registration_connector.get_registrations_summary(db)
-        return summary
+        if fresh:
+            response_cache.invalidate(JINDAL_SUMMARY_CACHE_KEY)
+        body = await response_cache.aget_or_compute(JINDAL_SUMMARY_CACHE_KEY, build_jindal_summary)
+        return Response(content=body, media_type="application/json")
         
     except Exception as e:
         logger.error(f"Error fetching Jindal registrations summary: {e}", exc_info=True)
@@ -1022,7 +1058,6 @@ def get_jindal_registrations_summary(
 
 @app.post('/orangetheory-registration', response_model=OrangetheoryRegistrationResponse)
 def create_orangetheory_registration(
-    request: Request,
     first_name: str = Form(...),
     last_name: str = Form(...),
     email: str = Form(...),
@@ -1031,13 +1066,13 @@ def create_orangetheory_registration(
     orangetheory_batch: str = Form(None),
     event_date: str = Form("24th August 2025"),
     event_location: str = Form("Orangetheory Fitness, Worli"),
+    hold_token: str = Form(None),  # Ticket hold taken on the sports page, if any
     file: UploadFile = File(None),
     db: Session = Depends(get_db),
 ):
     """
     Create Orangetheory registration with file upload
     """
-    check_rate_limit(request)
     try:
         # Validate phone number
         phone_digits = ''.join(filter(str.isdigit, phone))
@@ -1065,11 +1100,7 @@ def create_orangetheory_registration(
         file_url = None
         if file:
             try:
-                s3 = boto3.client(
-                    's3',
-                    aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
-                    aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY')
-                )
+                s3 = aws_clients.s3()
                 bucket_name = os.environ.get('S3_BUCKET_NAME', 'alldayspayments')
                 file_ext = file.filename.split('.')[-1]
                 s3_key = f"orangetheorypayments/{email}_{first_name}_{last_name}.{file_ext}"
@@ -1083,18 +1114,17 @@ def create_orangetheory_registration(
                 logger.error(f"S3 upload failed: {s3e}", exc_info=True)
                 return JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"detail": "File upload failed. Please try again later or contact support."})
         
-        # Generate unique 8-character alphanumeric booking_id
-        def generate_booking_id():
-            return ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
-        booking_id = generate_booking_id()
-        # Ensure uniqueness
-        attempts = 0
-        while db.query(OrangetheoryRegistrationModel).filter_by(booking_id=booking_id).first():
-            booking_id = generate_booking_id()
-            attempts += 1
-            if attempts > 5:
-                logger.error("Failed to generate unique booking ID after 5 attempts.")
-                return JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"detail": "Could not generate a unique booking ID. Please try again."})
+        # Sell the reserved tickets in the same transaction as the registration
+        if hold_token:
+            hold_converted, hold_message, _ = ticket_hold_connector.convert_hold(db, hold_token, sport_keys(selected_sports))
+            if not hold_converted:
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"{hold_message}. Please reserve your tickets again."
+                )
+        
+        # Sequence-backed 8-character booking_id, unique without a lookup
+        booking_id = booking_id_generator.next_id()
         
         try:
             reg_obj = orangetheory_registration_connector.create(db, {
@@ -1144,7 +1174,6 @@ def create_orangetheory_registration(
 
 @app.post('/orangetheory-registration-with-email', response_model=OrangetheoryRegistrationResponse)
 def create_orangetheory_registration_with_email(
-    request: Request,
     first_name: str = Form(...),
     last_name: str = Form(...),
     email: str = Form(...),
@@ -1153,13 +1182,13 @@ def create_orangetheory_registration_with_email(
     orangetheory_batch: str = Form(None),
     event_date: str = Form("24th August 2025"),
     event_location: str = Form("Orangetheory Fitness, Worli"),
+    hold_token: str = Form(None),  # Ticket hold taken on the sports page, if any
     file: UploadFile = File(None),
     db: Session = Depends(get_db),
 ):
     """
     Create Orangetheory registration with email confirmation
     """
-    check_rate_limit(request)
     try:
         # Validate phone number
         phone_digits = ''.join(filter(str.isdigit, phone))
@@ -1187,11 +1216,7 @@ def create_orangetheory_registration_with_email(
         file_url = None
         if file:
             try:
-                s3 = boto3.client(
-                    's3',
-                    aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
-                    aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY')
-                )
+                s3 = aws_clients.s3()
                 bucket_name = os.environ.get('S3_BUCKET_NAME', 'alldayspayments')
                 file_ext = file.filename.split('.')[-1]
                 s3_key = f"orangetheorypayments/{email}_{first_name}_{last_name}.{file_ext}"
@@ -1205,18 +1230,28 @@ def create_orangetheory_registration_with_email(
                 logger.error(f"S3 upload failed: {s3e}", exc_info=True)
                 return JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"detail": "File upload failed. Please try again later or contact support."})
         
-        # Generate unique 8-character alphanumeric booking_id
-        def generate_booking_id():
-            return ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
-        booking_id = generate_booking_id()
-        # Ensure uniqueness
-        attempts = 0
-        while db.query(OrangetheoryRegistrationModel).filter_by(booking_id=booking_id).first():
-            booking_id = generate_booking_id()
-            attempts += 1
-            if attempts > 5:
-                logger.error("Failed to generate unique booking ID after 5 attempts.")
-                return JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, content={"detail": "Could not generate a unique booking ID. Please try again."})
+        # Sell the reserved tickets in the same transaction as the registration
+        if hold_token:
+            hold_converted, hold_message, _ = ticket_hold_connector.convert_hold(db, hold_token, sport_keys(selected_sports))
+            if not hold_converted:
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"{hold_message}. Please reserve your tickets again."
+                )
+        
+        # Sequence-backed 8-character booking_id, unique without a lookup
+        booking_id = booking_id_generator.next_id()
+        
+        # Confirmation email, committed by create() together with the registration
+        email_outbox_connector.enqueue(db, EmailOutboxModel.EVENT_CONFIRMATION, email, {
+            'first_name': first_name,
+            'last_name': last_name,
+            'booking_id': booking_id,
+            'selected_sports': selected_sports,
+            'event_date': event_date,
+            'event_location': event_location,
+            'orangetheory_batch': orangetheory_batch
+        })
         
         try:
             reg_obj = orangetheory_registration_connector.create(db, {
@@ -1239,26 +1274,6 @@ def create_orangetheory_registration_with_email(
         
         logger.info(f"Orangetheory registration created: id={reg_obj.id}, booking_id={booking_id}, email={email}")
         
-        # Send confirmation email
-        email_sent = False
-        try:
-            email_sent = ses_email_service.send_confirmation_email(
-                recipient_email=email,
-                first_name=first_name,
-                last_name=last_name,
-                booking_id=booking_id,
-                selected_sports=selected_sports,
-                event_date=event_date,
-                event_location=event_location,
-                orangetheory_batch=orangetheory_batch
-            )
-            if email_sent:
-                logger.info(f"Confirmation email sent successfully to {email}")
-            else:
-                logger.warning(f"Failed to send confirmation email to {email}")
-        except Exception as email_error:
-            logger.error(f"Error sending confirmation email to {email}: {email_error}", exc_info=True)
-        
         return {
             "id": reg_obj.id, 
             "first_name": reg_obj.first_name,
@@ -1277,7 +1292,7 @@ def create_orangetheory_registration_with_email(
             "updated_at": reg_obj.updated_at,
             "message": "Registration successful", 
             "file_url": file_url,
-            "email_sent": email_sent
+            "email_sent": True  # queued in the outbox with the registration
         }
     except HTTPException:
         raise
@@ -1287,24 +1302,43 @@ def create_orangetheory_registration_with_email(
 
 @app.get('/orangetheory-registrations', response_model=OrangetheoryRegistrationListResponse)
 def get_orangetheory_registrations(
-    skip: int = 0,
     limit: int = 100,
+    cursor: str = None,
+    exact_total: bool = False,
     db: Session = Depends(get_db),
     api_key: str = Depends(get_api_key)
 ):
     """
-    Get all Orangetheory registrations (admin only)
+    Get Orangetheory registrations, newest first (admin only)
+    Paginated by cursor: pass next_cursor from the previous page as ?cursor=.
+    total is the planner's estimate unless exact_total=true.
     """
+    page_size = min(max(limit, 1), MAX_PAGE_SIZE)
     try:
-        registrations = orangetheory_registration_connector.list(db, skip=skip, limit=limit)
-        total = db.query(OrangetheoryRegistrationModel).count()
+        try:
+            registrations, next_cursor = orangetheory_registration_connector.keyset_page(
+                db, page_size, cursor
+            )
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        
+        if exact_total:
+            total = db.query(OrangetheoryRegistrationModel).count()
+        else:
+            total = orangetheory_registration_connector.estimated_count(db)
         
         return {
             "registrations": registrations,
             "total": total,
-            "skip": skip,
-            "limit": limit
+            "total_is_estimate": not exact_total,
+            "limit": page_size,
+            "next_cursor": next_cursor
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching Orangetheory registrations: {e}", exc_info=True)
         raise HTTPException(
@@ -1312,60 +1346,371 @@ def get_orangetheory_registrations(
             detail="Failed to fetch registrations"
         )
 
+# ============================================================================
+# REGISTRATION EXPORT ENDPOINTS
+# ============================================================================
+
+EXPORT_MODELS = {
+    'jindal': JindalRegistrationModel,
+    'orangetheory': OrangetheoryRegistrationModel,
+    'event': EventRegistrationModel,
+}
+
+EXPORT_FORMATS = {
+    'ndjson': (iter_ndjson, 'application/x-ndjson'),
+    'csv': (iter_csv, 'text/csv; charset=utf-8'),
+    'xlsx': (iter_xlsx, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
+
+@app.get('/registrations/{registration_type}/export')
+def export_registrations(
+    registration_type: str,
+    format: str = Query('ndjson', description="ndjson, csv or xlsx"),
+    db: Session = Depends(get_db),
+    api_key: str = Depends(get_api_key)
+):
+    """
+    Export every registration of one type (jindal, orangetheory or event) as a download (admin only)
+    Rows are streamed from a server-side cursor as they are encoded, so memory stays
+    flat whatever the table size. ndjson and csv start downloading immediately;
+    xlsx is built on disk first, since the file is a zip archive, so it is limited to
+    XLSX_EXPORT_MAX_ROWS registrations (50,000 by default); export larger tables as csv.
+    """
+    model = EXPORT_MODELS.get(registration_type)
+    if model is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown registration type. Must be one of: {', '.join(EXPORT_MODELS)}"
+        )
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid format. Must be one of: {', '.join(EXPORT_FORMATS)}"
+        )
+    if format == 'xlsx':
+        row_count = count_export_rows(model, db)
+        if row_count > XLSX_EXPORT_MAX_ROWS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"{row_count} registrations is too many to export as xlsx (limit {XLSX_EXPORT_MAX_ROWS}). Use format=csv instead."
+            )
+    
+    encode, media_type = EXPORT_FORMATS[format]
+    filename = f"{model.__tablename__}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{format}"
+    logger.info(f"Exporting {model.__tablename__} as {format}")
+    
+    return StreamingResponse(
+        encode(model),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+# ============================================================================
+# REGISTRATION ROLLUP ENDPOINTS
+# ============================================================================
+
+@app.get('/registration-rollups')
+def get_registration_rollups(
+    registration_type: str = Query(None, description="event, orangetheory or jindal; all types when omitted"),
+    sport: str = Query(RegistrationRollupModel.ALL_SPORTS, description="Sport key, or * for every registration"),
+    payment_status: str = Query(None),
+    since: datetime = Query(None, description="Earliest bucket start (inclusive)"),
+    until: datetime = Query(None, description="Latest bucket start (exclusive)"),
+    bucket: str = Query('hour', description="hour or day (IST)"),
+    db: Session = Depends(get_db),
+    api_key: str = Depends(get_api_key)
+):
+    """
+    Registrations and revenue over time from the hourly rollups (admin only)
+    Reads registration_rollups only, so it is cheap to poll during a launch.
+    amount is the sum of total_amount (Jindal); pass payment_status=completed for revenue.
+    """
+    if registration_type and registration_type not in EXPORT_MODELS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid registration type. Must be one of: {', '.join(EXPORT_MODELS)}"
+        )
+    if bucket not in ('hour', 'day'):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid bucket. Must be one of: hour, day"
+        )
+    
+    try:
+        series = registration_rollups_connector.time_series(
+            db, registration_type, sport, payment_status, since, until, bucket
+        )
+        return {
+            "registration_type": registration_type,
+            "sport": sport,
+            "payment_status": payment_status,
+            "bucket": bucket,
+            "series": series
+        }
+    except Exception as e:
+        logger.error(f"Error fetching registration rollups: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to fetch registration rollups. Please try again later."
+        )
+
+# ============================================================================
+# EMAIL BROADCAST ENDPOINTS
+# ============================================================================
+
+def run_email_broadcast(broadcast_id: int, run_token: str) -> None:
+    """Send a claimed broadcast after the response has gone out, on its own session"""
+    db = SessionLocal()
+    try:
+        email_broadcast_connector.run(db, broadcast_id, run_token)
+    finally:
+        db.close()
+
+def build_email_broadcast_response(db: Session, broadcast: EmailBroadcastModel) -> EmailBroadcastResponse:
+    response = EmailBroadcastResponse.model_validate(broadcast)
+    response.failures = [
+        EmailBroadcastFailureResponse.model_validate(failure)
+        for failure in email_broadcast_connector.failures(db, broadcast.id)
+    ]
+    return response
+
+@app.post('/email-broadcasts', response_model=EmailBroadcastResponse, status_code=202)
+def send_email_broadcast(
+    payload: EmailBroadcastCreate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    api_key: str = Depends(get_api_key)
+):
+    """
+    Email every registrant of a registration type, e.g. a reminder or venue update (admin only)
+    Sent in the background with SES bulk sends; poll GET /email-broadcasts/{name} for progress.
+    Posting again with the same name resumes a stopped broadcast where it left off, with its
+    original settings, and skips everyone it has already emailed.
+    """
+    try:
+        try:
+            template_loader.get_template(payload.template_name)
+        except FileNotFoundError:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown email template '{payload.template_name}'"
+            )
+
+        try:
+            broadcast, created = email_broadcast_connector.create_or_get(
+                db,
+                name=payload.name,
+                registration_type=payload.registration_type,
+                template_name=payload.template_name,
+                template_data={**payload.template_data, "SUBJECT": payload.subject, "MESSAGE": payload.message},
+                orangetheory_batch=payload.orangetheory_batch
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=400,
+                detail=str(e)
+            )
+        if broadcast.status != EmailBroadcastModel.COMPLETED:
+            run_token = email_broadcast_connector.claim(db, broadcast.id)
+            if run_token is None:
+                raise HTTPException(
+                    status_code=409,
+                    detail="This broadcast is already being sent"
+                )
+            background_tasks.add_task(run_email_broadcast, broadcast.id, run_token)
+            logger.info(f"{'Starting' if created else 'Resuming'} email broadcast '{broadcast.name}'")
+
+        db.refresh(broadcast)
+        return build_email_broadcast_response(db, broadcast)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error starting email broadcast: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to start email broadcast. Please try again later."
+        )
+
+@app.get('/email-broadcasts/{name}', response_model=EmailBroadcastResponse)
+def get_email_broadcast(
+    name: str,
+    db: Session = Depends(get_db),
+    api_key: str = Depends(get_api_key)
+):
+    """
+    Progress of a broadcast and its first failed recipients (admin only)
+    """
+    try:
+        broadcast = email_broadcast_connector.get_by_name(db, name)
+        if broadcast is None:
+            raise HTTPException(
+                status_code=404,
+                detail="Broadcast not found"
+            )
+        return build_email_broadcast_response(db, broadcast)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching email broadcast {name}: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to fetch email broadcast. Please try again later."
+        )
+
 # ============================================================================
 # SPORTS ENDPOINTS (For future use)
 # ============================================================================
 
+def build_sports_list() -> SportsListResponse:
+    """All sports with availability status, on its own session"""
+    db = SessionLocal()
+    try:
+        sports_list = sports_connector_instance.list_sports_availability(db)
+    finally:
+        db.close()
+    
+    # Serialized through the response model once, served as bytes until invalidated
+    return SportsListResponse(
+        total_sports=len(sports_list),
+        available_sports=sum(1 for sport in sports_list if sport["is_available"]),
+        sold_out_sports=sum(1 for sport in sports_list if sport["is_sold_out"]),
+        sports=sports_list
+    )
+
 @app.get('/sports', response_model=SportsListResponse)
-def get_sports(
-    request: Request,
-    db: Session = Depends(get_db)
-):
+async def get_sports():
     """
     Get all sports with availability status
+    Served from the response cache; concurrent misses share one computation.
     """
-    check_rate_limit(request)
+    try:
+        body = await response_cache.aget_or_compute(SPORTS_CACHE_KEY, build_sports_list)
+        return Response(content=body, media_type="application/json")
+        
+    except Exception as e:
+        logger.error(f"Error fetching sports: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to fetch sports. Please try again later."
+        )
+
+@app.get('/sports/stream')
+async def stream_sports():
+    """
+    Server-Sent Events stream of sports availability
+    Sends a "snapshot" event with the /sports payload, then a "sport" event with
+    the new counts whenever tickets are sold, refunded or held, and a
+    "registration-counts" event when /registration-counts should be refetched.
+    Streams end after SSE_MAX_STREAM_SECONDS, or when the server shuts down, and
+    EventSource reconnects on its own.
+    """
+    queue = availability_broadcaster.subscribe()
+    
+    async def events():
+        try:
+            snapshot = await response_cache.aget_or_compute(SPORTS_CACHE_KEY, build_sports_list)
+            yield RETRY_MESSAGE + b"event: snapshot\ndata: " + snapshot + b"\n\n"
+            ends_at = time.monotonic() + MAX_STREAM_SECONDS
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=max(0.0, ends_at - time.monotonic()))
+                except asyncio.TimeoutError:
+                    break
+                if message is None:
+                    break
+                yield message
+        finally:
+            availability_broadcaster.unsubscribe(queue)
     
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get('/cache-stats')
+def get_cache_stats(
+    api_key: str = Depends(get_api_key)
+):
+    """
+    Response cache hit/miss counters for this worker (admin only)
+    """
+    return response_cache.stats()
+
+@app.post('/sports/{sport_key}/hold', response_model=TicketHoldResponse)
+def create_ticket_hold(
+    sport_key: str,
+    hold_request: TicketHoldRequest,
+    x_hold_session: str = Header(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Reserve tickets while the user fills out the registration form
+    The first hold issues a hold_session; send it back in the X-Hold-Session header
+    with later holds. A session may hold a few tickets at a time.
+    """
     try:
-        all_sports = db.query(SportsModel).all()
-        available_sports = [s for s in all_sports if s.is_available]
-        sold_out_sports = [s for s in all_sports if s.is_sold_out]
-        
-        sports_list = []
-        for sport in all_sports:
-            sports_list.append({
-                "sport_key": sport.sport_key,
-                "sport_name": sport.sport_name,
-                "price": sport.price,
-                "current_count": sport.current_count,
-                "max_capacity": sport.max_capacity,
-                "remaining_tickets": sport.remaining_tickets,
-                "is_available": sport.is_available,
-                "is_sold_out": sport.is_sold_out,
-                "timing": sport.timing
-            })
+        session = hold_session(x_hold_session)
+        success, message, hold = ticket_hold_connector.create_hold(db, sport_key, hold_request.quantity, holder_key(session))
+        if not success:
+            raise HTTPException(
+                status_code=409,
+                detail=message
+            )
         
         return {
-            "total_sports": len(all_sports),
-            "available_sports": len(available_sports),
-            "sold_out_sports": len(sold_out_sports),
-            "sports": sports_list
+            "success": True,
+            "hold_token": hold.hold_token,
+            "hold_session": session,
+            "sport_key": hold.sport_key,
+            "quantity": hold.quantity,
+            "expires_at": hold.expires_at,
+            "message": message
         }
         
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating ticket hold for {sport_key}: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to reserve tickets. Please try again later."
+        )
+
+@app.delete('/sports/holds/{hold_token}')
+def release_ticket_hold(
+    hold_token: str,
+    db: Session = Depends(get_db)
+):
+    """
+    Release a ticket hold before it expires
+    """
+    try:
+        if not ticket_hold_connector.release_hold(db, hold_token):
+            raise HTTPException(
+                status_code=404,
+                detail="Hold not found or already released"
+            )
+        
+        return {"success": True, "message": "Hold released"}
+        
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error fetching sports: {e}", exc_info=True)
+        logger.error(f"Error releasing ticket hold {hold_token}: {e}", exc_info=True)
         raise HTTPException(
             status_code=500,
-            detail="Failed to fetch sports. Please try again later."
+            detail="Failed to release hold. Please try again later."
         )
 
 # SES Management Endpoints
 @app.get('/ses/quota')
-def get_ses_quota(request: Request):
+def get_ses_quota():
     """
     Get SES sending quota information (admin endpoint)
     """
-    check_rate_limit(request)
     try:
         quota_info = ses_email_service.get_send_quota()
         return {
@@ -1379,22 +1724,33 @@ def get_ses_quota(request: Request):
             content={"detail": "Failed to get SES quota information"}
         )
 
+@app.get('/ses/dispatch-stats')
+def get_email_dispatch_stats(
+    db: Session = Depends(get_db),
+    api_key: str = Depends(get_api_key)
+):
+    """
+    Email outbox backlog and this worker's dispatcher throughput (admin only)
+    """
+    try:
+        return {
+            "queue": email_outbox_connector.queue_depth(db),
+            "dispatcher": email_dispatcher.stats()
+        }
+    except Exception as e:
+        logger.error(f"Error getting email dispatch stats: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to get email dispatch stats"
+        )
+
 @app.get('/ses/account')
-def get_ses_account(request: Request):
+def get_ses_account():
     """
     Get detailed SES account information (admin endpoint)
     """
-    check_rate_limit(request)
     try:
-        import boto3
-        ses_v2_client = boto3.client(
-            'sesv2',
-            aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY'),
-            region_name=os.environ.get('AWS_REGION', 'ap-south-1')
-        )
-        
-        account_info = ses_v2_client.get_account()
+        account_info = aws_clients.sesv2().get_account()
         return {
             "account_info": account_info,
             "status": "success"
@@ -1408,13 +1764,11 @@ def get_ses_account(request: Request):
 
 @app.post('/ses/verify-email')
 def verify_email_identity(
-    request: Request,
     email: str = Form(...)
 ):
     """
     Verify an email address with SES (admin endpoint)
     """
-    check_rate_limit(request)
     try:
         success = ses_email_service.verify_email_identity(email)
         if success:
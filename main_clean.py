@@ -9,7 +9,6 @@ from db.database import engine, Base, get_db, DBSession
 from models.event_registration_model import EventRegistrationModel
 from schemas.event_registration_schema import EventRegistrationSchema
 from connector.connector import event_registration_connector
-import boto3
 from botocore.exceptions import NoCredentialsError
 import random
 import string
@@ -21,6 +20,7 @@ import time
 from fastapi.openapi.utils import get_openapi
 from datetime import datetime
 from utils.timezone_utils import format_ist_datetime
+from utils.aws_clients import aws_clients
 
 # FastAPI app initialization
 app = FastAPI(title="Alldays Orangetheory Event API", version="1.0.0")
@@ -114,11 +114,7 @@ def create_event_registration(
         file_url = None
         if file:
             try:
-                s3 = boto3.client(
-                    's3',
-                    aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
-                    aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY')
-                )
+                s3 = aws_clients.s3()
                 bucket_name = os.environ.get('S3_BUCKET_NAME', 'alldayspayments')
                 file_ext = file.filename.split('.')[-1]
                 s3_key = f"orangetheorypayments/{email}_{first_name}_{last_name}.{file_ext}"
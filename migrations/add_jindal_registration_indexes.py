@@ -0,0 +1,40 @@
+"""
+Migration script for the Jindal registrations admin list
+Adds composite indexes used by keyset pagination and the payment_status/state/city filters
+"""
+
+import os
+import sys
+from sqlalchemy import text
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.database import engine
+
+def add_jindal_registration_indexes():
+    """
+    Create the (filter, created_at, id) indexes on jindal_registrations
+    """
+    try:
+        # CONCURRENTLY can't run inside a transaction block
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            indexes_sql = [
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_jindal_registrations_created_at_id ON jindal_registrations(created_at, id);",
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_jindal_registrations_payment_status_created_at_id ON jindal_registrations(payment_status, created_at, id);",
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_jindal_registrations_state_created_at_id ON jindal_registrations(state, created_at, id);",
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_jindal_registrations_city_created_at_id ON jindal_registrations(city, created_at, id);"
+            ]
+            for index_sql in indexes_sql:
+                connection.execute(text(index_sql))
+
+            print("✅ Successfully created Jindal registration indexes!")
+
+    except Exception as e:
+        print(f"❌ Error creating Jindal registration indexes: {e}")
+        raise
+
+if __name__ == "__main__":
+    print("🏗️ Adding Jindal registration indexes...")
+    add_jindal_registration_indexes()
+    print("\n🎉 Jindal registration indexes migration completed!")
@@ -0,0 +1,76 @@
+"""
+Migration script for the email_broadcasts and email_broadcast_failures tables
+Checkpoints and failed recipients of bulk emails to every registrant of a registration type
+"""
+
+import os
+import sys
+from sqlalchemy import text
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.database import engine
+
+def create_email_broadcast_tables():
+    """
+    Create the email_broadcasts and email_broadcast_failures tables and their indexes
+    """
+    try:
+        with engine.connect() as connection:
+            create_broadcasts_sql = """
+            CREATE TABLE IF NOT EXISTS email_broadcasts (
+                id SERIAL PRIMARY KEY,
+                name VARCHAR(100) NOT NULL UNIQUE,
+                registration_type VARCHAR(20) NOT NULL,
+                orangetheory_batch VARCHAR,
+                template_name VARCHAR(100) NOT NULL,
+                template_data TEXT NOT NULL,
+                status VARCHAR(20) NOT NULL DEFAULT 'pending',
+                lease_until TIMESTAMP WITH TIME ZONE,
+                run_token VARCHAR(32),
+                last_registration_id INTEGER NOT NULL DEFAULT 0,
+                sent INTEGER NOT NULL DEFAULT 0,
+                failed INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                completed_at TIMESTAMP WITH TIME ZONE
+            );
+            """
+            connection.execute(text(create_broadcasts_sql))
+            connection.execute(text(
+                "ALTER TABLE email_broadcasts ADD COLUMN IF NOT EXISTS run_token VARCHAR(32);"
+            ))
+
+            create_failures_sql = """
+            CREATE TABLE IF NOT EXISTS email_broadcast_failures (
+                id SERIAL PRIMARY KEY,
+                broadcast_id INTEGER NOT NULL REFERENCES email_broadcasts(id) ON DELETE CASCADE,
+                registration_id INTEGER NOT NULL,
+                recipient_email VARCHAR(255) NOT NULL,
+                error TEXT NOT NULL,
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                CONSTRAINT uq_email_broadcast_failures UNIQUE (broadcast_id, registration_id)
+            );
+            """
+            connection.execute(text(create_failures_sql))
+
+            indexes_sql = [
+                "CREATE INDEX IF NOT EXISTS ix_email_broadcasts_id ON email_broadcasts(id);",
+                "CREATE INDEX IF NOT EXISTS ix_email_broadcast_failures_id ON email_broadcast_failures(id);"
+            ]
+            for index_sql in indexes_sql:
+                connection.execute(text(index_sql))
+
+            connection.commit()
+            print("✅ Successfully created email_broadcasts and email_broadcast_failures tables!")
+
+    except Exception as e:
+        print(f"❌ Error creating email broadcast tables: {e}")
+        raise
+
+if __name__ == "__main__":
+    print("🏗️ Creating email broadcast tables...")
+    create_email_broadcast_tables()
+    print("\n🎉 Email broadcast migration completed!")
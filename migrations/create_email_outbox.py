@@ -0,0 +1,54 @@
+"""
+Migration script for the email_outbox table
+Emails written in the same transaction as the registration they confirm, sent by the email dispatcher
+"""
+
+import os
+import sys
+from sqlalchemy import text
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.database import engine
+
+def create_email_outbox_table():
+    """
+    Create the email_outbox table and its indexes
+    """
+    try:
+        with engine.connect() as connection:
+            create_table_sql = """
+            CREATE TABLE IF NOT EXISTS email_outbox (
+                id SERIAL PRIMARY KEY,
+                email_type VARCHAR(50) NOT NULL,
+                recipient_email VARCHAR(255) NOT NULL,
+                payload TEXT NOT NULL,
+                status VARCHAR(20) NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+                last_error TEXT,
+                sent_at TIMESTAMP WITH TIME ZONE,
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+            );
+            """
+            connection.execute(text(create_table_sql))
+
+            indexes_sql = [
+                "CREATE INDEX IF NOT EXISTS ix_email_outbox_id ON email_outbox(id);",
+                "CREATE INDEX IF NOT EXISTS ix_email_outbox_due ON email_outbox(next_attempt_at) WHERE status = 'pending';"
+            ]
+            for index_sql in indexes_sql:
+                connection.execute(text(index_sql))
+
+            connection.commit()
+            print("✅ Successfully created email_outbox table!")
+
+    except Exception as e:
+        print(f"❌ Error creating email_outbox table: {e}")
+        raise
+
+if __name__ == "__main__":
+    print("🏗️ Creating email_outbox table...")
+    create_email_outbox_table()
+    print("\n🎉 Email outbox migration completed!")
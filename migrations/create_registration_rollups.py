@@ -0,0 +1,54 @@
+"""
+Migration script for the registration_rollups table
+Hourly registration and revenue counts per registration type, sport and payment status
+Run scripts/rebuild_registration_rollups.py afterwards to fill it from existing registrations
+"""
+
+import os
+import sys
+from sqlalchemy import text
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.database import engine
+
+def create_registration_rollups_table():
+    """
+    Create the registration_rollups table and its indexes
+    """
+    try:
+        with engine.connect() as connection:
+            create_table_sql = """
+            CREATE TABLE IF NOT EXISTS registration_rollups (
+                id SERIAL PRIMARY KEY,
+                bucket_start TIMESTAMP WITH TIME ZONE NOT NULL,
+                registration_type VARCHAR(20) NOT NULL,
+                sport_key VARCHAR(50) NOT NULL,
+                payment_status VARCHAR(50) NOT NULL,
+                registrations INTEGER NOT NULL DEFAULT 0,
+                amount BIGINT NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                CONSTRAINT uq_registration_rollups UNIQUE (bucket_start, registration_type, sport_key, payment_status)
+            );
+            """
+            connection.execute(text(create_table_sql))
+
+            indexes_sql = [
+                "CREATE INDEX IF NOT EXISTS ix_registration_rollups_id ON registration_rollups(id);",
+                "CREATE INDEX IF NOT EXISTS ix_registration_rollups_series ON registration_rollups(registration_type, sport_key, bucket_start);"
+            ]
+            for index_sql in indexes_sql:
+                connection.execute(text(index_sql))
+
+            connection.commit()
+            print("✅ Successfully created registration_rollups table!")
+
+    except Exception as e:
+        print(f"❌ Error creating registration_rollups table: {e}")
+        raise
+
+if __name__ == "__main__":
+    print("🏗️ Creating registration_rollups table...")
+    create_registration_rollups_table()
+    print("\n🎉 Registration rollups migration completed!")
@@ -0,0 +1,51 @@
+"""
+Migration script for the registration_sports join table
+Normalized copy of selected_sports for every registration table
+Run scripts/backfill_registration_sports.py afterwards to fill it for existing registrations
+"""
+
+import os
+import sys
+from sqlalchemy import text
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.database import engine
+
+def create_registration_sports_table():
+    """
+    Create the registration_sports table and its indexes
+    """
+    try:
+        with engine.connect() as connection:
+            create_table_sql = """
+            CREATE TABLE IF NOT EXISTS registration_sports (
+                id SERIAL PRIMARY KEY,
+                registration_type VARCHAR(20) NOT NULL,
+                registration_id INTEGER NOT NULL,
+                sport_key VARCHAR(50) NOT NULL,
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+                CONSTRAINT uq_registration_sports UNIQUE (registration_type, registration_id, sport_key)
+            );
+            """
+            connection.execute(text(create_table_sql))
+
+            indexes_sql = [
+                "CREATE INDEX IF NOT EXISTS ix_registration_sports_id ON registration_sports(id);",
+                "CREATE INDEX IF NOT EXISTS ix_registration_sports_sport ON registration_sports(sport_key, registration_type, registration_id);"
+            ]
+            for index_sql in indexes_sql:
+                connection.execute(text(index_sql))
+
+            connection.commit()
+            print("✅ Successfully created registration_sports table!")
+
+    except Exception as e:
+        print(f"❌ Error creating registration_sports table: {e}")
+        raise
+
+if __name__ == "__main__":
+    print("🏗️ Creating registration_sports table...")
+    create_registration_sports_table()
+    print("\n🎉 Registration sports migration completed!")
@@ -0,0 +1,59 @@
+"""
+Migration script for ticket reservation holds
+Adds sports.held_count and creates the ticket_holds table
+"""
+
+import os
+import sys
+from sqlalchemy import text
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.database import engine
+
+def create_ticket_holds():
+    """
+    Add the held_count column and create the ticket_holds table
+    """
+    try:
+        with engine.connect() as connection:
+            connection.execute(text(
+                "ALTER TABLE sports ADD COLUMN IF NOT EXISTS held_count INTEGER NOT NULL DEFAULT 0;"
+            ))
+            print("✅ Added held_count column to sports table!")
+
+            create_table_sql = """
+            CREATE TABLE IF NOT EXISTS ticket_holds (
+                id SERIAL PRIMARY KEY,
+                hold_token VARCHAR(32) NOT NULL UNIQUE,
+                sport_key VARCHAR(50) NOT NULL,
+                quantity INTEGER NOT NULL DEFAULT 1,
+                expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+                created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+            );
+            """
+            connection.execute(text(create_table_sql))
+            connection.execute(text(
+                "ALTER TABLE ticket_holds ADD COLUMN IF NOT EXISTS holder_key VARCHAR(32);"
+            ))
+
+            indexes_sql = [
+                "CREATE INDEX IF NOT EXISTS ix_ticket_holds_sport_key ON ticket_holds(sport_key);",
+                "CREATE INDEX IF NOT EXISTS ix_ticket_holds_holder_key ON ticket_holds(holder_key);",
+                "CREATE INDEX IF NOT EXISTS ix_ticket_holds_expires_at ON ticket_holds(expires_at);"
+            ]
+            for index_sql in indexes_sql:
+                connection.execute(text(index_sql))
+
+            connection.commit()
+            print("✅ Successfully created ticket_holds table!")
+
+    except Exception as e:
+        print(f"❌ Error creating ticket_holds table: {e}")
+        raise
+
+if __name__ == "__main__":
+    print("🏗️ Creating ticket holds...")
+    create_ticket_holds()
+    print("\n🎉 Ticket holds migration completed!")
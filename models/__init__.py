@@ -5,6 +5,12 @@ from .user_registration_model import UserRegistrationModel
 from .sports_model import SportsModel
 from .jindal_registration_model import JindalRegistrationModel
 from .orangetheory_registration_model import OrangetheoryRegistrationModel
+from .ticket_hold_model import TicketHoldModel
+from .registration_sport_model import RegistrationSportModel
+from .registration_rollup_model import RegistrationRollupModel
+from .email_outbox_model import EmailOutboxModel
+from .email_broadcast_model import EmailBroadcastModel
+from .email_broadcast_failure_model import EmailBroadcastFailureModel
 from db.database import Base
 
 __all__ = [
@@ -15,5 +21,11 @@ __all__ = [
     "SportsModel",
     "JindalRegistrationModel",
     "OrangetheoryRegistrationModel",
+    "TicketHoldModel",
+    "RegistrationSportModel",
+    "RegistrationRollupModel",
+    "EmailOutboxModel",
+    "EmailBroadcastModel",
+    "EmailBroadcastFailureModel",
     "Base"
 ] 
\ No newline at end of file
@@ -1,22 +1,47 @@
-from typing import Generic, TypeVar, Optional, List, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from typing import Generic, TypeVar, Optional, List, Dict, Any, Sequence, Tuple
+from datetime import datetime
+from sqlalchemy.orm import Session, Query
+from sqlalchemy import and_, insert, func, text, tuple_, DateTime
+from utils.pagination import encode_cursor, decode_cursor
 
 ModelType = TypeVar("ModelType")
 CreateSchemaType = TypeVar("CreateSchemaType")
 UpdateSchemaType = TypeVar("UpdateSchemaType")
 
 class CrudeOperationsModel(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
-    def __init__(self, model: type[ModelType]):
+    def __init__(self, model: type[ModelType], insert_returning: bool = False):
         self.model = model
+        # Opt-in: load server defaults with INSERT ... RETURNING instead of a refresh() SELECT
+        self.insert_returning = insert_returning
 
     def create(self, db: Session, obj_in: Dict[str, Any]) -> ModelType:
+        if self.insert_returning:
+            return self._create_returning(db, obj_in)
+
         db_obj = self.model(**obj_in)
         db.add(db_obj)
+        db.flush()
+        self.after_create(db, db_obj)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
+    def after_create(self, db: Session, db_obj: ModelType) -> None:
+        """Hook for rows that must be written in the same transaction as the new object"""
+        pass
+
+    def _create_returning(self, db: Session, obj_in: Dict[str, Any]) -> ModelType:
+        """
+        Insert and load the full row in one statement.
+        The object is detached before commit so expire_on_commit doesn't throw
+        away the returned values and trigger a reload on first access.
+        """
+        db_obj = db.scalars(insert(self.model).values(**obj_in).returning(self.model)).one()
+        self.after_create(db, db_obj)
+        db.expunge(db_obj)
+        db.commit()
+        return db_obj
+
     def read(self, db: Session, filters: Dict[str, Any]) -> Optional[ModelType]:
         conditions = []
         for key, value in filters.items():
@@ -59,4 +84,65 @@ class CrudeOperationsModel(Generic[ModelType, CreateSchemaType, UpdateSchemaType
         return False
 
     def list(self, db: Session, skip: int = 0, limit: int = 100) -> List[ModelType]:
-        return db.query(self.model).offset(skip).limit(limit).all() 
\ No newline at end of file
+        return db.query(self.model).offset(skip).limit(limit).all() 
+
+    def keyset_page(
+        self,
+        db: Session,
+        limit: int,
+        cursor: Optional[str] = None,
+        query: Optional[Query] = None,
+        keys: Sequence[str] = ("id",),
+        descending: bool = True
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """
+        One page of rows ordered by keys, continuing after cursor.
+        Unlike OFFSET, every page costs the same: the cursor holds the sort key of
+        the previous page's last row and becomes a range condition on the index
+        over keys. keys must be unique together (end them with the primary key).
+        Returns: (rows, next_cursor); next_cursor is None on the last page
+        Raises ValueError for an invalid cursor
+        """
+        columns = [getattr(self.model, key) for key in keys]
+        if query is None:
+            query = db.query(self.model)
+
+        if cursor:
+            bound = tuple_(*self._decode_keyset_cursor(cursor, columns))
+            row = tuple_(*columns)
+            query = query.filter(row < bound if descending else row > bound)
+
+        # One extra row tells whether there is another page
+        order_by = [column.desc() if descending else column.asc() for column in columns]
+        rows = query.order_by(*order_by).limit(limit + 1).all()
+
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, encode_cursor(*(getattr(rows[-1], key) for key in keys))
+
+    def estimated_count(self, db: Session) -> int:
+        """
+        Row count estimate from pg_class.reltuples, kept current by autovacuum/ANALYZE.
+        Costs a catalog lookup instead of a full COUNT(*); falls back to an exact
+        count for tables that have never been analyzed.
+        """
+        estimate = db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"),
+            {"table_name": self.model.__tablename__}
+        ).scalar()
+        if estimate is None or estimate < 0:
+            return db.query(func.count()).select_from(self.model).scalar()
+        return estimate
+
+    def _decode_keyset_cursor(self, cursor: str, columns: list) -> list:
+        values = decode_cursor(cursor)
+        if len(values) != len(columns):
+            raise ValueError("Invalid cursor")
+        try:
+            return [
+                datetime.fromisoformat(value) if isinstance(column.type, DateTime) else column.type.python_type(value)
+                for column, value in zip(columns, values)
+            ]
+        except (TypeError, ValueError, NotImplementedError) as e:
+            raise ValueError("Invalid cursor") from e
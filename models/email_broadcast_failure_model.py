@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from db.database import Base, IST_TIMEZONE
+from datetime import datetime
+
+class EmailBroadcastFailureModel(Base):
+    __tablename__ = "email_broadcast_failures"
+    __table_args__ = (
+        # A chunk replayed after a crash records its failures once
+        UniqueConstraint("broadcast_id", "registration_id", name="uq_email_broadcast_failures"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    broadcast_id = Column(Integer, ForeignKey("email_broadcasts.id", ondelete="CASCADE"), nullable=False)
+    registration_id = Column(Integer, nullable=False)
+    recipient_email = Column(String(255), nullable=False)
+    error = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), default=lambda: datetime.now(IST_TIMEZONE))
+
+    def __repr__(self):
+        return f"<EmailBroadcastFailureModel(broadcast_id={self.broadcast_id}, recipient_email='{self.recipient_email}')>"
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy.sql import func
+from db.database import Base, IST_TIMEZONE
+from datetime import datetime
+
+class EmailBroadcastModel(Base):
+    __tablename__ = "email_broadcasts"
+
+    # Values of status
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), unique=True, nullable=False)  # resuming a broadcast looks it up by name
+    registration_type = Column(String(20), nullable=False)  # "event", "orangetheory" or "jindal"
+    orangetheory_batch = Column(String, nullable=True)  # only registrants of this batch, if set
+    template_name = Column(String(100), nullable=False)
+    template_data = Column(Text, nullable=False)  # JSON placeholder values shared by every recipient
+    status = Column(String(20), nullable=False, default=PENDING)
+    lease_until = Column(DateTime(timezone=True), nullable=True)  # a run holds the broadcast until then
+    run_token = Column(String(32), nullable=True)  # set by each claim; a run that no longer matches has lost its lease
+    last_registration_id = Column(Integer, nullable=False, default=0)  # checkpoint: every registration up to here is done
+    sent = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), default=lambda: datetime.now(IST_TIMEZONE))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=lambda: datetime.now(IST_TIMEZONE), default=lambda: datetime.now(IST_TIMEZONE))
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<EmailBroadcastModel(name='{self.name}', status='{self.status}', sent={self.sent}, failed={self.failed})>"
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index, text
+from sqlalchemy.sql import func
+from db.database import Base, IST_TIMEZONE
+from datetime import datetime
+
+class EmailOutboxModel(Base):
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # Serves the dispatcher's "due emails" claim; sent and failed rows drop out of it
+        Index("ix_email_outbox_due", "next_attempt_at", postgresql_where=text("status = 'pending'")),
+    )
+
+    # Values of status
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"  # gave up after the maximum number of attempts
+
+    # Values of email_type
+    EVENT_CONFIRMATION = "event_confirmation"
+    JINDAL_CONFIRMATION = "jindal_confirmation"
+
+    id = Column(Integer, primary_key=True, index=True)
+    email_type = Column(String(50), nullable=False)
+    recipient_email = Column(String(255), nullable=False)
+    payload = Column(Text, nullable=False)  # JSON keyword arguments of the send method
+    status = Column(String(20), nullable=False, default=PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), default=lambda: datetime.now(IST_TIMEZONE))
+    last_error = Column(Text, nullable=True)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), default=lambda: datetime.now(IST_TIMEZONE))
+
+    def __repr__(self):
+        return f"<EmailOutboxModel(email_type='{self.email_type}', recipient_email='{self.recipient_email}', status='{self.status}', attempts={self.attempts})>"
@@ -1,10 +1,17 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Index
 from sqlalchemy.sql import func
 from db.database import Base, IST_TIMEZONE
 from datetime import datetime
 
 class JindalRegistrationModel(Base):
     __tablename__ = "jindal_registrations"
+    __table_args__ = (
+        # Keyset pagination of the admin list, newest first, optionally filtered
+        Index("ix_jindal_registrations_created_at_id", "created_at", "id"),
+        Index("ix_jindal_registrations_payment_status_created_at_id", "payment_status", "created_at", "id"),
+        Index("ix_jindal_registrations_state_created_at_id", "state", "created_at", "id"),
+        Index("ix_jindal_registrations_city_created_at_id", "city", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     first_name = Column(String(100), nullable=False)
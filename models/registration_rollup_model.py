@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Index, UniqueConstraint
+from sqlalchemy.sql import func
+from db.database import Base, IST_TIMEZONE
+from datetime import datetime
+
+class RegistrationRollupModel(Base):
+    __tablename__ = "registration_rollups"
+    __table_args__ = (
+        # One row per bucket; the upsert target when registrations are counted in
+        UniqueConstraint("bucket_start", "registration_type", "sport_key", "payment_status", name="uq_registration_rollups"),
+        # Serves time series for one type and sport
+        Index("ix_registration_rollups_series", "registration_type", "sport_key", "bucket_start"),
+    )
+
+    # sport_key of the per-type total row; sport rows overlap since a registration can choose several sports
+    ALL_SPORTS = "*"
+
+    id = Column(Integer, primary_key=True, index=True)
+    bucket_start = Column(DateTime(timezone=True), nullable=False)  # start of the IST hour the registrations were created in
+    registration_type = Column(String(20), nullable=False)  # event, orangetheory, jindal
+    sport_key = Column(String(50), nullable=False)  # a sport, or ALL_SPORTS
+    payment_status = Column(String(50), nullable=False)
+    registrations = Column(Integer, nullable=False, default=0)
+    amount = Column(BigInteger, nullable=False, default=0)  # sum of total_amount (Jindal only)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=lambda: datetime.now(IST_TIMEZONE), default=lambda: datetime.now(IST_TIMEZONE))
+
+    def __repr__(self):
+        return f"<RegistrationRollupModel(bucket_start={self.bucket_start}, type='{self.registration_type}', sport_key='{self.sport_key}', payment_status='{self.payment_status}', registrations={self.registrations})>"
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index, UniqueConstraint
+from sqlalchemy.sql import func
+from db.database import Base, IST_TIMEZONE
+from datetime import datetime
+
+class RegistrationSportModel(Base):
+    __tablename__ = "registration_sports"
+    __table_args__ = (
+        # One row per sport per registration; also serves "sports of this registration"
+        UniqueConstraint("registration_type", "registration_id", "sport_key", name="uq_registration_sports"),
+        # Serves "how many chose padel" and "list padel registrants"
+        Index("ix_registration_sports_sport", "sport_key", "registration_type", "registration_id"),
+    )
+
+    # Values of registration_type
+    EVENT = "event"
+    ORANGETHEORY = "orangetheory"
+    JINDAL = "jindal"
+
+    id = Column(Integer, primary_key=True, index=True)
+    registration_type = Column(String(20), nullable=False)  # event, orangetheory, jindal
+    registration_id = Column(Integer, nullable=False)  # id in the matching registration table
+    sport_key = Column(String(50), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), default=lambda: datetime.now(IST_TIMEZONE))
+
+    def __repr__(self):
+        return f"<RegistrationSportModel(type='{self.registration_type}', registration_id={self.registration_id}, sport_key='{self.sport_key}')>"
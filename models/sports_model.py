@@ -13,6 +13,7 @@ class SportsModel(Base):
     price = Column(Integer, nullable=False, default=0)  # Price in INR
     max_capacity = Column(Integer, nullable=False, default=50)  # Maximum tickets available
     current_count = Column(Integer, nullable=False, default=0)  # Current tickets sold
+    held_count = Column(Integer, nullable=False, default=0, server_default="0")  # Tickets reserved by active holds
     is_active = Column(Boolean, default=True, nullable=False)  # Whether sport is available for booking
     is_sold_out = Column(Boolean, default=False, nullable=False)  # Sold out status
     timing = Column(String(100), nullable=True)  # e.g., "4-8pm"
@@ -24,13 +25,24 @@ class SportsModel(Base):
 
     @property
     def remaining_tickets(self) -> int:
-        """Calculate remaining tickets"""
-        return max(0, self.max_capacity - self.current_count)
+        """Calculate remaining tickets, excluding tickets reserved by active holds"""
+        return max(0, self.max_capacity - self.current_count - (self.held_count or 0))
 
     @property
     def is_available(self) -> bool:
         """Check if sport is available for booking"""
-        return self.is_active and not self.is_sold_out and self.current_count < self.max_capacity
+        return self.is_active and not self.is_sold_out and self.remaining_tickets > 0
+
+    def availability_snapshot(self) -> dict:
+        """Counts pushed to other workers and live subscribers when availability changes"""
+        return {
+            "sport_key": self.sport_key,
+            "current_count": self.current_count,
+            "max_capacity": self.max_capacity,
+            "remaining_tickets": self.remaining_tickets,
+            "is_available": self.is_available,
+            "is_sold_out": self.is_sold_out
+        }
 
     def increment_count(self, count: int = 1) -> bool:
         """
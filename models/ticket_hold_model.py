@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from db.database import Base, IST_TIMEZONE
+from datetime import datetime
+
+class TicketHoldModel(Base):
+    __tablename__ = "ticket_holds"
+
+    id = Column(Integer, primary_key=True, index=True)
+    hold_token = Column(String(32), nullable=False, unique=True, index=True)  # Handed to the client, presented at registration
+    sport_key = Column(String(50), nullable=False, index=True)
+    holder_key = Column(String(32), nullable=True, index=True)  # Hashed hold session that took the hold, for the per-session cap
+    quantity = Column(Integer, nullable=False, default=1)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), default=lambda: datetime.now(IST_TIMEZONE))
+
+    def __repr__(self):
+        return f"<TicketHoldModel(sport_key='{self.sport_key}', quantity={self.quantity}, expires_at={self.expires_at})>"
@@ -0,0 +1,62 @@
+from pydantic import BaseModel, validator
+from typing import Dict, List, Optional
+from datetime import datetime
+
+# Registration types whose table has an orangetheory_batch column to filter on
+BATCHED_REGISTRATION_TYPES = ["event", "orangetheory"]
+
+class EmailBroadcastCreate(BaseModel):
+    name: str  # sending again under the same name resumes the broadcast
+    registration_type: str
+    subject: str
+    message: str
+    template_name: str = "event_broadcast"
+    orangetheory_batch: Optional[str] = None
+    template_data: Dict[str, str] = {}  # further placeholder values for custom templates
+
+    @validator('name', 'subject', 'message')
+    def validate_not_empty(cls, v):
+        if not v.strip():
+            raise ValueError('Cannot be empty')
+        return v.strip()
+
+    @validator('registration_type')
+    def validate_registration_type(cls, v):
+        valid_types = ["event", "orangetheory", "jindal"]
+        if v not in valid_types:
+            raise ValueError(f'Registration type must be one of: {", ".join(valid_types)}')
+        return v
+
+    @validator('orangetheory_batch')
+    def validate_orangetheory_batch(cls, v, values):
+        if v is not None and values.get('registration_type') not in BATCHED_REGISTRATION_TYPES:
+            raise ValueError(f'orangetheory_batch only applies to: {", ".join(BATCHED_REGISTRATION_TYPES)}')
+        return v
+
+class EmailBroadcastFailureResponse(BaseModel):
+    registration_id: int
+    recipient_email: str
+    error: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class EmailBroadcastResponse(BaseModel):
+    id: int
+    name: str
+    registration_type: str
+    orangetheory_batch: Optional[str] = None
+    template_name: str
+    status: str
+    last_registration_id: int
+    sent: int
+    failed: int
+    last_error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    completed_at: Optional[datetime] = None
+    failures: List[EmailBroadcastFailureResponse] = []
+
+    class Config:
+        from_attributes = True
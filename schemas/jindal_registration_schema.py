@@ -170,8 +170,9 @@ class JindalRegistrationResponse(JindalRegistrationBase):
         from_attributes = True
 
 class JindalRegistrationListResponse(BaseModel):
-    total_registrations: int
+    total_registrations: int  # Registrations in this response
     registrations: List[JindalRegistrationResponse]
+    next_cursor: Optional[str] = None  # Pass as ?cursor= for the next page, None on the last page
 
     class Config:
         from_attributes = True
@@ -38,5 +38,6 @@ class OrangetheoryRegistrationResponse(BaseModel):
 class OrangetheoryRegistrationListResponse(BaseModel):
     registrations: List[OrangetheoryRegistrationResponse]
     total: int
-    skip: int
+    total_is_estimate: bool = False  # total comes from table statistics, not COUNT(*)
     limit: int
+    next_cursor: Optional[str] = None  # Pass as ?cursor= for the next page, None on the last page
@@ -115,3 +115,23 @@ class TicketPurchaseResponse(BaseModel):
     remaining_tickets: int
     is_sold_out: bool
     message: str
+
+class TicketHoldRequest(BaseModel):
+    quantity: int = 1
+
+    @validator('quantity')
+    def validate_quantity(cls, v):
+        if v <= 0:
+            raise ValueError('Quantity must be greater than 0')
+        if v > 4:  # Holds are anonymous, so they are capped well below purchases
+            raise ValueError('Cannot hold more than 4 tickets at once')
+        return v
+
+class TicketHoldResponse(BaseModel):
+    success: bool
+    hold_token: str
+    hold_session: str  # send back as X-Hold-Session with later holds
+    sport_key: str
+    quantity: int
+    expires_at: datetime
+    message: str
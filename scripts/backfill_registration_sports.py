@@ -0,0 +1,67 @@
+"""
+Backfill registration_sports from the selected_sports column of existing registrations
+Safe to re-run: rows that already exist are skipped
+"""
+
+import os
+import sys
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.database import SessionLocal
+from models.event_registration_model import EventRegistrationModel
+from models.orangetheory_registration_model import OrangetheoryRegistrationModel
+from models.jindal_registration_model import JindalRegistrationModel
+from models.registration_sport_model import RegistrationSportModel
+from connector.registration_sports_connector import registration_sports_connector
+
+BATCH_SIZE = 1000
+
+REGISTRATION_TABLES = [
+    (RegistrationSportModel.EVENT, EventRegistrationModel),
+    (RegistrationSportModel.ORANGETHEORY, OrangetheoryRegistrationModel),
+    (RegistrationSportModel.JINDAL, JindalRegistrationModel),
+]
+
+def backfill(registration_type: str, model) -> None:
+    """
+    Write registration_sports rows for one registration table, one batch per transaction
+    """
+    db = SessionLocal()
+    last_id = 0
+    registrations = 0
+    sports = 0
+
+    try:
+        while True:
+            rows = (
+                db.query(model.id, model.selected_sports)
+                .filter(model.id > last_id)
+                .order_by(model.id)
+                .limit(BATCH_SIZE)
+                .all()
+            )
+            if not rows:
+                break
+
+            for registration_id, selected_sports in rows:
+                sports += registration_sports_connector.add_sports(db, registration_type, registration_id, selected_sports)
+            db.commit()
+
+            registrations += len(rows)
+            last_id = rows[-1].id
+
+        print(f"✅ {model.__tablename__}: {registrations} registrations, {sports} sport selections")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error backfilling {model.__tablename__}: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    print("🏗️ Backfilling registration_sports...")
+    for registration_type, model in REGISTRATION_TABLES:
+        backfill(registration_type, model)
+    print("\n🎉 Backfill completed!")
@@ -0,0 +1,87 @@
+"""
+Benchmark per-request AWS client setup
+Compares building a fresh boto3 client for every request, as the upload handlers and SES
+endpoints used to, with the shared clients from utils.aws_clients. Measures client setup on
+its own, then a whole small S3 upload against a local stand-in for S3 so no AWS account or
+network is needed.
+"""
+
+import os
+import sys
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Placeholder credentials; nothing here reaches AWS
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'benchmark')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'benchmark')
+
+import boto3
+from utils.aws_clients import AWSClientFactory, AWS_CLIENT_CONFIG
+
+SETUPS = 200
+UPLOADS = 300
+PAYLOAD = b"x" * 64 * 1024  # a payment screenshot
+
+
+class FakeS3Handler(BaseHTTPRequestHandler):
+    """Accepts every PutObject"""
+    protocol_version = "HTTP/1.1"
+
+    def do_PUT(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.send_response(200)
+        self.send_header('ETag', '"benchmark"')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def per_call(label: str, count: int, call) -> None:
+    started = time.perf_counter()
+    for _ in range(count):
+        call()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<36} {elapsed / count * 1000:>8.3f} ms per request")
+
+
+def main():
+    print(f"Client setup ({SETUPS} requests)")
+    for service_name, region_name in (('s3', None), ('ses', 'ap-south-1'), ('sesv2', 'ap-south-1')):
+        per_call(f"{service_name}: new client per request", SETUPS, lambda: boto3.client(
+            service_name,
+            aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
+            aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY'),
+            region_name=region_name
+        ))
+        factory = AWSClientFactory()
+        factory.client(service_name, region_name)
+        per_call(f"{service_name}: shared client", SETUPS, lambda: factory.client(service_name, region_name))
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeS3Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    def new_client_upload():
+        s3 = boto3.client('s3', endpoint_url=endpoint_url, region_name='us-east-1')
+        s3.put_object(Bucket='alldayspayments', Key='benchmark.png', Body=PAYLOAD)
+
+    shared = boto3.session.Session().client('s3', endpoint_url=endpoint_url, region_name='us-east-1', config=AWS_CLIENT_CONFIG)
+
+    def shared_client_upload():
+        shared.put_object(Bucket='alldayspayments', Key='benchmark.png', Body=PAYLOAD)
+
+    print(f"\n64 KiB S3 upload against a local endpoint ({UPLOADS} requests)")
+    shared_client_upload()
+    per_call("new client per request", UPLOADS, new_client_upload)
+    per_call("shared client", UPLOADS, shared_client_upload)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
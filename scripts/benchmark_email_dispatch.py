@@ -0,0 +1,112 @@
+"""
+Benchmark the email dispatcher against a simulated SES account
+Queues a burst of confirmation emails in the outbox and drains it with the dispatcher,
+once paced by the quota-aware token bucket and once with pacing disabled. The simulated
+SES enforces MaxSendRate over a one second window and throttles anything above it.
+Reports sustained throughput, throttled sends and queue depth. Runs against DATABASE_URL;
+the benchmark's outbox rows are deleted afterwards.
+"""
+
+import os
+import sys
+import time
+import threading
+from collections import deque
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete
+from db.database import SessionLocal, engine, Base
+from models.email_outbox_model import EmailOutboxModel
+from connector.email_outbox_connector import email_outbox_connector
+from utils import email_dispatcher as dispatch
+from utils.email_utils import ses_email_service, SESThrottlingError
+
+EMAILS = 300
+MAX_SEND_RATE = 14.0  # a typical production SES account
+SEND_LATENCY_SECONDS = 0.08
+RECIPIENT_DOMAIN = "dispatch-bench.example.com"
+
+
+class SimulatedSES:
+    """Accepts at most MAX_SEND_RATE sends in any one second window, like SES"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._accepted = deque()
+        self.throttled = 0
+
+    def send(self, recipient_email: str, **kwargs) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            while self._accepted and self._accepted[0] <= now - 1.0:
+                self._accepted.popleft()
+            if len(self._accepted) >= MAX_SEND_RATE:
+                self.throttled += 1
+                raise SESThrottlingError("Maximum sending rate exceeded.")
+            self._accepted.append(now)
+        time.sleep(SEND_LATENCY_SECONDS)
+        return True
+
+    def get_sending_limits(self) -> dict:
+        return {'max_send_rate': MAX_SEND_RATE, 'max_24_hour_send': -1, 'sent_last_24_hours': 0}
+
+
+def queue_emails(db) -> None:
+    for i in range(EMAILS):
+        email_outbox_connector.enqueue(db, EmailOutboxModel.EVENT_CONFIRMATION, f"user{i}@{RECIPIENT_DOMAIN}", {})
+    db.commit()
+
+
+def clear_emails(db) -> None:
+    db.execute(delete(EmailOutboxModel).where(EmailOutboxModel.recipient_email.like(f"%@{RECIPIENT_DOMAIN}")))
+    db.commit()
+
+
+def run(label: str, paced: bool) -> None:
+    ses = SimulatedSES()
+    dispatch.EMAIL_SENDERS[EmailOutboxModel.EVENT_CONFIRMATION] = ses.send
+    ses_email_service.get_sending_limits = ses.get_sending_limits
+
+    db = SessionLocal()
+    try:
+        clear_emails(db)
+        queue_emails(db)
+
+        dispatcher = dispatch.EmailDispatcher(batch_size=20, interval=0.2, workers=8, rate_fraction=1.0)
+        if not paced:
+            # Effectively no pacing: only the worker pool bounds the send rate
+            dispatcher.refresh_quota = lambda: None
+            dispatcher.rate_limiter.configure(10_000.0, None)
+
+        started = time.perf_counter()
+        dispatcher.start()
+        depth_samples = []
+        while True:
+            depth = email_outbox_connector.queue_depth(db)
+            db.commit()
+            depth_samples.append(depth["due"] + depth["scheduled"])
+            if depth_samples[-1] == 0:
+                break
+            time.sleep(0.5)
+        elapsed = time.perf_counter() - started
+        dispatcher.stop()
+
+        stats = dispatcher.stats()
+        print(f"  {label:<24} {elapsed:>6.1f} s  {stats['sent'] / elapsed:>5.1f} sent/s  "
+              f"{ses.throttled:>4} throttled  peak queue {max(depth_samples)}")
+    finally:
+        clear_emails(db)
+        db.close()
+
+
+def main():
+    Base.metadata.create_all(engine)
+    print(f"Draining {EMAILS} emails, SES MaxSendRate {MAX_SEND_RATE:.0f}/s, {SEND_LATENCY_SECONDS * 1000:.0f} ms per send\n")
+    run("token bucket from quota", paced=True)
+    run("unpaced worker pool", paced=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark email template rendering
+Compares the previous fill (read the HTML file on every send, then one str.replace pass
+over the whole template per variable) with the cached, precompiled templates, for both
+confirmation emails. Checks the outputs are identical. No database or SES needed.
+"""
+
+import os
+import sys
+import timeit
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates.email_templates import template_loader
+
+RENDERS = 20_000
+
+TEMPLATE_VARIABLES = {
+    'event_registration': {
+        'FIRST_NAME': 'Aarav',
+        'LAST_NAME': 'Sharma',
+        'EMAIL': 'aarav.sharma@example.com',
+        'BOOKING_ID': 'X7K2M9QP',
+        'SELECTED_SPORTS': 'Padel, Pickleball',
+        'EVENT_DATE': 'Sunday, 14th September 2025',
+        'EVENT_LOCATION': 'Alldays Arena, Mumbai',
+        'ORANGETHEORY_BATCH_ROW': '<div class="detail-row"><span class="detail-label">Orangetheory Batch: </span><span class="detail-value">Batch 1</span></div>'
+    },
+    'jindal_registration': {
+        'FIRST_NAME': 'Aarav',
+        'LAST_NAME': 'Sharma',
+        'EMAIL': 'aarav.sharma@example.com',
+        'JGU_STUDENT_ID': 'JGU2025001',
+        'CITY': 'Sonipat',
+        'STATE': 'Haryana',
+        'SELECTED_SPORTS': 'Pickleball',
+        'PICKLEBALL_LEVEL_ROW': '<div class="detail-row"><span class="detail-label">Pickleball Level: </span><span class="detail-value">Beginner</span></div>',
+        'TOTAL_AMOUNT': '₹499'
+    },
+}
+
+
+def fill_template_uncached(template_name: str, variables: dict) -> str:
+    """The fill before templates were cached"""
+    template = template_loader.load_template(template_name)
+    for key, value in variables.items():
+        placeholder = f"{{{{{key}}}}}"
+        template = template.replace(placeholder, str(value))
+    return template
+
+
+def main():
+    print(f"{RENDERS} renders per template\n")
+    for template_name, variables in TEMPLATE_VARIABLES.items():
+        assert template_loader.fill_template(template_name, variables) == fill_template_uncached(template_name, variables)
+
+        uncached = timeit.timeit(lambda: fill_template_uncached(template_name, variables), number=RENDERS)
+        cached = timeit.timeit(lambda: template_loader.fill_template(template_name, variables), number=RENDERS)
+        print(f"  {template_name:<22} uncached {uncached / RENDERS * 1e6:>6.1f} µs   "
+              f"cached {cached / RENDERS * 1e6:>6.1f} µs   {uncached / cached:>4.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark CrudeOperationsModel.create with and without INSERT ... RETURNING
+Counts SQL statements and measures latency per registration insert against DATABASE_URL.
+Everything runs inside an outer transaction that is rolled back, so no rows are kept.
+"""
+
+import os
+import sys
+import time
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.database import engine, Base
+from models.event_registration_model import EventRegistrationModel
+from models.crude_operations_model import CrudeOperationsModel
+from utils.booking_id_generator import encode_booking_id
+
+INSERTS = 500
+
+
+def registration(i: int) -> dict:
+    return {
+        'first_name': 'bench',
+        'last_name': f'user{i}',
+        'email': f'bench{i}@example.com',
+        'phone': '9999999999',
+        'selected_sports': '["orangetheory"]',
+        'orangetheory_batch': 'batch1',
+        'event_date': '24th August 2025',
+        'event_location': 'Orangetheory Fitness, Worli',
+        'payment_status': 'pending',
+        'booking_id': encode_booking_id(10**12 + i),
+        'is_active': True
+    }
+
+
+def run(label: str, connector: CrudeOperationsModel, offset: int) -> None:
+    statements = 0
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        nonlocal statements
+        if not statement.lstrip().upper().startswith(("SAVEPOINT", "RELEASE", "ROLLBACK")):
+            statements += 1
+
+    with engine.connect() as connection:
+        outer = connection.begin()
+        # Each create() commit only releases a savepoint; the outer rollback discards the rows
+        db = Session(bind=connection, join_transaction_mode="create_savepoint")
+        event.listen(connection, "before_cursor_execute", count)
+        try:
+            started = time.perf_counter()
+            for i in range(INSERTS):
+                obj = connector.create(db, registration(offset + i))
+                # Touch server defaults the way the handlers do
+                obj.created_at, obj.updated_at
+            elapsed = time.perf_counter() - started
+        finally:
+            event.remove(connection, "before_cursor_execute", count)
+            db.close()
+            outer.rollback()
+
+    print(f"  {label:<22} {elapsed / INSERTS * 1000:>7.3f} ms/insert  {statements / INSERTS:>4.1f} statements/insert")
+
+
+def main():
+    Base.metadata.create_all(engine)
+    print(f"Inserting {INSERTS} event registrations per mode\n")
+    run("add/commit/refresh", CrudeOperationsModel(EventRegistrationModel), 0)
+    run("INSERT ... RETURNING", CrudeOperationsModel(EventRegistrationModel, insert_returning=True), INSERTS)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Micro-benchmark for the rate limiter
+Compares the old list-of-timestamps store with SlidingWindowRateLimiter and
+reports per-request cost and resident memory as the number of distinct clients grows.
+Also checks that the shared-memory backend holds one limit across several processes.
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from multiprocessing import Pool
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.rate_limiter import SlidingWindowRateLimiter, InMemoryRateLimitBackend, SharedMemoryRateLimitBackend
+
+RATE_PERIOD = 60
+CLIENT_COUNTS = [1_000, 10_000, 100_000]
+SHM_NAME = f"alldays_rate_limit_bench_{os.getpid()}"
+# (limit, requests per client): a registration route and a busy read route
+SCENARIOS = [(5, 8), (600, 200)]
+
+
+def legacy_check(store: dict, key: str, now: float, limit: int) -> bool:
+    """The list-based check_rate_limit that used to live in main.py"""
+    window = store.get(key, [])
+    window = [ts for ts in window if now - ts < RATE_PERIOD]
+    if len(window) >= limit:
+        return False
+    window.append(now)
+    store[key] = window
+    return True
+
+
+def run(label: str, clients: int, requests_per_client: int, make_hit) -> None:
+    keys = [f"10.{i // 65536}.{(i // 256) % 256}.{i % 256}:/jindal-registration" for i in range(clients)]
+    now = time.time()
+    total = clients * requests_per_client
+
+    # Timing pass without tracemalloc, which would dominate the per-request cost
+    hit = make_hit()
+    started = time.perf_counter()
+    for _ in range(requests_per_client):
+        for key in keys:
+            hit(key, now)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    hit = make_hit()
+    for _ in range(requests_per_client):
+        for key in keys:
+            hit(key, now)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"  {label:<16} {clients:>8,} clients  {elapsed / total * 1e9:>6.0f} ns/request  {current / clients:>5.0f} B/client  {current / 1024 / 1024:>6.1f} MiB")
+
+
+def legacy_hit(limit: int):
+    def make():
+        store = {}
+        return lambda key, now: legacy_check(store, key, now, limit)
+    return make
+
+
+def limiter_hit(limit: int, max_keys: int):
+    def make():
+        limiter = SlidingWindowRateLimiter(limit=limit, period=RATE_PERIOD, backend=InMemoryRateLimitBackend(max_keys=max_keys))
+        return lambda key, now: limiter.hit(key, now=now)
+    return make
+
+
+def shared_hit(limit: int):
+    """Counters live in the shared segment, a fixed 32 B slot each, so tracemalloc reports ~0"""
+    def make():
+        limiter = SlidingWindowRateLimiter(limit=limit, period=RATE_PERIOD, backend=SharedMemoryRateLimitBackend(name=SHM_NAME, slots=262_144))
+        return lambda key, now: limiter.hit(key, now=now)
+    return make
+
+
+def worker_hits(args) -> int:
+    """Hammer one key from a separate process, returns how many requests were admitted"""
+    name, limit, requests = args
+    limiter = SlidingWindowRateLimiter(limit=limit, period=RATE_PERIOD, backend=SharedMemoryRateLimitBackend(name=name))
+    return sum(limiter.hit("203.0.113.7:/jindal-registration") for _ in range(requests))
+
+
+def check_cross_process(processes: int = 4, limit: int = 100, requests: int = 500) -> None:
+    name = f"{SHM_NAME}_xproc"
+    with Pool(processes) as pool:
+        admitted = sum(pool.map(worker_hits, [(name, limit, requests)] * processes))
+    print(f"  {processes} processes x {requests} requests, limit {limit}: {admitted} admitted")
+    SharedMemoryRateLimitBackend(name=name).close(unlink=True)
+
+
+def main():
+    for limit, requests_per_client in SCENARIOS:
+        print(f"Limit {limit}/{RATE_PERIOD}s, {requests_per_client} requests per client")
+        for clients in CLIENT_COUNTS:
+            # Keep the total request count manageable on the busy route
+            if clients * requests_per_client > 2_000_000:
+                continue
+            run("legacy list", clients, requests_per_client, legacy_hit(limit))
+            run("sliding window", clients, requests_per_client, limiter_hit(limit, max(CLIENT_COUNTS)))
+            run("shared memory", clients, requests_per_client, shared_hit(limit))
+        print()
+
+    # A bounded store keeps memory flat even when clients exceed max_keys
+    print("Bounded store, limit 5/60s, 8 requests per client")
+    run("bounded 10k LRU", max(CLIENT_COUNTS), 8, limiter_hit(5, 10_000))
+    print()
+
+    print("Shared backend across processes")
+    check_cross_process()
+    SharedMemoryRateLimitBackend(name=SHM_NAME).close(unlink=True)
+
+
+if __name__ == "__main__":
+    main()
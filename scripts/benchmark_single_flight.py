@@ -0,0 +1,104 @@
+"""
+Benchmark request coalescing in utils/response_cache.py
+Simulates a sale opening: a burst of concurrent reads hits a cold cache, then the
+entry expires under load. Compares database work with and without single flight,
+for threadpool (sync) and event loop (async) callers. Runs against DATABASE_URL.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import text
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.database import SessionLocal, engine
+from utils.response_cache import ResponseCache
+
+REQUESTS = 400
+THREADS = 40  # anyio's default threadpool size
+QUERY_SECONDS = 0.05  # simulated cost of the sports query
+
+
+class CountingQuery:
+    """Stand-in for a cached endpoint's computation, tracks calls and peak pool usage"""
+
+    def __init__(self):
+        self.calls = 0
+        self.peak_connections = 0
+        self._lock = threading.Lock()
+
+    def __call__(self) -> dict:
+        with self._lock:
+            self.calls += 1
+        db = SessionLocal()
+        try:
+            db.execute(text("SELECT pg_sleep(:seconds)"), {"seconds": QUERY_SECONDS})
+            with self._lock:
+                self.peak_connections = max(self.peak_connections, engine.pool.checkedout())
+            return {"sports": [], "generated_at": time.time()}
+        finally:
+            db.close()
+
+
+def report(label: str, query: CountingQuery, elapsed: float) -> None:
+    print(f"  {label:<34} {query.calls:>4} queries  peak {query.peak_connections:>2} connections  {elapsed * 1000:>7.1f} ms")
+
+
+def run_uncached() -> None:
+    query = CountingQuery()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        list(pool.map(lambda _: query(), range(REQUESTS)))
+    report("no coalescing (threads)", query, time.perf_counter() - started)
+
+
+def run_sync() -> None:
+    cache = ResponseCache(ttl=60, stale_seconds=60)
+    query = CountingQuery()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        bodies = set(pool.map(lambda _: cache.get_or_compute("sports", query), range(REQUESTS)))
+    report("single flight (threads)", query, time.perf_counter() - started)
+    assert len(bodies) == 1, "every caller should share one body"
+
+
+async def run_async() -> None:
+    cache = ResponseCache(ttl=60, stale_seconds=60)
+    query = CountingQuery()
+    started = time.perf_counter()
+    bodies = await asyncio.gather(*(cache.aget_or_compute("sports", query) for _ in range(REQUESTS)))
+    report("single flight (async)", query, time.perf_counter() - started)
+    assert len(set(bodies)) == 1, "every caller should share one body"
+
+
+def run_stale_while_revalidate() -> None:
+    cache = ResponseCache(ttl=0.2, stale_seconds=60)
+    query = CountingQuery()
+    cache.get_or_compute("sports", query)
+    time.sleep(0.3)  # entry is now stale
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        list(pool.map(lambda _: cache.get_or_compute("sports", query), range(REQUESTS)))
+    elapsed = time.perf_counter() - started
+    time.sleep(QUERY_SECONDS * 4)  # let the background refresh land
+    report("expiry under load (stale served)", query, elapsed)
+    stats = cache.stats()
+    print(f"    stale hits {stats['stale_hits']}, background refreshes {stats['refreshes']}")
+
+
+def main():
+    print(f"{REQUESTS} concurrent reads of a cold key, {QUERY_SECONDS * 1000:.0f} ms query, {THREADS} threads\n")
+    run_uncached()
+    run_sync()
+    asyncio.run(run_async())
+    run_stale_while_revalidate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Load test for the /sports/stream broadcaster at 10k idle subscribers
+Runs the same per-connection loop as the endpoint, in process, and reports memory per
+subscriber and how long one availability change takes to reach every subscriber.
+Publishes come from another thread, like the change bus after a commit. No database needed.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import tracemalloc
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.availability_broadcaster import AvailabilityBroadcaster
+
+SUBSCRIBERS = 10_000
+PUBLISHES = 20
+
+
+async def subscriber(broadcaster: AvailabilityBroadcaster, received: list, done: asyncio.Event) -> None:
+    """Consume a stream the way the endpoint's generator does"""
+    queue = broadcaster.subscribe()
+    try:
+        while True:
+            message = await queue.get()
+            if message is None:
+                break
+            received[0] += 1
+            if received[0] == received[1]:
+                done.set()
+    finally:
+        broadcaster.unsubscribe(queue)
+
+
+async def main():
+    broadcaster = AvailabilityBroadcaster(keepalive_seconds=3600)
+    broadcaster.start()
+    loop = asyncio.get_running_loop()
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    # received[0] counts deliveries, received[1] is the target for the current round
+    received = [0, SUBSCRIBERS]
+    done = asyncio.Event()
+    tasks = [asyncio.create_task(subscriber(broadcaster, received, done)) for _ in range(SUBSCRIBERS)]
+    await asyncio.sleep(0.1)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    used = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    print(f"{len(broadcaster)} idle subscribers: {used / 1024 / 1024:.1f} MiB, {used / SUBSCRIBERS:.0f} bytes each")
+
+    sport = {
+        "sport_key": "padel", "current_count": 0, "max_capacity": 500,
+        "remaining_tickets": 500, "is_available": True, "is_sold_out": False
+    }
+    latencies = []
+    for i in range(PUBLISHES):
+        received[0] = 0
+        done.clear()
+        sport["current_count"] = i + 1
+        sport["remaining_tickets"] = 500 - i - 1
+        started = time.perf_counter()
+        # Published from another thread, like the change bus after a commit
+        await loop.run_in_executor(None, broadcaster.publish, "sport", sport)
+        await done.wait()
+        latencies.append(time.perf_counter() - started)
+
+    latencies.sort()
+    print(f"Fan-out of one change to all subscribers over {PUBLISHES} publishes: "
+          f"median {latencies[len(latencies) // 2] * 1000:.1f} ms, max {latencies[-1] * 1000:.1f} ms")
+
+    await broadcaster.stop()
+    await asyncio.gather(*tasks)
+    print(f"✅ All {SUBSCRIBERS} streams closed on shutdown")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+"""
+Benchmark the XLSX registration export in utils/registration_export.py
+Exports 100k synthetic Jindal registrations with the streaming write-only export,
+then with a regular openpyxl workbook built from ORM objects (how a spreadsheet is
+built from a full query), and reports time and peak RSS for each. Runs against
+DATABASE_URL inside an outer transaction that is rolled back, so no rows are kept.
+"""
+
+import io
+import os
+import sys
+import time
+import resource
+from openpyxl import Workbook
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.database import engine, Base
+from models.jindal_registration_model import JindalRegistrationModel
+from utils.registration_export import iter_xlsx, export_columns, _xlsx_value
+
+ROWS = 100_000
+INSERT_BATCH = 5_000
+
+
+def peak_rss_mib() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def registration(i: int) -> dict:
+    return {
+        'first_name': 'bench',
+        'last_name': f'user{i}',
+        'email': f'xlsx-bench{i}@example.com',
+        'phone': '9999999999',
+        'jgu_student_id': f'XLSXBENCH{i:07d}',
+        'city': 'Sonipat',
+        'state': 'Haryana',
+        'selected_sports': '["pickleball", "padel"]',
+        'pickle_level': 'beginner',
+        'total_amount': 1000,
+        'payment_status': 'completed' if i % 3 else 'pending',
+        'payment_proof': f'https://example.com/payment_proofs/{i}.png',
+        'agreed_to_terms': True
+    }
+
+
+def seed(db: Session) -> None:
+    for start in range(0, ROWS, INSERT_BATCH):
+        db.execute(insert(JindalRegistrationModel), [registration(i) for i in range(start, start + INSERT_BATCH)])
+    db.flush()
+
+
+def run_streaming(db: Session) -> None:
+    before = peak_rss_mib()
+    started = time.perf_counter()
+    size = 0
+    with open(os.devnull, "wb") as sink:
+        for chunk in iter_xlsx(JindalRegistrationModel, db=db):
+            sink.write(chunk)
+            size += len(chunk)
+    elapsed = time.perf_counter() - started
+    print(f"  {'write-only, server-side cursor':<32} {elapsed:>6.2f} s  {size / 1024 / 1024:>5.1f} MiB file  "
+          f"peak RSS {peak_rss_mib():>6.1f} MiB (+{peak_rss_mib() - before:.1f})")
+
+
+def run_in_memory(db: Session) -> None:
+    before = peak_rss_mib()
+    started = time.perf_counter()
+    columns = export_columns(JindalRegistrationModel)
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(columns)
+    for registration in db.query(JindalRegistrationModel).order_by(JindalRegistrationModel.id).all():
+        sheet.append([_xlsx_value(getattr(registration, column)) for column in columns])
+    output = io.BytesIO()
+    workbook.save(output)
+    elapsed = time.perf_counter() - started
+    print(f"  {'regular workbook, full query':<32} {elapsed:>6.2f} s  {len(output.getvalue()) / 1024 / 1024:>5.1f} MiB file  "
+          f"peak RSS {peak_rss_mib():>6.1f} MiB (+{peak_rss_mib() - before:.1f})")
+
+
+def main():
+    Base.metadata.create_all(engine)
+    with engine.connect() as connection:
+        outer = connection.begin()
+        db = Session(bind=connection, join_transaction_mode="create_savepoint")
+        try:
+            seed(db)
+            print(f"Exporting {ROWS} synthetic Jindal registrations (plus any existing rows) to XLSX\n")
+            print(f"  baseline peak RSS {peak_rss_mib():.1f} MiB")
+            # Streaming first: peak RSS only ever grows
+            run_streaming(db)
+            run_in_memory(db)
+        finally:
+            db.close()
+            outer.rollback()
+
+
+if __name__ == "__main__":
+    main()
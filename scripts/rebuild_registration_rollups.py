@@ -0,0 +1,38 @@
+"""
+Rebuild registration_rollups from scratch from the registration tables
+For backfills, or after fixing data by hand. Safe to run while the app is live:
+registration writes wait for the rebuild's transaction instead of being lost.
+Sport buckets come from registration_sports, so run scripts/backfill_registration_sports.py first if it is incomplete.
+"""
+
+import os
+import sys
+import time
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.database import SessionLocal
+from connector.registration_rollups_connector import registration_rollups_connector
+
+def rebuild() -> None:
+    """
+    Replace every bucket in one transaction
+    """
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        written = registration_rollups_connector.rebuild(db)
+        db.commit()
+        print(f"✅ Wrote {written} rollup buckets in {time.perf_counter() - started:.2f}s")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error rebuilding registration_rollups: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    print("🏗️ Rebuilding registration_rollups...")
+    rebuild()
+    print("\n🎉 Rebuild completed!")
@@ -0,0 +1,60 @@
+"""
+Concurrency check for SportsConnector.purchase_tickets
+Fires hundreds of parallel single-ticket purchases at a temporary capacity-50 sport
+and verifies that exactly 50 are sold. Run against a test database (DATABASE_URL).
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.database import SessionLocal, engine, Base
+from models.sports_model import SportsModel
+from connector.sports_connector import sports_connector
+
+CAPACITY = 50
+PURCHASES = 400
+THREADS = 15  # default engine pool size + overflow
+
+
+def purchase(sport_key: str) -> bool:
+    db = SessionLocal()
+    try:
+        success, _, _ = sports_connector.purchase_tickets(db, sport_key, 1)
+        return success
+    finally:
+        db.close()
+
+
+def main():
+    Base.metadata.create_all(engine)
+    sport_key = f"stress-test-{os.getpid()}"
+
+    db = SessionLocal()
+    db.add(SportsModel(sport_name=f"Stress Test {os.getpid()}", sport_key=sport_key, price=0, max_capacity=CAPACITY))
+    db.commit()
+
+    try:
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            results = list(pool.map(purchase, [sport_key] * PURCHASES))
+
+        sold = sum(results)
+        sport = db.query(SportsModel).filter_by(sport_key=sport_key).one()
+        print(f"{PURCHASES} parallel purchases, capacity {CAPACITY}: {sold} succeeded, "
+              f"current_count={sport.current_count}, is_sold_out={sport.is_sold_out}")
+
+        assert sold == CAPACITY, f"expected {CAPACITY} successful purchases, got {sold}"
+        assert sport.current_count == CAPACITY, f"expected current_count {CAPACITY}, got {sport.current_count}"
+        assert sport.is_sold_out and not sport.is_active
+        print("✅ Sold exactly to capacity")
+    finally:
+        db.query(SportsModel).filter_by(sport_key=sport_key).delete()
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,32 +4,83 @@ Email template system for loading HTML templates and filling placeholders
 """
 
 import os
-from typing import Dict, Any
+import re
+import threading
+from typing import Dict, Any, List, Tuple
+
+# {{NAME}} placeholders
+PLACEHOLDER_RE = re.compile(r"\{\{(\w+)\}\}")
+
+class CompiledTemplate:
+    """
+    A template split once into literal text and placeholders.
+    Rendering fills the placeholders and joins the pieces in one pass instead
+    of copying the whole template for every variable.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        # re.split with a group alternates literal, name, literal, ...
+        pieces = PLACEHOLDER_RE.split(source)
+        self.segments: List[str] = []
+        self.placeholders: List[Tuple[int, str]] = []
+        for index, piece in enumerate(pieces):
+            if index % 2:
+                # Placeholders without a value are left in place, as before
+                self.placeholders.append((len(self.segments), piece))
+                self.segments.append(f"{{{{{piece}}}}}")
+            elif piece:
+                self.segments.append(piece)
+
+    def render(self, variables: Dict[str, Any]) -> str:
+        parts = self.segments[:]
+        for index, name in self.placeholders:
+            if name in variables:
+                parts[index] = str(variables[name])
+        return "".join(parts)
 
 class EmailTemplateLoader:
     def __init__(self):
         self.templates_dir = os.path.join(os.path.dirname(__file__), 'html')
+        # template_name -> (file mtime, compiled template)
+        self._cache: Dict[str, Tuple[int, CompiledTemplate]] = {}
+        self._lock = threading.Lock()
         
+    def template_path(self, template_name: str) -> str:
+        return os.path.join(self.templates_dir, f"{template_name}.html")
+
     def load_template(self, template_name: str) -> str:
         """Load HTML template from file"""
-        template_path = os.path.join(self.templates_dir, f"{template_name}.html")
+        template_path = self.template_path(template_name)
         
         if not os.path.exists(template_path):
             raise FileNotFoundError(f"Template not found: {template_path}")
             
         with open(template_path, 'r', encoding='utf-8') as f:
             return f.read()
+
+    def get_template(self, template_name: str) -> CompiledTemplate:
+        """Compiled template, read from disk only the first time and whenever the file changes"""
+        template_path = self.template_path(template_name)
+        try:
+            mtime = os.stat(template_path).st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Template not found: {template_path}")
+
+        cached = self._cache.get(template_name)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with self._lock:
+            cached = self._cache.get(template_name)
+            if cached is None or cached[0] != mtime:
+                cached = (mtime, CompiledTemplate(self.load_template(template_name)))
+                self._cache[template_name] = cached
+            return cached[1]
     
     def fill_template(self, template_name: str, variables: Dict[str, Any]) -> str:
-        """Load template and fill in placeholders"""
-        template = self.load_template(template_name)
-        
-        # Replace placeholders with actual values
-        for key, value in variables.items():
-            placeholder = f"{{{{{key}}}}}"
-            template = template.replace(placeholder, str(value))
-            
-        return template
+        """Fill in the placeholders of a cached template"""
+        return self.get_template(template_name).render(variables)
 
 # Create global instance
 template_loader = EmailTemplateLoader()
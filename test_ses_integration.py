@@ -81,9 +81,7 @@ def test_registration_with_email():
             print("✅ Registration with email endpoint working")
             print(f"Registration ID: {result.get('id')}")
             print(f"Booking ID: {result.get('booking_id')}")
-            print(f"Email sent: {result.get('email_sent')}")
-            if result.get('email_error'):
-                print(f"Email error: {result.get('email_error')}")
+            print(f"Email queued: {result.get('email_sent')}")
         else:
             print(f"❌ Registration with email endpoint failed: {response.status_code}")
             print(f"Response: {response.text}")
@@ -114,9 +112,7 @@ def test_jindal_registration_with_email():
             print("✅ Jindal registration with email endpoint working")
             print(f"Registration ID: {result.get('id')}")
             print(f"JGU Student ID: {result.get('jgu_student_id')}")
-            print(f"Email sent: {result.get('email_sent')}")
-            if result.get('email_error'):
-                print(f"Email error: {result.get('email_error')}")
+            print(f"Email queued: {result.get('email_sent')}")
         else:
             print(f"❌ Jindal registration with email endpoint failed: {response.status_code}")
             print(f"Response: {response.text}")
@@ -0,0 +1,147 @@
+import os
+import json
+import signal
+import asyncio
+import logging
+from typing import Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Messages buffered per subscriber before it is considered too slow and disconnected
+SUBSCRIBER_QUEUE_SIZE = int(os.environ.get("SSE_SUBSCRIBER_QUEUE_SIZE", "32"))
+# Comment line sent to every subscriber so proxies keep idle streams open
+KEEPALIVE_SECONDS = float(os.environ.get("SSE_KEEPALIVE_SECONDS", "15"))
+# Longest a stream stays open; the client reconnects and gets a fresh snapshot
+MAX_STREAM_SECONDS = float(os.environ.get("SSE_MAX_STREAM_SECONDS", "300"))
+# How long EventSource waits before reconnecting after a stream ends
+RETRY_MILLISECONDS = int(os.environ.get("SSE_RETRY_MILLISECONDS", "3000"))
+# Signals that start a server shutdown
+SHUTDOWN_SIGNALS = (signal.SIGTERM, signal.SIGINT)
+
+KEEPALIVE_MESSAGE = b": keepalive\n\n"
+RETRY_MESSAGE = f"retry: {RETRY_MILLISECONDS}\n\n".encode("utf-8")
+
+
+def format_sse(event: str, data: dict) -> bytes:
+    """Encode one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode("utf-8")
+
+
+class AvailabilityBroadcaster:
+    """
+    Pushes sports availability changes to every open /sports/stream connection
+    of this worker.
+
+    Committed changes arrive through the change bus from any thread; the message is
+    serialized once and handed to the event loop, which appends the same bytes to
+    each subscriber's queue. Subscribers that fall behind are disconnected and
+    resync on reconnect (EventSource reconnects on its own) instead of buffering
+    without bound. One keepalive task serves all subscribers.
+
+    uvicorn waits for open responses to finish before running the lifespan
+    shutdown, so streams can't be ended from there. Instead start() chains onto
+    the shutdown signals and ends every stream as soon as shutdown begins, and
+    callers cap each stream at MAX_STREAM_SECONDS in case that never fires.
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE, keepalive_seconds: float = KEEPALIVE_SECONDS):
+        self.queue_size = queue_size
+        self.keepalive_seconds = keepalive_seconds
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._keepalive: Optional[asyncio.Task] = None
+        self._previous_handlers: Dict[int, object] = {}
+        self.closing = False
+
+    def start(self) -> None:
+        """Bind to the running event loop (called from the app lifespan)"""
+        self.closing = False
+        self._loop = asyncio.get_running_loop()
+        self._keepalive = self._loop.create_task(self._keepalive_loop())
+        try:
+            for signum in SHUTDOWN_SIGNALS:
+                self._previous_handlers[signum] = signal.signal(signum, self._on_shutdown_signal)
+        except ValueError:
+            # Not on the main thread (e.g. under a test client); stop() still ends the streams
+            logger.debug("Availability streams are not closed on shutdown signals")
+
+    async def stop(self) -> None:
+        for signum, handler in self._previous_handlers.items():
+            signal.signal(signum, handler)
+        self._previous_handlers = {}
+        if self._keepalive is not None:
+            self._keepalive.cancel()
+            try:
+                await self._keepalive
+            except asyncio.CancelledError:
+                pass
+            self._keepalive = None
+        self._close_streams()
+        self._loop = None
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a connection; it receives message bytes, then None when it must close"""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        if self.closing:
+            queue.put_nowait(None)
+            return queue
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def publish(self, event: str, data: dict) -> None:
+        """Broadcast an event; safe to call from any thread"""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        message = format_sse(event, data)
+        try:
+            loop.call_soon_threadsafe(self._fanout, message)
+        except RuntimeError:
+            # Loop shut down between the check and the call
+            pass
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def _fanout(self, message: bytes) -> None:
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                logger.info("Disconnecting slow availability stream subscriber")
+                self._disconnect(queue)
+
+    def _close_streams(self) -> None:
+        """End every open stream and any opened from now on"""
+        self.closing = True
+        for queue in list(self._subscribers):
+            self._disconnect(queue)
+
+    def _on_shutdown_signal(self, signum, frame) -> None:
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            logger.info("Shutting down: closing availability streams")
+            loop.call_soon_threadsafe(self._close_streams)
+        previous = self._previous_handlers.get(signum)
+        if callable(previous):
+            previous(signum, frame)
+        elif previous == signal.SIG_DFL:
+            signal.signal(signum, signal.SIG_DFL)
+            signal.raise_signal(signum)
+
+    def _disconnect(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    async def _keepalive_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.keepalive_seconds)
+            self._fanout(KEEPALIVE_MESSAGE)
+
+# Create global instance
+availability_broadcaster = AvailabilityBroadcaster()
@@ -0,0 +1,83 @@
+import os
+import threading
+import logging
+import boto3
+from botocore.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Connections each client keeps open; uploads and sends run on many threadpool threads at once
+AWS_MAX_POOL_CONNECTIONS = int(os.environ.get("AWS_MAX_POOL_CONNECTIONS", "32"))
+# botocore waits 60 s by default on each, which can pin a worker for minutes across retries
+AWS_CONNECT_TIMEOUT_SECONDS = float(os.environ.get("AWS_CONNECT_TIMEOUT_SECONDS", "5"))
+AWS_READ_TIMEOUT_SECONDS = float(os.environ.get("AWS_READ_TIMEOUT_SECONDS", "20"))
+# Attempts per call, including the first; "standard" retries throttling and transient errors with jittered backoff
+AWS_MAX_ATTEMPTS = int(os.environ.get("AWS_MAX_ATTEMPTS", "3"))
+AWS_RETRY_MODE = os.environ.get("AWS_RETRY_MODE", "standard")
+
+AWS_CLIENT_CONFIG = Config(
+    max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+    connect_timeout=AWS_CONNECT_TIMEOUT_SECONDS,
+    read_timeout=AWS_READ_TIMEOUT_SECONDS,
+    retries={"total_max_attempts": AWS_MAX_ATTEMPTS, "mode": AWS_RETRY_MODE},
+    tcp_keepalive=True
+)
+
+class AWSClientFactory:
+    """
+    One boto3 client per service and region for the whole process.
+
+    Building a client resolves the endpoint, walks the credential chain and
+    loads the service model, which costs more than many of the calls made
+    with it, and a fresh client also starts with no open connections.
+    Clients are thread-safe once built, so every request shares the same
+    one and reuses its connection pool. Only construction is serialised,
+    since boto3 sessions are not thread-safe.
+    """
+
+    def __init__(self, config: Config = AWS_CLIENT_CONFIG):
+        self.config = config
+        self._lock = threading.Lock()
+        self._session = None
+        self._clients = {}
+
+    def client(self, service_name: str, region_name: str = None):
+        """Shared client for a service, created on first use"""
+        key = (service_name, region_name)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                if self._session is None:
+                    self._session = boto3.session.Session()
+                client = self._session.client(
+                    service_name,
+                    region_name=region_name,
+                    aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
+                    aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY'),
+                    config=self.config
+                )
+                self._clients[key] = client
+                logger.info(f"Created AWS {service_name} client")
+            return client
+
+    def s3(self):
+        return self.client('s3')
+
+    def ses(self):
+        return self.client('ses', os.environ.get('AWS_REGION', 'ap-south-1'))
+
+    def sesv2(self):
+        return self.client('sesv2', os.environ.get('AWS_REGION', 'ap-south-1'))
+
+    def reset(self) -> None:
+        """Drop every client, e.g. after rotating credentials; the next call builds new ones"""
+        with self._lock:
+            self._clients = {}
+            self._session = None
+
+# Create global instance
+aws_clients = AWSClientFactory()
@@ -0,0 +1,68 @@
+import string
+import threading
+import logging
+from sqlalchemy import Sequence, select
+from db.database import Base, engine
+
+logger = logging.getLogger(__name__)
+
+# Same alphabet and length as the original random booking IDs
+ALPHABET = string.ascii_uppercase + string.digits
+ID_LENGTH = 8
+ID_SPACE = len(ALPHABET) ** ID_LENGTH
+
+# Each nextval() reserves a block of this many IDs for one worker
+BLOCK_SIZE = 100
+
+# Affine permutation of the ID space. The multiplier (~0.618 of the space) is
+# coprime with 36 so the mapping is a bijection: distinct sequence values always
+# give distinct IDs, while consecutive registrations get unrelated-looking IDs.
+MULTIPLIER = 1_743_541_808_669
+OFFSET = 917_382_640_451
+
+booking_id_sequence = Sequence("booking_id_seq", start=1, increment=BLOCK_SIZE, metadata=Base.metadata)
+
+
+def encode_booking_id(value: int) -> str:
+    """Map a sequence value to an 8-character base36 booking ID"""
+    n = (value * MULTIPLIER + OFFSET) % ID_SPACE
+    chars = []
+    for _ in range(ID_LENGTH):
+        n, digit = divmod(n, len(ALPHABET))
+        chars.append(ALPHABET[digit])
+    return ''.join(reversed(chars))
+
+
+class BookingIdGenerator:
+    """
+    Hands out booking IDs derived from the booking_id_seq Postgres sequence.
+
+    The sequence increments by BLOCK_SIZE, so a single nextval() reserves a whole
+    block for this process and the next BLOCK_SIZE IDs need no database access.
+    IDs are unique across workers and both registration tables without a lookup;
+    the unique constraint on booking_id remains as a safety net.
+    """
+
+    def __init__(self, block_size: int = BLOCK_SIZE):
+        self.block_size = block_size
+        self._next = 0
+        self._end = 0
+        self._lock = threading.Lock()
+
+    def next_id(self) -> str:
+        with self._lock:
+            if self._next >= self._end:
+                self._next = self._reserve_block()
+                self._end = self._next + self.block_size
+            value = self._next
+            self._next += 1
+        return encode_booking_id(value)
+
+    def _reserve_block(self) -> int:
+        with engine.connect() as connection:
+            start = connection.execute(select(booking_id_sequence.next_value())).scalar()
+        logger.info(f"Reserved booking ID block {start}-{start + self.block_size - 1}")
+        return start
+
+# Create global instance
+booking_id_generator = BookingIdGenerator()
@@ -0,0 +1,145 @@
+import os
+import json
+import select
+import socket
+import threading
+import logging
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+from sqlalchemy import event, func
+from sqlalchemy import select as sql_select
+from sqlalchemy.orm import Session
+
+from db.database import engine
+
+logger = logging.getLogger(__name__)
+
+CHANGES_CHANNEL = os.environ.get("CHANGES_CHANNEL", "alldays_changes")
+
+# Change kinds
+SPORT_CHANGED = "sport"
+REGISTRATION_COUNTS_CHANGED = "registration-counts"
+JINDAL_SUMMARY_CHANGED = "jindal-summary"
+EMAIL_QUEUED = "email-queued"
+EMAIL_BROADCAST_CHANGED = "email-broadcast"
+
+# Identifies this worker so its listener skips changes it already applied
+ORIGIN = f"{socket.gethostname()}:{os.getpid()}"
+
+_PENDING_KEY = "pending_changes"
+
+
+class ChangeBus:
+    """
+    Cross-worker change notifications over Postgres LISTEN/NOTIFY.
+
+    Writers call notify() inside their transaction. Postgres delivers the
+    NOTIFY to every listening worker only if the transaction commits, and this
+    worker applies the change locally right after its own commit. Each worker
+    runs one listener thread on a dedicated connection that hands other
+    workers' changes to the handlers registered with subscribe(), e.g. cache
+    invalidation and the live availability stream.
+    """
+
+    def __init__(self, channel: str = CHANGES_CHANNEL, reconnect_delay: float = 5.0):
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self._handlers: Dict[str, List[Callable[[dict], None]]] = defaultdict(list)
+        self._reconnect_handlers: List[Callable[[], None]] = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def subscribe(self, kind: str, handler: Callable[[dict], None]) -> None:
+        """Call handler(data) for every committed change of this kind, local or remote"""
+        self._handlers[kind].append(handler)
+
+    def on_reconnect(self, handler: Callable[[], None]) -> None:
+        """Call handler after the listener reconnects, since changes may have been missed"""
+        self._reconnect_handlers.append(handler)
+
+    def notify(self, db: Session, kind: str, data: dict) -> None:
+        """Queue a change in the session's transaction; nothing is delivered unless it commits"""
+        payload = json.dumps({"origin": ORIGIN, "kind": kind, "data": data}, separators=(",", ":"))
+        db.execute(sql_select(func.pg_notify(self.channel, payload)))
+        db.info.setdefault(_PENDING_KEY, []).append((kind, data))
+
+    def dispatch(self, kind: str, data: dict) -> None:
+        for handler in self._handlers.get(kind, ()):
+            try:
+                handler(data)
+            except Exception as e:
+                logger.error(f"Change handler for '{kind}' failed: {e}", exc_info=True)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="change-bus-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.reconnect_delay)
+            self._thread = None
+
+    def _run(self) -> None:
+        first = True
+        while not self._stop.is_set():
+            try:
+                self._listen(first)
+            except Exception as e:
+                logger.error(f"Change listener lost its connection: {e}", exc_info=True)
+            first = False
+            self._stop.wait(self.reconnect_delay)
+
+    def _listen(self, first: bool) -> None:
+        # A dedicated connection, detached so it doesn't occupy a pool slot for the worker's lifetime
+        fairy = engine.raw_connection()
+        fairy.detach()
+        connection = fairy.dbapi_connection
+        try:
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            logger.info(f"Listening for changes on '{self.channel}' as {ORIGIN}")
+
+            if not first:
+                for handler in self._reconnect_handlers:
+                    handler()
+
+            while not self._stop.is_set():
+                # Wake up periodically to notice stop()
+                if select.select([connection], [], [], 1.0) == ([], [], []):
+                    continue
+                connection.poll()
+                while connection.notifies:
+                    self._receive(connection.notifies.pop(0).payload)
+        finally:
+            connection.close()
+
+    def _receive(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except json.JSONDecodeError:
+            logger.warning(f"Ignoring malformed change notification: {payload[:200]}")
+            return
+        if message.get("origin") == ORIGIN:
+            return
+        self.dispatch(message.get("kind"), message.get("data") or {})
+
+# Create global instance
+change_bus = ChangeBus()
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_local_changes(session: Session) -> None:
+    """Apply this worker's own changes as soon as their transaction commits"""
+    for kind, data in session.info.pop(_PENDING_KEY, ()):
+        change_bus.dispatch(kind, data)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_local_changes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,335 @@
+import os
+import json
+import time
+import threading
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from db.database import SessionLocal
+from models.email_outbox_model import EmailOutboxModel
+from connector.email_outbox_connector import email_outbox_connector
+from connector.email_broadcast_connector import email_broadcast_connector, EMAIL_BROADCAST_RATE_FRACTION
+from utils.email_utils import ses_email_service, SESThrottlingError
+
+logger = logging.getLogger(__name__)
+
+# Emails claimed per round trip
+EMAIL_DISPATCH_BATCH_SIZE = int(os.environ.get("EMAIL_DISPATCH_BATCH_SIZE", "20"))
+# Poll interval for retries coming due; new emails wake the dispatcher straight away
+EMAIL_DISPATCH_INTERVAL_SECONDS = float(os.environ.get("EMAIL_DISPATCH_INTERVAL_SECONDS", "5"))
+# Concurrent SES calls per worker
+EMAIL_DISPATCH_WORKERS = int(os.environ.get("EMAIL_DISPATCH_WORKERS", "4"))
+# Share of the account's MaxSendRate this worker may use; the quota is per account, not per worker.
+# While a broadcast runs, each worker's share shrinks so the broadcast's fraction is left free.
+EMAIL_SEND_RATE_FRACTION = float(os.environ.get(
+    "EMAIL_SEND_RATE_FRACTION", str(1 / max(1, int(os.environ.get("WEB_CONCURRENCY", "1"))))
+))
+# How often the live SES quota is re-read
+EMAIL_QUOTA_REFRESH_SECONDS = float(os.environ.get("EMAIL_QUOTA_REFRESH_SECONDS", "300"))
+# Rate used until the quota has been read (the SES sandbox rate)
+EMAIL_DEFAULT_SEND_RATE = 1.0
+# Pause after SES throttles a send, and delay before the throttled email is retried
+EMAIL_THROTTLE_PAUSE_SECONDS = 1.0
+# Window for the reported sustained throughput
+THROUGHPUT_WINDOW_SECONDS = 60.0
+
+# Send method for each email_type; the outbox payload holds its keyword arguments
+EMAIL_SENDERS = {
+    EmailOutboxModel.EVENT_CONFIRMATION: ses_email_service.send_confirmation_email,
+    EmailOutboxModel.JINDAL_CONFIRMATION: ses_email_service.send_jindal_confirmation_email,
+}
+
+class SendRateLimiter:
+    """
+    Token bucket sized from the SES sending quota.
+    Refills at the permitted sends per second but holds a single token, so
+    sends are spaced evenly and no one second window carries more than the
+    permitted rate (a second of burst on top of the refill would let twice
+    the rate through). Hands out no tokens once the 24 hour quota is used
+    up, until a quota refresh shows room again.
+    """
+
+    def __init__(self, rate: float = EMAIL_DEFAULT_SEND_RATE):
+        self._lock = threading.Lock()
+        self.rate = rate
+        self.capacity = 1.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self.daily_remaining: Optional[int] = None  # None: unknown or unlimited
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether the 24 hour quota is used up"""
+        return self.daily_remaining is not None and self.daily_remaining <= 0
+
+    def configure(self, rate: float, daily_remaining: Optional[int]) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+            self.daily_remaining = daily_remaining
+
+    def exhaust(self) -> None:
+        """Hand out no tokens until the next quota refresh, after SES reported the daily quota used up"""
+        with self._lock:
+            self.daily_remaining = 0
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for a while, after SES throttled a send"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+    def try_acquire(self) -> Optional[float]:
+        """
+        Take a token if one is available
+        Returns: 0 if taken, seconds until the next token, or None if the daily quota is used up
+        """
+        with self._lock:
+            if self.exhausted:
+                return None
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            self._refill(now)
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                if self.daily_remaining is not None:
+                    self.daily_remaining -= 1
+                return 0.0
+            return (1.0 - self._tokens) / self.rate
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+class EmailDispatcher:
+    """
+    Background thread that drains the email outbox.
+    Every worker runs one; claims use SKIP LOCKED, so dispatchers share the
+    queue without sending an email twice. Sends run in parallel on a bounded
+    pool, paced by a token bucket sized from the live SES quota and from
+    whether a broadcast is taking its share of it, and no database
+    connection is held while SES is being called. Sends that SES
+    throttles go back to the outbox without using up an attempt.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = EMAIL_DISPATCH_BATCH_SIZE,
+        interval: float = EMAIL_DISPATCH_INTERVAL_SECONDS,
+        workers: int = EMAIL_DISPATCH_WORKERS,
+        rate_fraction: float = EMAIL_SEND_RATE_FRACTION,
+        quota_refresh_seconds: float = EMAIL_QUOTA_REFRESH_SECONDS
+    ):
+        self.batch_size = batch_size
+        self.interval = interval
+        self.workers = workers
+        self.rate_fraction = rate_fraction
+        self.quota_refresh_seconds = quota_refresh_seconds
+        self.rate_limiter = SendRateLimiter()
+        self._slots = threading.BoundedSemaphore(workers)
+        self._pool = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+        self._quota_checked = 0.0
+        self._stats_lock = threading.Lock()
+        self._sent_times = deque()
+        self.in_flight = 0
+        self.sent = 0
+        self.failed_attempts = 0
+        self.throttled = 0
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="email-send")
+        self._thread = threading.Thread(target=self._run, name="email-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+        if self._pool is not None:
+            # Lets in-flight sends record their outcome
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def wake(self, data: dict = None) -> None:
+        """Check the outbox now (a change bus handler for EMAIL_QUEUED)"""
+        self._wake.set()
+
+    def refresh_soon(self, data: dict = None) -> None:
+        """Re-size the token bucket now (a change bus handler for EMAIL_BROADCAST_CHANGED)"""
+        self._quota_checked = 0.0
+        self._wake.set()
+
+    def stats(self) -> dict:
+        """Counters of this worker's dispatcher"""
+        with self._stats_lock:
+            self._trim_sent_times(time.monotonic())
+            throughput = len(self._sent_times) / THROUGHPUT_WINDOW_SECONDS
+            return {
+                "sent": self.sent,
+                "failed_attempts": self.failed_attempts,
+                "throttled": self.throttled,
+                "throughput_per_second": round(throughput, 3),
+                "in_flight": self.in_flight,
+                "send_rate_limit": self.rate_limiter.rate,
+                "daily_remaining": self.rate_limiter.daily_remaining
+            }
+
+    def refresh_quota(self) -> None:
+        """Size the token bucket from the live SES quota, keeping the last values if it can't be read"""
+        self._quota_checked = time.monotonic()
+        quota = ses_email_service.get_sending_limits()
+        if not quota:
+            return
+        rate_fraction = self.rate_fraction
+        if self._broadcast_running():
+            rate_fraction *= 1 - EMAIL_BROADCAST_RATE_FRACTION
+        rate = max(0.1, quota['max_send_rate'] * rate_fraction)
+        # A negative Max24HourSend means no daily limit
+        daily_remaining = None
+        if quota['max_24_hour_send'] >= 0:
+            daily_remaining = int((quota['max_24_hour_send'] - quota['sent_last_24_hours']) * self.rate_fraction)
+        self.rate_limiter.configure(rate, daily_remaining)
+        logger.info(f"Email send rate set to {rate:.2f}/s, daily remaining {daily_remaining}")
+
+    def _broadcast_running(self) -> bool:
+        db = SessionLocal()
+        try:
+            return email_broadcast_connector.is_running(db)
+        except Exception as e:
+            # Assume one is, so the account rate is never overrun
+            logger.error(f"Could not check for running email broadcasts: {e}", exc_info=True)
+            return True
+        finally:
+            db.close()
+
+    def dispatch_due(self) -> int:
+        """
+        Claim one batch of due emails and hand each to the send pool at the permitted rate
+        Returns the number of emails claimed
+        """
+        db = SessionLocal()
+        try:
+            claimed = email_outbox_connector.claim_due(db, self.batch_size)
+        finally:
+            db.close()
+
+        for index, row in enumerate(claimed):
+            if not self._wait_for_send_slot():
+                # Stopping, or out of daily quota: give the rest back untouched
+                self._requeue(claimed[index:], 0 if self._stop.is_set() else self.quota_refresh_seconds, "Not sent: dispatcher paused")
+                break
+            with self._stats_lock:
+                self.in_flight += 1
+            self._pool.submit(self._send, *row)
+        return len(claimed)
+
+    def _wait_for_send_slot(self) -> bool:
+        """Block until a worker is free and the rate limiter allows a send"""
+        while not self._slots.acquire(timeout=0.5):
+            if self._stop.is_set():
+                return False
+        while not self._stop.is_set():
+            wait = self.rate_limiter.try_acquire()
+            if wait is None:
+                break
+            if wait == 0:
+                return True
+            self._stop.wait(wait)
+        self._slots.release()
+        return False
+
+    def _send(self, outbox_id: int, email_type: str, recipient_email: str, payload: str, attempts: int) -> None:
+        db = SessionLocal()
+        try:
+            sender = EMAIL_SENDERS.get(email_type)
+            try:
+                if sender is None:
+                    raise ValueError(f"Unknown email type '{email_type}'")
+                sent = sender(recipient_email=recipient_email, **json.loads(payload))
+                error = None if sent else "SES send failed; see worker logs"
+            except SESThrottlingError as e:
+                with self._stats_lock:
+                    self.throttled += 1
+                if e.daily_quota_exceeded:
+                    # Sending resumes once a quota refresh shows room again
+                    logger.warning("SES daily sending quota used up; pausing email dispatch until the next quota refresh")
+                    self.rate_limiter.exhaust()
+                    delay = self.quota_refresh_seconds
+                else:
+                    self.rate_limiter.pause(EMAIL_THROTTLE_PAUSE_SECONDS)
+                    delay = EMAIL_THROTTLE_PAUSE_SECONDS
+                email_outbox_connector.requeue(db, outbox_id, delay, f"Throttled by SES: {e}"[:2000])
+                return
+            except Exception as e:
+                logger.error(f"Error sending outbox email {outbox_id}: {e}", exc_info=True)
+                error = str(e) or type(e).__name__
+
+            if error is None:
+                email_outbox_connector.mark_sent(db, outbox_id)
+                with self._stats_lock:
+                    now = time.monotonic()
+                    self.sent += 1
+                    self._sent_times.append(now)
+                    self._trim_sent_times(now)
+                return
+
+            with self._stats_lock:
+                self.failed_attempts += 1
+            if email_outbox_connector.mark_attempt_failed(db, outbox_id, attempts, error):
+                logger.warning(f"Outbox email {outbox_id} to {recipient_email} failed (attempt {attempts}), will retry")
+            else:
+                logger.error(f"Giving up on outbox email {outbox_id} to {recipient_email} after {attempts} attempts: {error}")
+        except Exception as e:
+            # The lease runs out and the email is retried
+            logger.error(f"Could not record outcome of outbox email {outbox_id}: {e}", exc_info=True)
+        finally:
+            db.close()
+            with self._stats_lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+    def _requeue(self, rows, delay_seconds: float, reason: str) -> None:
+        db = SessionLocal()
+        try:
+            for row in rows:
+                email_outbox_connector.requeue(db, row[0], delay_seconds, reason)
+        except Exception as e:
+            logger.error(f"Could not requeue outbox emails: {e}", exc_info=True)
+        finally:
+            db.close()
+
+    def _trim_sent_times(self, now: float) -> None:
+        while self._sent_times and self._sent_times[0] < now - THROUGHPUT_WINDOW_SECONDS:
+            self._sent_times.popleft()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            if time.monotonic() - self._quota_checked >= self.quota_refresh_seconds:
+                self.refresh_quota()
+            if self.rate_limiter.exhausted:
+                # Nothing can be sent until the quota refresh shows room again
+                self._stop.wait(self.interval)
+                continue
+            try:
+                claimed = self.dispatch_due()
+            except Exception as e:
+                logger.error(f"Email dispatch failed: {e}", exc_info=True)
+                claimed = 0
+            # A full batch means more may be due already
+            if claimed < self.batch_size:
+                self._wake.wait(self.interval)
+
+# Create global instance
+email_dispatcher = EmailDispatcher()
@@ -1,24 +1,49 @@
-import boto3
 import os
+import json
+import time
 import logging
+import threading
+from itertools import islice
 from botocore.exceptions import NoCredentialsError, ClientError
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Optional
+from typing import Optional, Any, Iterable, Iterator, List, Tuple
 from templates.email_templates import template_loader
+from utils.aws_clients import aws_clients
 
 logger = logging.getLogger(__name__)
 
+# ClientError codes SES uses when the sending rate or daily quota is exceeded
+SES_THROTTLING_CODES = {'Throttling', 'ThrottlingException', 'TooManyRequestsException'}
+# Message of a Throttling error once the 24 hour quota is used up; retrying before the quota refreshes is pointless
+SES_DAILY_QUOTA_MESSAGE = 'Daily message quota exceeded'
+
+# SendBulkTemplatedEmail takes at most this many destinations per call
+BULK_MAX_DESTINATIONS = 50
+# Per-destination bulk statuses that are sent again after a pause
+BULK_RETRYABLE_STATUSES = {'AccountThrottled', 'TransientFailure'}
+# Per-destination bulk status once the 24 hour quota is used up
+BULK_QUOTA_STATUSES = {'AccountDailyQuotaExceeded'}
+BULK_MAX_RETRIES = 4
+BULK_RETRY_PAUSE_SECONDS = 2.0
+# Prefix of the stored SES templates made from templates/html
+SES_TEMPLATE_PREFIX = os.environ.get('SES_TEMPLATE_PREFIX', 'alldays')
+
+class SESThrottlingError(Exception):
+    """SES refused a send because of the account's sending rate or daily quota; retry later"""
+
+    @property
+    def daily_quota_exceeded(self) -> bool:
+        return SES_DAILY_QUOTA_MESSAGE.lower() in str(self).lower()
+
 class SESEmailService:
     def __init__(self):
-        self.ses_client = boto3.client(
-            'ses',
-            aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY'),
-            region_name=os.environ.get('AWS_REGION', 'ap-south-1')
-        )
+        self.ses_client = aws_clients.ses()
         self.sender_email = os.environ.get('SES_SENDER_EMAIL', 'alldaysapp@gmail.com')
         self.verified_emails = os.environ.get('SES_VERIFIED_EMAILS', '').split(',') if os.environ.get('SES_VERIFIED_EMAILS') else []
+        # template_name -> (compiled template, text part) last uploaded to SES
+        self._synced_templates = {}
+        self._templates_lock = threading.Lock()
 
     def send_confirmation_email(self, 
                                recipient_email: str, 
@@ -31,6 +56,7 @@ class SESEmailService:
                                orangetheory_batch: Optional[str] = None) -> bool:
         """
         Send confirmation email for event registration
+        Returns False if the email could not be sent; raises SESThrottlingError when SES is throttling
         """
         try:
             # Create email content
@@ -130,6 +156,8 @@ This is an automated email. Please do not reply to this address.
             logger.error("AWS credentials not found for SES")
             return False
         except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in SES_THROTTLING_CODES:
+                raise SESThrottlingError(str(e)) from e
             logger.error(f"SES error: {e}")
             return False
         except Exception as e:
@@ -148,6 +176,7 @@ This is an automated email. Please do not reply to this address.
                                       pickle_level: Optional[str] = None) -> bool:
         """
         Send confirmation email for Jindal registration
+        Returns False if the email could not be sent; raises SESThrottlingError when SES is throttling
         """
         try:
             # Create email content
@@ -249,6 +278,8 @@ This is an automated email. Please do not reply to this address.
             logger.error("AWS credentials not found for SES")
             return False
         except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in SES_THROTTLING_CODES:
+                raise SESThrottlingError(str(e)) from e
             logger.error(f"SES error: {e}")
             return False
         except Exception as e:
@@ -267,21 +298,123 @@ This is an automated email. Please do not reply to this address.
             logger.error(f"Error verifying email {email}: {e}")
             return False
 
+    def sync_template(self, template_name: str, text_part: Optional[str] = None) -> str:
+        """
+        Store a local HTML template in SES for bulk sends, uploading it again only when the file changes
+        Its subject is the SUBJECT placeholder, so one stored template serves every broadcast.
+        Returns: the SES template name
+        """
+        compiled = template_loader.get_template(template_name)
+        ses_template_name = f"{SES_TEMPLATE_PREFIX}-{template_name}"
+        with self._templates_lock:
+            if self._synced_templates.get(template_name) == (compiled, text_part):
+                return ses_template_name
+
+            template = {
+                'TemplateName': ses_template_name,
+                'SubjectPart': '{{SUBJECT}}',
+                'HtmlPart': compiled.source
+            }
+            if text_part:
+                template['TextPart'] = text_part
+            try:
+                self.ses_client.update_template(Template=template)
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code') != 'TemplateDoesNotExist':
+                    raise
+                self.ses_client.create_template(Template=template)
+            self._synced_templates[template_name] = (compiled, text_part)
+            logger.info(f"Stored SES template {ses_template_name}")
+        return ses_template_name
+
+    def send_bulk_templated_emails(self,
+                                   template_name: str,
+                                   recipients: Iterable[Tuple[Any, str, dict]],
+                                   default_data: dict,
+                                   text_part: Optional[str] = None,
+                                   send_rate: Optional[float] = None) -> Iterator[Tuple[list, List[Tuple[str, Optional[str]]]]]:
+        """
+        Send a template to many recipients with SendBulkTemplatedEmail, BULK_MAX_DESTINATIONS per call
+        recipients yields (key, recipient_email, template_data) and is read one chunk at a time, so it
+        can stream from a query. Calls are spaced to stay under send_rate emails per second, and
+        destinations SES throttles are sent again after a pause.
+        Yields: (chunk, statuses) after each call, statuses[i] being (status, error) for chunk[i]
+        and 'Success' when SES accepted it
+        Raises SESThrottlingError if SES keeps throttling the call, ClientError if it fails outright
+        """
+        ses_template_name = self.sync_template(template_name, text_part)
+        default_template_data = json.dumps(default_data)
+        recipients = iter(recipients)
+        while True:
+            chunk = list(islice(recipients, BULK_MAX_DESTINATIONS))
+            if not chunk:
+                return
+            started = time.monotonic()
+            statuses = self._send_bulk_chunk(ses_template_name, default_template_data, chunk)
+            if send_rate:
+                time.sleep(max(0.0, len(chunk) / send_rate - (time.monotonic() - started)))
+            yield chunk, statuses
+
+    def _send_bulk_chunk(self, ses_template_name: str, default_template_data: str, chunk: list) -> List[Tuple[str, Optional[str]]]:
+        statuses = [None] * len(chunk)
+        pending = list(range(len(chunk)))
+        for attempt in range(BULK_MAX_RETRIES + 1):
+            if attempt:
+                time.sleep(BULK_RETRY_PAUSE_SECONDS * attempt)
+            try:
+                response = self.ses_client.send_bulk_templated_email(
+                    Source=self.sender_email,
+                    Template=ses_template_name,
+                    DefaultTemplateData=default_template_data,
+                    Destinations=[
+                        {
+                            'Destination': {'ToAddresses': [chunk[i][1]]},
+                            'ReplacementTemplateData': json.dumps(chunk[i][2])
+                        }
+                        for i in pending
+                    ]
+                )
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code') not in SES_THROTTLING_CODES:
+                    raise
+                if attempt == BULK_MAX_RETRIES or SES_DAILY_QUOTA_MESSAGE.lower() in str(e).lower():
+                    raise SESThrottlingError(str(e)) from e
+                logger.warning(f"SES throttled a bulk send of {len(pending)} emails, retrying")
+                continue
+
+            retry = []
+            for i, status in zip(pending, response['Status']):
+                statuses[i] = (status['Status'], status.get('Error'))
+                if status['Status'] in BULK_RETRYABLE_STATUSES:
+                    retry.append(i)
+            pending = retry
+            if not pending:
+                break
+        return statuses
+
+    def get_sending_limits(self) -> dict:
+        """
+        MaxSendRate and the 24 hour quota from GetSendQuota alone, for pacing sends
+        Returns {} if they can't be read.
+        """
+        try:
+            quota_response = self.ses_client.get_send_quota()
+            return {
+                'max_24_hour_send': quota_response['Max24HourSend'],
+                'sent_last_24_hours': quota_response['SentLast24Hours'],
+                'max_send_rate': quota_response['MaxSendRate']
+            }
+        except Exception as e:
+            logger.error(f"Error getting SES sending limits: {e}")
+            return {}
+
     def get_send_quota(self) -> dict:
         """
         Get SES sending quota information using SES v2 API
         """
         try:
-            # Use SES v2 client for better account information
-            ses_v2_client = boto3.client(
-                'sesv2',
-                aws_access_key_id=os.environ.get('AWS_ACCESS_KEY_ID'),
-                aws_secret_access_key=os.environ.get('AWS_SECRET_ACCESS_KEY'),
-                region_name=os.environ.get('AWS_REGION', 'ap-south-1')
-            )
-            
             # Get account information using SES v2
-            account_response = ses_v2_client.get_account()
+            account_response = aws_clients.sesv2().get_account()
             
             # Get quota information using SES v1 (for compatibility)
             quota_response = self.ses_client.get_send_quota()
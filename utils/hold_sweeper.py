@@ -0,0 +1,45 @@
+import threading
+import logging
+from db.database import SessionLocal
+from connector.ticket_hold_connector import ticket_hold_connector
+
+logger = logging.getLogger(__name__)
+
+class HoldSweeper:
+    """
+    Background thread that returns tickets from expired holds to sale.
+    Every worker runs one; the release statement is atomic, so sweepers never
+    release the same hold twice.
+    """
+
+    def __init__(self, interval: float = 15.0):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ticket-hold-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            db = SessionLocal()
+            try:
+                ticket_hold_connector.release_expired(db)
+            except Exception as e:
+                logger.error(f"Ticket hold sweep failed: {e}", exc_info=True)
+                db.rollback()
+            finally:
+                db.close()
+
+# Create global instance
+hold_sweeper = HoldSweeper()
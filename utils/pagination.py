@@ -0,0 +1,28 @@
+import json
+import base64
+from datetime import datetime
+from typing import Any, List
+
+# Upper bound for the limit parameter of paginated endpoints
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque cursor for the sort key of the last row on a page"""
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """
+    Values encoded by encode_cursor; datetimes come back as ISO strings
+    Raises ValueError for cursors that were not produced by encode_cursor
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
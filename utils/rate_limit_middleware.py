@@ -0,0 +1,79 @@
+import re
+import logging
+from typing import Dict, Optional
+
+from starlette.responses import JSONResponse
+
+from utils.rate_limiter import SlidingWindowRateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitPolicy:
+    """Allow `limit` requests per client IP and path every `period` seconds"""
+
+    def __init__(self, limit: int, period: float = 60):
+        self.limit = limit
+        self.period = period
+
+    def __repr__(self):
+        return f"<RateLimitPolicy({self.limit}/{self.period}s)>"
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware that applies per-route rate limit policies.
+
+    Runs before FastAPI parses the request body or resolves dependencies, so a
+    rejected request never spools an upload or checks out a database session.
+    Routes are declared with the same path templates as the app, e.g.
+    "/jindal-registration/{registration_id}"; unlisted routes are not limited.
+    """
+
+    def __init__(self, app, limiter: SlidingWindowRateLimiter, policies: Dict[str, RateLimitPolicy]):
+        self.app = app
+        self.limiter = limiter
+        self.exact_policies = {}
+        self.template_policies = []
+        for path, policy in policies.items():
+            if "{" in path:
+                pattern = re.sub(r"\{[^/]+\}", "[^/]+", path)
+                self.template_policies.append((re.compile(f"^{pattern}$"), policy))
+            else:
+                self.exact_policies[path] = policy
+
+    def match(self, path: str) -> Optional[RateLimitPolicy]:
+        """Find the policy for a request path"""
+        policy = self.exact_policies.get(path)
+        if policy is not None:
+            return policy
+        for pattern, template_policy in self.template_policies:
+            if pattern.match(path):
+                return template_policy
+        return None
+
+    async def __call__(self, scope, receive, send):
+        # CORS preflights are answered by CORSMiddleware and never counted
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        policy = self.match(path)
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        ip = client[0] if client else "unknown"
+        if not self.limiter.hit(f"{ip}:{path}", policy.limit, policy.period):
+            logger.warning(f"Rate limit exceeded for {ip} on {path}")
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": "Too many requests. Please try again later."},
+                headers={"Retry-After": str(int(policy.period))}
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
@@ -0,0 +1,263 @@
+import hashlib
+import os
+import struct
+import tempfile
+import threading
+import time
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _roll_window(stored_window: int, previous: int, current: int, window: int) -> tuple[int, int]:
+    """Shift stored counters into the current window, returns (previous, current)"""
+    if stored_window == window:
+        return previous, current
+    if stored_window == window - 1:
+        return current, 0
+    return 0, 0
+
+
+def _is_over_limit(previous: int, current: int, now: float, window: int, period: float, limit: int) -> bool:
+    """Weight the previous window by how much of it still overlaps the sliding window"""
+    overlap = 1.0 - (now - window * period) / period
+    return previous * overlap + current >= limit
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage for sliding-window counters.
+    Backends keep two counters per key and decide admission atomically.
+    """
+
+    @abstractmethod
+    def hit(self, key: str, limit: int, period: float, now: float) -> bool:
+        """Count a request for key if it is within limit per period, returns whether it is allowed"""
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Evict idle keys, returns the number of evicted keys"""
+        return 0
+
+
+class _WindowCounter:
+    """Fixed-size per-key state: the current and previous window counters"""
+    __slots__ = ("window", "previous", "current", "expires_at")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.previous = 0
+        self.current = 0
+        self.expires_at = 0.0
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Per-process backend: a bounded LRU store swept by a background thread.
+    Limits are enforced per worker process.
+    """
+
+    def __init__(self, max_keys: int = 100_000, sweep_interval: float = 30.0):
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        self._entries: "OrderedDict[str, _WindowCounter]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._sweeper: Optional[threading.Thread] = None
+
+    def hit(self, key: str, limit: int, period: float, now: float) -> bool:
+        window = int(now // period)
+
+        if self._sweeper is None:
+            self._start_sweeper()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.max_keys:
+                    self._entries.popitem(last=False)
+                entry = _WindowCounter(window)
+                self._entries[key] = entry
+            else:
+                self._entries.move_to_end(key)
+                entry.previous, entry.current = _roll_window(entry.window, entry.previous, entry.current, window)
+                entry.window = window
+
+            # Both counters are worthless once two full windows have passed
+            entry.expires_at = (window + 2) * period
+
+            if _is_over_limit(entry.previous, entry.current, now, window, period, limit):
+                return False
+
+            entry.current += 1
+            return True
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """
+        Evict idle keys from the least recently used end of the store
+        Returns the number of evicted keys
+        """
+        now = time.time() if now is None else now
+        evicted = 0
+        with self._lock:
+            while self._entries:
+                key, entry = next(iter(self._entries.items()))
+                if entry.expires_at > now:
+                    break
+                del self._entries[key]
+                evicted += 1
+        return evicted
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _start_sweeper(self) -> None:
+        with self._lock:
+            if self._sweeper is not None:
+                return
+            self._sweeper = threading.Thread(target=self._sweep_loop, name="rate-limit-sweeper", daemon=True)
+            self._sweeper.start()
+
+    def _sweep_loop(self) -> None:
+        while True:
+            time.sleep(self.sweep_interval)
+            try:
+                evicted = self.sweep()
+                if evicted:
+                    logger.debug(f"Rate limiter evicted {evicted} idle keys")
+            except Exception as e:
+                logger.error(f"Rate limiter sweep failed: {e}", exc_info=True)
+
+
+class SharedMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Host-wide backend shared by every uvicorn worker on the machine.
+
+    Counters live in a fixed-size open-addressing table inside a named shared
+    memory segment; the first worker creates it and the others attach. Updates are
+    serialized with an flock on a lock file next to the segment, so an admission
+    decision costs a hash, a few struct reads and two syscalls. POSIX only; its
+    modules are imported here so the memory backend still imports on Windows.
+    """
+
+    # key hash, window index, previous count, current count, expiry (epoch seconds)
+    SLOT = struct.Struct("<QqIIq")
+    PROBES = 8
+
+    def __init__(self, name: str = "alldays_rate_limit", slots: int = 65_536):
+        import fcntl
+        from multiprocessing import resource_tracker, shared_memory
+        self._fcntl = fcntl
+        self._resource_tracker = resource_tracker
+
+        size = slots * self.SLOT.size
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            logger.info(f"Created shared rate limit segment '{name}' with {slots} slots")
+        except FileExistsError:
+            self._shm = shared_memory.SharedMemory(name=name)
+        # The segment must outlive whichever worker happened to create it
+        self._resource_tracker.unregister(self._shm._name, "shared_memory")
+
+        self.slots = self._shm.size // self.SLOT.size
+        self._buf = self._shm.buf
+        self._thread_lock = threading.Lock()
+        self._lock_fd = os.open(os.path.join(tempfile.gettempdir(), f"{name}.lock"), os.O_RDWR | os.O_CREAT, 0o600)
+
+    def hit(self, key: str, limit: int, period: float, now: float) -> bool:
+        window = int(now // period)
+        expires_at = int((window + 2) * period) + 1
+        key_hash = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") | 1
+        start = key_hash % self.slots
+
+        # flock is per process, the thread lock covers the threadpool inside a worker
+        with self._thread_lock:
+            self._fcntl.flock(self._lock_fd, self._fcntl.LOCK_EX)
+            try:
+                offset = self._find_slot(key_hash, start, now)
+                stored_hash, stored_window, previous, current, _ = self.SLOT.unpack_from(self._buf, offset)
+                if stored_hash != key_hash:
+                    stored_window, previous, current = window, 0, 0
+                previous, current = _roll_window(stored_window, previous, current, window)
+
+                allowed = not _is_over_limit(previous, current, now, window, period, limit)
+                if allowed:
+                    current += 1
+                self.SLOT.pack_into(self._buf, offset, key_hash, window, previous, current, expires_at)
+                return allowed
+            finally:
+                self._fcntl.flock(self._lock_fd, self._fcntl.LOCK_UN)
+
+    def close(self, unlink: bool = False) -> None:
+        """Detach from the segment, optionally removing it for every process on the host"""
+        os.close(self._lock_fd)
+        self._buf = None
+        self._shm.close()
+        if unlink:
+            # unlink() unregisters from the resource tracker, which we already did in __init__
+            self._resource_tracker.register(self._shm._name, "shared_memory")
+            self._shm.unlink()
+
+    def _find_slot(self, key_hash: int, start: int, now: float) -> int:
+        """
+        Return the offset of the key's slot, or of the slot to claim for it:
+        the first empty or expired slot, else the one closest to expiry
+        """
+        claim_offset = None
+        claim_expiry = None
+        for probe in range(self.PROBES):
+            offset = ((start + probe) % self.slots) * self.SLOT.size
+            stored_hash, _, _, _, expires_at = self.SLOT.unpack_from(self._buf, offset)
+            if stored_hash == key_hash:
+                return offset
+            if stored_hash == 0 or expires_at <= now:
+                if claim_expiry is None or claim_expiry > 0:
+                    claim_offset, claim_expiry = offset, 0
+            elif claim_expiry is None or expires_at < claim_expiry:
+                claim_offset, claim_expiry = offset, expires_at
+        return claim_offset
+
+
+def create_rate_limit_backend(name: Optional[str] = None) -> RateLimitBackend:
+    """
+    Build the backend selected by name or the RATE_LIMIT_BACKEND environment variable:
+    "memory" (per worker, default) or "shared" (all workers on this host)
+    """
+    name = (name or os.environ.get("RATE_LIMIT_BACKEND", "memory")).lower()
+    if name == "memory":
+        return InMemoryRateLimitBackend()
+    if name == "shared":
+        return SharedMemoryRateLimitBackend(
+            name=os.environ.get("RATE_LIMIT_SHM_NAME", "alldays_rate_limit"),
+            slots=int(os.environ.get("RATE_LIMIT_SHM_SLOTS", "65536"))
+        )
+    raise ValueError(f"Unknown rate limit backend: {name}")
+
+
+class SlidingWindowRateLimiter:
+    """
+    Approximate sliding-window rate limiter with fixed memory per key.
+
+    Each key only keeps the request count of the current fixed window and of the
+    previous one. The previous count is weighted by how much of it still overlaps
+    the sliding window, so admission is O(1) regardless of the limit. Where the
+    counters live is up to the backend.
+    """
+
+    def __init__(self, limit: int, period: float, backend: Optional[RateLimitBackend] = None):
+        self.limit = limit
+        self.period = period
+        self.backend = backend if backend is not None else InMemoryRateLimitBackend()
+
+    def hit(self, key: str, limit: Optional[int] = None, period: Optional[float] = None, now: Optional[float] = None) -> bool:
+        """
+        Record a request for key
+        Returns True if the request is allowed, False if the key is over its limit
+        """
+        return self.backend.hit(
+            key,
+            self.limit if limit is None else limit,
+            self.period if period is None else period,
+            time.time() if now is None else now
+        )
@@ -0,0 +1,146 @@
+import io
+import os
+import csv
+import json
+import logging
+import tempfile
+from datetime import date, datetime
+from typing import Iterator, List, Optional
+
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from db.database import SessionLocal
+from utils.timezone_utils import convert_to_ist
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched from the server-side cursor and encoded per chunk of output
+EXPORT_BATCH_SIZE = 1000
+# Bytes read from the finished workbook per chunk of the response
+XLSX_CHUNK_SIZE = 64 * 1024
+# Excel's row limit per sheet, header included
+XLSX_MAX_ROWS = 1_048_576
+# Largest table exported as XLSX in one request. The workbook is built before the first byte
+# is sent (about 28 s per 100k rows), and Heroku drops a response with no bytes after 30 s
+XLSX_EXPORT_MAX_ROWS = int(os.environ.get("XLSX_EXPORT_MAX_ROWS", "50000"))
+
+
+def _export_value(value):
+    """Plain value for a cell: ISO timestamps, everything else as stored"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def export_columns(model) -> List[str]:
+    return [column.name for column in model.__table__.columns]
+
+
+def count_export_rows(model, db: Session) -> int:
+    return db.execute(select(func.count()).select_from(model)).scalar_one()
+
+
+def iter_export_rows(model, batch_size: int = EXPORT_BATCH_SIZE, db: Optional[Session] = None) -> Iterator[list]:
+    """
+    Every row of a registration table in id order, batch_size rows at a time.
+
+    Selects plain columns (no ORM objects) through a server-side cursor, so only
+    one batch is ever held in memory. Opens its own session unless one is given:
+    the generator outlives the request handler that returned the StreamingResponse.
+    """
+    owns_session = db is None
+    if owns_session:
+        db = SessionLocal()
+    try:
+        result = db.execute(
+            select(*model.__table__.columns)
+            .order_by(model.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for partition in result.partitions():
+            yield partition
+    except Exception as e:
+        # Headers are already sent; the client sees a truncated file
+        logger.error(f"Export of {model.__tablename__} failed: {e}", exc_info=True)
+        raise
+    finally:
+        if owns_session:
+            db.close()
+
+
+def iter_ndjson(model, batch_size: int = EXPORT_BATCH_SIZE, db: Optional[Session] = None) -> Iterator[bytes]:
+    """Newline-delimited JSON, one object per registration"""
+    columns = export_columns(model)
+    for rows in iter_export_rows(model, batch_size, db):
+        yield "".join(
+            json.dumps(dict(zip(columns, map(_export_value, row))), separators=(",", ":")) + "\n"
+            for row in rows
+        ).encode("utf-8")
+
+
+def iter_csv(model, batch_size: int = EXPORT_BATCH_SIZE, db: Optional[Session] = None) -> Iterator[bytes]:
+    """CSV with a header row"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    # Sent before the query runs so the download starts immediately
+    writer.writerow(export_columns(model))
+    yield buffer.getvalue().encode("utf-8")
+
+    for rows in iter_export_rows(model, batch_size, db):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_export_value(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _xlsx_value(value):
+    """Excel cell value: naive IST timestamps (Excel has no time zones), strings without control characters"""
+    if isinstance(value, datetime):
+        return convert_to_ist(value).replace(tzinfo=None)
+    if isinstance(value, str):
+        return ILLEGAL_CHARACTERS_RE.sub("", value)
+    return value
+
+
+def iter_xlsx(model, batch_size: int = EXPORT_BATCH_SIZE, db: Optional[Session] = None) -> Iterator[bytes]:
+    """
+    XLSX workbook, one sheet per Excel row limit.
+
+    Uses openpyxl's write-only mode, which writes each row to a temporary sheet
+    file as it is appended instead of keeping cells in memory. An XLSX file is a
+    zip archive, so it can only be sent once complete: the workbook is saved to a
+    temporary file and then streamed from disk. Nothing is sent while it is built,
+    so callers refuse tables over XLSX_EXPORT_MAX_ROWS rather than hit the router timeout.
+    """
+    columns = export_columns(model)
+    workbook = Workbook(write_only=True)
+    sheet = None
+    sheet_rows = XLSX_MAX_ROWS
+
+    with tempfile.TemporaryFile(suffix=".xlsx") as output:
+        for rows in iter_export_rows(model, batch_size, db):
+            for row in rows:
+                if sheet_rows == XLSX_MAX_ROWS:
+                    sheet = workbook.create_sheet(f"{model.__tablename__}_{len(workbook.worksheets) + 1}"[:31])
+                    sheet.freeze_panes = "A2"
+                    sheet.append(columns)
+                    sheet_rows = 1
+                sheet.append([_xlsx_value(value) for value in row])
+                sheet_rows += 1
+
+        if sheet is None:
+            # Empty table: still a valid workbook with the header row
+            sheet = workbook.create_sheet(model.__tablename__[:31])
+            sheet.append(columns)
+
+        workbook.save(output)
+        output.seek(0)
+        while True:
+            chunk = output.read(XLSX_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
@@ -0,0 +1,177 @@
+import os
+import json
+import time
+import asyncio
+import threading
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+# Cache keys of the cached endpoints
+SPORTS_CACHE_KEY = "sports"
+REGISTRATION_COUNTS_CACHE_KEY = "registration-counts"
+JINDAL_SUMMARY_CACHE_KEY = "jindal-summary"
+
+RESPONSE_CACHE_TTL_SECONDS = float(os.environ.get("RESPONSE_CACHE_TTL_SECONDS", "5"))
+# How long past the TTL an entry may still be served while it is refreshed in the background
+RESPONSE_CACHE_STALE_SECONDS = float(os.environ.get("RESPONSE_CACHE_STALE_SECONDS", "30"))
+
+# Outcomes of a lookup
+_HIT = "hit"        # fresh body, nothing to do
+_STALE = "stale"    # stale body, caller starts the background refresh
+_WAIT = "wait"      # another caller is computing, wait for its future
+_LEAD = "lead"      # caller computes and resolves the future for everyone else
+
+
+class _Entry:
+    __slots__ = ("body", "fresh_until", "stale_until")
+
+    def __init__(self, body: bytes, fresh_until: float, stale_until: float):
+        self.body = body
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+class ResponseCache:
+    """
+    Per-worker cache of serialized JSON response bodies with request coalescing.
+
+    Hot read endpoints store their response once as bytes and serve those bytes
+    until the TTL runs out or a write path invalidates the key. On a miss only
+    one caller per key runs the computation; concurrent callers wait for its
+    result instead of each checking out a database connection (single flight).
+    Past the TTL an entry is served stale for up to stale_seconds while a single
+    background refresh replaces it, so expiry never stampedes the pool.
+
+    Writes invalidate the key in every worker through the change bus; the TTL
+    only bounds staleness when a notification is missed.
+    """
+
+    def __init__(self, ttl: float = RESPONSE_CACHE_TTL_SECONDS, stale_seconds: float = RESPONSE_CACHE_STALE_SECONDS):
+        self.ttl = ttl
+        self.stale_seconds = stale_seconds
+        self._entries: Dict[str, _Entry] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="response-cache-refresh")
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.invalidations = 0
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> bytes:
+        """
+        Cached body for key, computing it at most once across concurrent callers
+        compute returns the response content (dicts, lists or pydantic models)
+        and must open its own database session. For sync handlers.
+        """
+        outcome, body, future = self._begin(key)
+        if outcome == _HIT:
+            return body
+        if outcome == _STALE:
+            self._refresher.submit(self._run, key, compute, future, True)
+            return body
+        if outcome == _LEAD:
+            self._run(key, compute, future)
+        return future.result()
+
+    async def aget_or_compute(self, key: str, compute: Callable[[], Any]) -> bytes:
+        """
+        Same as get_or_compute for async handlers
+        Hits never leave the event loop; the computation runs in the threadpool.
+        """
+        outcome, body, future = self._begin(key)
+        if outcome == _HIT:
+            return body
+        if outcome == _STALE:
+            self._refresher.submit(self._run, key, compute, future, True)
+            return body
+        if outcome == _LEAD:
+            await run_in_threadpool(self._run, key, compute, future)
+        return await asyncio.wrap_future(future)
+
+    def invalidate(self, *keys: str) -> None:
+        """Drop the given keys, or every key when none are given"""
+        with self._lock:
+            for key in keys or list(self._entries.keys() | self._inflight.keys()):
+                self._entries.pop(key, None)
+                # Results of computations already running predate the write: don't store them
+                self._inflight.pop(key, None)
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        """Hit/miss counters for tuning the TTL"""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "ttl_seconds": self.ttl,
+                "stale_seconds": self.stale_seconds,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "refreshes": self.refreshes,
+                "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations
+            }
+
+    def _begin(self, key: str) -> Tuple[str, Optional[bytes], Optional[Future]]:
+        """Classify a lookup and register a new in-flight computation when one is needed"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.fresh_until > now:
+                self.hits += 1
+                return _HIT, entry.body, None
+
+            if entry is not None and entry.stale_until > now:
+                self.stale_hits += 1
+                if key in self._inflight:
+                    return _HIT, entry.body, None
+                self.refreshes += 1
+                return _STALE, entry.body, self._register(key)
+
+            self.misses += 1
+            inflight = self._inflight.get(key)
+            if inflight is not None:
+                self.coalesced += 1
+                return _WAIT, None, inflight
+            return _LEAD, None, self._register(key)
+
+    def _register(self, key: str) -> Future:
+        """Record a computation for key, called with the lock held"""
+        future = Future()
+        self._inflight[key] = future
+        return future
+
+    def _run(self, key: str, compute: Callable[[], Any], future: Future, background: bool = False) -> None:
+        """Compute, store and hand the body to every waiter"""
+        try:
+            body = json.dumps(jsonable_encoder(compute()), separators=(",", ":")).encode("utf-8")
+        except Exception as e:
+            if background:
+                logger.error(f"Background refresh of '{key}' failed, serving stale: {e}", exc_info=True)
+            with self._lock:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+            future.set_exception(e)
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            # Only the registered computation stores; invalidate() unregisters it
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+                self._entries[key] = _Entry(body, now + self.ttl, now + self.ttl + self.stale_seconds)
+        future.set_result(body)
+
+# Create global instance
+response_cache = ResponseCache()
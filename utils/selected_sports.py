@@ -0,0 +1,36 @@
+import json
+from typing import Iterable, List, Optional
+
+
+def parse_selected_sports(value: Optional[str], known_sports: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Parse a stored selected_sports value into a list of sport keys.
+
+    Values are usually a JSON list, but older clients sent a JSON string of
+    comma-separated names or plain text. When known_sports is given, only those
+    keys are returned and unparseable text is matched by substring.
+    """
+    if not value:
+        return []
+
+    try:
+        selected_sports = json.loads(value)
+    except (json.JSONDecodeError, TypeError):
+        if known_sports is not None:
+            # If parsing fails, check whether it contains the sport name
+            value_lower = value.lower()
+            return [sport for sport in known_sports if sport in value_lower]
+        selected_sports = value
+
+    if isinstance(selected_sports, str):
+        # Handle case where it might be a comma-separated string
+        sports_list = [s.strip().lower() for s in selected_sports.split(',')]
+    elif isinstance(selected_sports, list):
+        sports_list = [s.strip() for s in selected_sports if isinstance(s, str)]
+    else:
+        return []
+
+    if known_sports is not None:
+        known_sports = set(known_sports)
+        return [sport for sport in sports_list if sport in known_sports]
+    return [sport for sport in sports_list if sport]